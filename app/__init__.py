@@ -4,9 +4,10 @@ from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 
 from app.config import config
+from app.services.banco import SessaoRoteada
 
 # Extensões
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': SessaoRoteada})
 login_manager = LoginManager()
 csrf = CSRFProtect()
 
@@ -25,6 +26,26 @@ def create_app(config_name='default'):
     login_manager.init_app(app)
     csrf.init_app(app)
     
+    # Timeout por rota e leituras de relatórios na réplica
+    from app.services.banco import registrar_banco
+    registrar_banco(app)
+    
+    # Compressão gzip/brotli (registrada primeiro: os after_request rodam em ordem inversa)
+    from app.services.compressao import registrar_compressao
+    registrar_compressao(app)
+    
+    # CSS e fontes gerados pelo build (static/dist)
+    from app.services.assets import registrar_assets
+    registrar_assets(app)
+    
+    # Tag {% cache %} dos templates
+    from app.services.fragmentos import FragmentoCache
+    app.jinja_env.add_extension(FragmentoCache)
+    
+    # Bytecode dos templates em disco
+    from app.services.templates import registrar_templates
+    registrar_templates(app)
+    
     # Registrar blueprints
     from app.routes.auth import auth_bp
     from app.routes.dashboard import dashboard_bp
@@ -44,13 +65,56 @@ def create_app(config_name='default'):
     
     # Isentar webhook de CSRF (recebe POST externo da Meta)
     csrf.exempt(webhook_bp)
+
+    # Comandos de linha de comando
+    from app.cli import registrar_comandos
+    registrar_comandos(app)
+
+    # Tabelas e admin padrão ficam em `flask inicializar-banco` (uma vez
+    # por deploy), e não em cada worker do gunicorn
+    return app
+
+
+def inicializar_banco(app):
+    """Cria tabelas, índices, resumos iniciais e o admin padrão (idempotente)"""
+    from app.services.mudancas import podar_mudancas
+    from app.services.resumos import migrar_resumos_mensais
+    from app.services.tipos import migrar_tipos_evento
     
-    # Criar tabelas e admin padrão
-    with app.app_context():
-        db.create_all()
-        create_admin_user(app)
+    db.create_all(bind_key=None)  # só o primário; a réplica recebe o esquema por replicação
+    migrar_resumos_mensais()  # resumos antigos, chaveados pelo nome do tipo
+    migrar_tipos_evento()  # antes dos índices: cria a coluna eventos.tipo_id em bancos antigos
+    criar_indices_ausentes()
+    preencher_resumos()
+    preencher_indice_busca()
+    podar_mudancas(app.config['MUDANCAS_RETENCAO_DIAS'])
+    create_admin_user(app)
+
+
+def criar_indices_ausentes():
+    """Cria índices novos em tabelas que já existiam (create_all não os cria)"""
+    for tabela in db.metadata.sorted_tables:
+        for indice in tabela.indexes:
+            indice.create(db.engine, checkfirst=True)
+
+
+def preencher_resumos():
+    """Preenche o resumo mensal quando a tabela acabou de ser criada"""
+    from app.models import Evento, ResumoMensal
+    from app.services.resumos import reconstruir_resumos
     
-    return app
+    if ResumoMensal.query.first() is None and Evento.query.first() is not None:
+        reconstruir_resumos()
+
+
+def preencher_indice_busca():
+    """Indexa garçons e eventos quando o índice de busca acabou de ser criado"""
+    from app.models import Evento, Garcom, IndiceBusca
+    from app.services.busca import reconstruir_indice
+    
+    vazio = IndiceBusca.query.first() is None
+    if vazio and (Garcom.query.first() is not None or Evento.query.first() is not None):
+        reconstruir_indice()
 
 
 def create_admin_user(app):
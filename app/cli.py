@@ -0,0 +1,81 @@
+"""
+Comandos de linha de comando (`flask <comando>`).
+"""
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('exportar-eventos')
+@click.option('--inicio', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='Data inicial (AAAA-MM-DD)')
+@click.option('--fim', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='Data final (AAAA-MM-DD)')
+@click.option('--saida', type=click.Path(dir_okay=False, writable=True), default=None,
+              help='Arquivo ZIP de destino (padrão: eventos_<inicio>_<fim>.zip)')
+@with_appcontext
+def exportar_eventos_cmd(inicio, fim, saida):
+    """Exporta o PDF de cada evento do período em um arquivo ZIP."""
+    from app.services.exportacao import gerar_zip_eventos
+
+    inicio, fim = inicio.date(), fim.date()
+    saida = saida or f'eventos_{inicio}_{fim}.zip'
+
+    with open(saida, 'wb') as arquivo:
+        for bloco in gerar_zip_eventos(inicio, fim):
+            arquivo.write(bloco)
+
+    click.echo(f'✅ Eventos exportados: {saida}')
+
+
+@click.command('reconstruir-resumos')
+@with_appcontext
+def reconstruir_resumos_cmd():
+    """Refaz a tabela de resumos mensais a partir de eventos e escalas."""
+    from app.services.resumos import reconstruir_resumos
+
+    total = reconstruir_resumos()
+    click.echo(f'✅ Resumos mensais reconstruídos: {total} linhas')
+
+
+@click.command('reconstruir-busca')
+@with_appcontext
+def reconstruir_busca_cmd():
+    """Refaz o índice de busca de garçons e eventos."""
+    from app.services.busca import reconstruir_indice
+
+    total = reconstruir_indice()
+    click.echo(f'✅ Índice de busca reconstruído: {total} registros')
+
+
+@click.command('podar-mudancas')
+@click.option('--dias', type=int, default=None,
+              help='Mantém apenas os últimos N dias (padrão: MUDANCAS_RETENCAO_DIAS)')
+@with_appcontext
+def podar_mudancas_cmd(dias):
+    """Apaga do feed de mudanças das escalas os registros antigos."""
+    from flask import current_app
+    from app.services.mudancas import podar_mudancas
+
+    total = podar_mudancas(dias or current_app.config['MUDANCAS_RETENCAO_DIAS'])
+    click.echo(f'✅ Mudanças antigas apagadas: {total}')
+
+
+@click.command('inicializar-banco')
+@with_appcontext
+def inicializar_banco_cmd():
+    """Cria tabelas, índices que faltam e o admin padrão e poda o feed (rodar a cada deploy)."""
+    from flask import current_app
+    from app import inicializar_banco
+
+    inicializar_banco(current_app)
+    click.echo('✅ Banco inicializado')
+
+
+def registrar_comandos(app):
+    """Registra os comandos de linha de comando na aplicação"""
+    app.cli.add_command(inicializar_banco_cmd)
+    app.cli.add_command(exportar_eventos_cmd)
+    app.cli.add_command(reconstruir_resumos_cmd)
+    app.cli.add_command(reconstruir_busca_cmd)
+    app.cli.add_command(podar_mudancas_cmd)
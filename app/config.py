@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -25,6 +26,62 @@ class Config:
     # Admin padrão
     ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@primor.com')
     ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
+    
+    # Atualização ao vivo do evento: segundos entre as consultas da página ao
+    # feed de mudanças. A consulta responde na hora (não segura o worker
+    # síncrono do gunicorn esperando mudanças).
+    LIVE_POLL_INTERVALO = float(os.getenv('LIVE_POLL_INTERVALO', '5'))
+    
+    # Dias que o feed de mudanças das escalas é mantido (podado em
+    # `flask inicializar-banco` e `flask podar-mudancas`)
+    MUDANCAS_RETENCAO_DIAS = int(os.getenv('MUDANCAS_RETENCAO_DIAS', '90'))
+    
+    # Cache de renderização dos PDFs (memória + disco compartilhado entre workers)
+    PDF_CACHE_ITENS = int(os.getenv('PDF_CACHE_ITENS', '32'))
+    PDF_CACHE_DISCO_ITENS = int(os.getenv('PDF_CACHE_DISCO_ITENS', '256'))
+    PDF_CACHE_MAX_BYTES_MEMORIA = int(os.getenv('PDF_CACHE_MAX_BYTES_MEMORIA', str(1024 * 1024)))
+    
+    # Relatórios em segundo plano (pool de processos por worker)
+    RELATORIO_JOBS_WORKERS = int(os.getenv('RELATORIO_JOBS_WORKERS', '2'))
+    RELATORIO_JOBS_DIR = os.getenv('RELATORIO_JOBS_DIR', os.path.join(tempfile.gettempdir(), 'primor-relatorios'))
+    RELATORIO_JOBS_MAX_ARTEFATOS = int(os.getenv('RELATORIO_JOBS_MAX_ARTEFATOS', '100'))
+    RELATORIO_JOBS_TIMEOUT = int(os.getenv('RELATORIO_JOBS_TIMEOUT', '600'))
+    # Os dois diretórios são criados com modo 0700 e recusados se não forem
+    # do usuário do processo ou tiverem acesso de grupo/outros
+    PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'primor-pdf-cache'))
+    
+    # Compressão gzip/brotli das respostas de texto (HTML, JSON, CSV)
+    COMPRESSAO_MIN_BYTES = int(os.getenv('COMPRESSAO_MIN_BYTES', '1024'))
+    COMPRESSAO_NIVEL_GZIP = int(os.getenv('COMPRESSAO_NIVEL_GZIP', '6'))
+    COMPRESSAO_NIVEL_BROTLI = int(os.getenv('COMPRESSAO_NIVEL_BROTLI', '5'))
+    
+    # Fragmentos de template renderizados (linhas de eventos e garçons) em cache por worker
+    FRAGMENTOS_CACHE_ITENS = int(os.getenv('FRAGMENTOS_CACHE_ITENS', '5000'))
+    
+    # Bytecode dos templates Jinja em disco (compartilhado entre workers e deploys)
+    # e aquecimento de todos os templates na partida (gunicorn.conf.py).
+    # Sem JINJA_BYTECODE_DIR usa o diretório do próprio Jinja no tmp
+    # (_jinja2-cache-<uid>, 0700); um diretório informado precisa ser do
+    # usuário do processo e fechado para grupo e outros.
+    JINJA_BYTECODE_CACHE = os.getenv('JINJA_BYTECODE_CACHE', '1') == '1'
+    JINJA_BYTECODE_DIR = os.getenv('JINJA_BYTECODE_DIR') or None
+    AQUECER_TEMPLATES = os.getenv('AQUECER_TEMPLATES', '1') == '1'
+    
+    # Banco: statement_timeout (ms) das requisições, aplicado por transação
+    # no PostgreSQL; o prefixo de endpoint mais longo vence e rotas fora da
+    # lista ficam com DB_STATEMENT_TIMEOUT_MS. Comandos `flask` (fora de
+    # requisição) rodam sem limite.
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '5000'))
+    TIMEOUTS_POR_ROTA = {
+        'relatorios.': int(os.getenv('DB_STATEMENT_TIMEOUT_RELATORIOS_MS', '60000')),
+        'dashboard.index': int(os.getenv('DB_STATEMENT_TIMEOUT_DASHBOARD_MS', '15000')),
+    }
+    
+    # Leituras (GET) desses endpoints vão para a réplica, se houver bind
+    # 'replica' em SQLALCHEMY_BINDS. Os jobs de relatório gravam o status
+    # e ficam no primário, assim como escritas e a confirmação (/confirmar).
+    ROTAS_REPLICA = ('relatorios.', 'dashboard.index')
+    ROTAS_SOMENTE_PRIMARIO = ('relatorios.job_',)
 
 
 class DevelopmentConfig(Config):
@@ -34,18 +91,47 @@ class DevelopmentConfig(Config):
         'DATABASE_URL', 
         'sqlite:///primor.db'
     )
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
 
 
 class ProductionConfig(Config):
     """Configurações de produção"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    
+    # PostgreSQL (psycopg2). Cada worker síncrono do gunicorn atende uma
+    # requisição por vez: um pool pequeno basta, e
+    # GUNICORN_WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW) x engines
+    # precisa caber no max_connections do servidor.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '2')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '2')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),  # antes do timeout de ociosidade do proxy
+        'pool_pre_ping': True,  # descarta conexões derrubadas (failover, reinício do servidor)
+        'connect_args': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            'application_name': 'primor',
+            # statement_timeout não fica na conexão: vale só para requisições (app/services/banco.py)
+            'options': '-c idle_in_transaction_session_timeout={}'.format(
+                int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', '30000')),
+            ),
+        },
+    }
+    
+    # Réplica de leitura opcional; binds não herdam SQLALCHEMY_ENGINE_OPTIONS
+    SQLALCHEMY_BINDS = (
+        {'replica': {'url': os.getenv('DATABASE_REPLICA_URL'), **SQLALCHEMY_ENGINE_OPTIONS}}
+        if os.getenv('DATABASE_REPLICA_URL') else {}
+    )
 
 
 class TestingConfig(Config):
     """Configurações de teste"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    PDF_CACHE_DIR = None  # somente memória
+    JINJA_BYTECODE_CACHE = False
 
 
 config = {
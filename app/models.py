@@ -1,5 +1,7 @@
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import DDL, event, inspect, select
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
 import secrets
 
@@ -11,6 +13,34 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 
+def formatar_horario(hora_inicio, hora_fim):
+    """Horário formatado ('HH:MM' ou 'HH:MM - HH:MM')"""
+    inicio = hora_inicio.strftime('%H:%M')
+    if hora_fim:
+        return f"{inicio} - {hora_fim.strftime('%H:%M')}"
+    return inicio
+
+
+BADGES_EVENTO = {
+    'planejado': ('bg-gray-500/20 text-gray-400', 'Planejado'),
+    'notificado': ('bg-blue-500/20 text-blue-400', 'Notificado'),
+    'realizado': ('bg-green-500/20 text-green-400', 'Realizado'),
+}
+
+
+def badge_evento(status):
+    """Classe CSS e texto do badge de status de um evento"""
+    return BADGES_EVENTO.get(status, BADGES_EVENTO['planejado'])
+
+
+def iniciais_nome(nome):
+    """Iniciais do primeiro e do último nome (ou as duas primeiras letras)"""
+    partes = nome.split()
+    if len(partes) >= 2:
+        return (partes[0][0] + partes[-1][0]).upper()
+    return nome[:2].upper()
+
+
 class User(UserMixin, db.Model):
     """Modelo do administrador do sistema"""
     __tablename__ = 'users'
@@ -55,10 +85,7 @@ class Garcom(db.Model):
     @property
     def iniciais(self):
         """Retorna as iniciais do nome"""
-        partes = self.nome.split()
-        if len(partes) >= 2:
-            return (partes[0][0] + partes[-1][0]).upper()
-        return self.nome[:2].upper()
+        return iniciais_nome(self.nome)
     
     @property
     def total_eventos(self):
@@ -66,14 +93,28 @@ class Garcom(db.Model):
         return self.escalas.count()
 
 
+class TipoEvento(db.Model):
+    """Catálogo de tipos de evento (Casamento, Formatura...)"""
+    __tablename__ = 'tipos_evento'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    chave = db.Column(db.String(100), nullable=False, unique=True)  # nome normalizado (minúsculo, sem acentos)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TipoEvento {self.nome}>'
+
+
 class Evento(db.Model):
     """Modelo do evento"""
     __tablename__ = 'eventos'
     
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(150), nullable=False)
-    tipo = db.Column(db.String(100), nullable=False)  # Texto livre
-    data = db.Column(db.Date, nullable=False)
+    tipo = db.Column(db.String(100), nullable=False)  # Nome do tipo (como no catálogo)
+    tipo_id = db.Column(db.Integer, db.ForeignKey('tipos_evento.id'), nullable=True, index=True)
+    data = db.Column(db.Date, nullable=False, index=True)
     hora_inicio = db.Column(db.Time, nullable=False)
     hora_fim = db.Column(db.Time, nullable=True)
     local = db.Column(db.String(200), nullable=False)
@@ -87,6 +128,7 @@ class Evento(db.Model):
     
     # Relacionamentos
     escalas = db.relationship('Escala', back_populates='evento', lazy='dynamic', cascade='all, delete-orphan')
+    tipo_evento = db.relationship('TipoEvento')
     
     def __repr__(self):
         return f'<Evento {self.nome}>'
@@ -99,10 +141,7 @@ class Evento(db.Model):
     @property
     def horario(self):
         """Horário formatado"""
-        inicio = self.hora_inicio.strftime('%H:%M')
-        if self.hora_fim:
-            return f"{inicio} - {self.hora_fim.strftime('%H:%M')}"
-        return inicio
+        return formatar_horario(self.hora_inicio, self.hora_fim)
     
     @property
     def total_garcons(self):
@@ -137,12 +176,7 @@ class Evento(db.Model):
     @property
     def status_badge(self):
         """Retorna classe CSS para o badge de status"""
-        badges = {
-            'planejado': ('bg-gray-500/20 text-gray-400', 'Planejado'),
-            'notificado': ('bg-blue-500/20 text-blue-400', 'Notificado'),
-            'realizado': ('bg-green-500/20 text-green-400', 'Realizado'),
-        }
-        return badges.get(self.status, badges['planejado'])
+        return badge_evento(self.status)
 
 
 class Escala(db.Model):
@@ -151,7 +185,7 @@ class Escala(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     evento_id = db.Column(db.Integer, db.ForeignKey('eventos.id'), nullable=False)
-    garcom_id = db.Column(db.Integer, db.ForeignKey('garcons.id'), nullable=False)
+    garcom_id = db.Column(db.Integer, db.ForeignKey('garcons.id'), nullable=False, index=True)
     valor = db.Column(db.Numeric(10, 2), nullable=False)
     is_motorista = db.Column(db.Boolean, default=False, nullable=False)  # Se é motorista, recebe valor adicional
     status = db.Column(db.String(20), default='pendente', nullable=False)
@@ -196,3 +230,273 @@ class Escala(db.Model):
             'recusado': ('bg-red-500/20 text-red-400 border-red-500/30', 'Recusado'),
         }
         return badges.get(self.status, badges['pendente'])
+
+
+class EscalaMudanca(db.Model):
+    """Feed de mudanças das escalas, consumido pela atualização ao vivo do evento"""
+    __tablename__ = 'escala_mudancas'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Sem FK: o registro de remoção sobrevive à escala removida
+    evento_id = db.Column(db.Integer, nullable=False, index=True)
+    escala_id = db.Column(db.Integer, nullable=False)
+    garcom_id = db.Column(db.Integer, nullable=False)
+    tipo = db.Column(db.String(20), nullable=False)
+    # Tipo: adicionada, status, alterada (valor/motorista), removida, entrega
+    status = db.Column(db.String(20), nullable=True)
+    msg_id = db.Column(db.String(128), nullable=True, index=True)  # wamid do WhatsApp
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # poda do feed
+    
+    def __repr__(self):
+        return f'<EscalaMudanca {self.tipo} escala={self.escala_id}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'escala_id': self.escala_id,
+            'garcom_id': self.garcom_id,
+            'tipo': self.tipo,
+            'status': self.status,
+        }
+
+
+class RelatorioJob(db.Model):
+    """Geração de relatório em segundo plano (pool de processos)"""
+    __tablename__ = 'relatorio_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    tipo = db.Column(db.String(20), nullable=False)
+    parametros = db.Column(db.String(200), nullable=False, default='')
+    chave = db.Column(db.String(64), nullable=False, index=True)  # impressão digital das entradas
+    status = db.Column(db.String(20), default='processando', nullable=False)
+    # Status: processando, pronto, erro
+    erro = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    concluido_em = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<RelatorioJob {self.tipo} {self.status}>'
+
+
+class ResumoMensal(db.Model):
+    """Totais de eventos e escalas por mês e tipo de evento (mantidos a cada escrita)"""
+    __tablename__ = 'resumos_mensais'
+    
+    ano = db.Column(db.Integer, primary_key=True)
+    mes = db.Column(db.Integer, primary_key=True)
+    tipo_id = db.Column(db.Integer, db.ForeignKey('tipos_evento.id'), primary_key=True)
+    total_eventos = db.Column(db.Integer, default=0, nullable=False)
+    escalas_pendentes = db.Column(db.Integer, default=0, nullable=False)
+    escalas_confirmadas = db.Column(db.Integer, default=0, nullable=False)
+    escalas_recusadas = db.Column(db.Integer, default=0, nullable=False)
+    valor_total = db.Column(db.Numeric(12, 2), default=0, nullable=False)  # Inclui adicional de motorista
+    valor_confirmado = db.Column(db.Numeric(12, 2), default=0, nullable=False)
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    tipo_evento = db.relationship('TipoEvento')
+    
+    def __repr__(self):
+        return f'<ResumoMensal {self.mes:02d}/{self.ano} tipo={self.tipo_id}>'
+
+
+class VersaoCache(db.Model):
+    """Contador de versão de dados em cache nos workers (incrementado a cada escrita)"""
+    __tablename__ = 'versoes_cache'
+    
+    chave = db.Column(db.String(50), primary_key=True)
+    versao = db.Column(db.Integer, default=0, nullable=False)
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<VersaoCache {self.chave} v{self.versao}>'
+
+
+class IndiceBusca(db.Model):
+    """Texto normalizado (minúsculo, sem acentos) de garçons e eventos para a busca"""
+    __tablename__ = 'indice_busca'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entidade = db.Column(db.String(20), nullable=False)  # garcom, evento
+    registro_id = db.Column(db.Integer, nullable=False)
+    texto = db.Column(db.Text, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('entidade', 'registro_id', name='unique_indice_busca'),
+        # PostgreSQL: trigramas em GIN atendem `LIKE '%termo%'` sem varrer a tabela
+        db.Index(
+            'ix_indice_busca_texto_trgm', 'texto',
+            postgresql_using='gin', postgresql_ops={'texto': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
+    
+    def __repr__(self):
+        return f'<IndiceBusca {self.entidade} {self.registro_id}>'
+
+
+# Estruturas da busca que o SQLAlchemy não declara: a extensão pg_trgm no
+# PostgreSQL e, no SQLite, o índice FTS5 sobre `indice_busca` (conteúdo
+# externo, mantido por triggers)
+event.listen(
+    IndiceBusca.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'),
+)
+for _comando in (
+    "CREATE VIRTUAL TABLE indice_busca_fts USING fts5("
+    "texto, content='indice_busca', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER indice_busca_ai AFTER INSERT ON indice_busca BEGIN "
+    "INSERT INTO indice_busca_fts(rowid, texto) VALUES (new.id, new.texto); END",
+    "CREATE TRIGGER indice_busca_ad AFTER DELETE ON indice_busca BEGIN "
+    "INSERT INTO indice_busca_fts(indice_busca_fts, rowid, texto) VALUES ('delete', old.id, old.texto); END",
+    "CREATE TRIGGER indice_busca_au AFTER UPDATE ON indice_busca BEGIN "
+    "INSERT INTO indice_busca_fts(indice_busca_fts, rowid, texto) VALUES ('delete', old.id, old.texto); "
+    "INSERT INTO indice_busca_fts(rowid, texto) VALUES (new.id, new.texto); END",
+):
+    event.listen(IndiceBusca.__table__, 'after_create', DDL(_comando).execute_if(dialect='sqlite'))
+event.listen(
+    IndiceBusca.__table__, 'after_drop',
+    DDL('DROP TABLE IF EXISTS indice_busca_fts').execute_if(dialect='sqlite'),
+)
+
+
+@event.listens_for(Session, 'before_flush')
+def _registrar_mudancas_escalas(session, flush_context, instances):
+    """Alimenta o feed com escalas criadas, removidas ou alteradas."""
+    eventos_excluidos = {obj.id for obj in session.deleted if isinstance(obj, Evento)}
+    mudancas = []
+    
+    for obj in session.new:
+        if isinstance(obj, Escala):
+            mudancas.append((obj, 'adicionada'))
+    
+    for obj in session.dirty:
+        if not isinstance(obj, Escala):
+            continue
+        attrs = inspect(obj).attrs
+        if attrs.status.history.has_changes():
+            mudancas.append((obj, 'status'))
+        elif attrs.valor.history.has_changes() or attrs.is_motorista.history.has_changes():
+            mudancas.append((obj, 'alterada'))
+    
+    for obj in session.deleted:
+        if isinstance(obj, Escala) and obj.evento_id not in eventos_excluidos:
+            mudancas.append((obj, 'removida'))
+    
+    for escala, tipo in mudancas:
+        # Escalas novas ainda não têm ID: o registro é gravado após o flush
+        if escala.id is None:
+            session.info.setdefault('escalas_novas', []).append(escala)
+            continue
+        session.add(EscalaMudanca(
+            evento_id=escala.evento_id,
+            escala_id=escala.id,
+            garcom_id=escala.garcom_id,
+            tipo=tipo,
+            status=escala.status,
+        ))
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _registrar_escalas_novas(session, flush_context):
+    """Registra no feed as escalas que receberam ID no flush."""
+    for escala in session.info.pop('escalas_novas', []):
+        session.add(EscalaMudanca(
+            evento_id=escala.evento_id,
+            escala_id=escala.id,
+            garcom_id=escala.garcom_id,
+            tipo='adicionada',
+            status=escala.status,
+        ))
+
+
+# Colunas que entram no resumo mensal; as demais (notificado_em, token,
+# horários...) não disparam a atualização
+_EVENTO_RESUMO = ('data', 'tipo', 'tipo_id', 'valor_motorista')
+_ESCALA_RESUMO = ('evento_id', 'status', 'valor', 'is_motorista')
+
+
+def _eventos_da_troca(escala, session):
+    """
+    Eventos de origem e destino de uma escala que trocou de evento, pela
+    coluna `evento_id` ou pelo relacionamento (`escala.evento = outro`,
+    que só atualiza a coluna durante o flush). Vazio se não trocou.
+    """
+    attrs = inspect(escala).attrs
+    coluna, relacionamento = attrs.evento_id.history, attrs.evento.history
+    if not coluna.has_changes() and not relacionamento.has_changes():
+        return set()
+    ids = {*coluna.added, escala.evento_id}
+    if escala.id is not None:
+        # Evento de origem como está no banco: o histórico de um objeto expirado não o tem
+        ids.add(session.connection().execute(
+            select(Escala.evento_id).where(Escala.id == escala.id)
+        ).scalar())
+    ids.discard(None)
+    with session.no_autoflush:
+        eventos = {session.get(Evento, evento_id) for evento_id in ids}
+    return (eventos | set(relacionamento.added)) - {None}
+
+
+def _altera_resumo(obj, session, atributos):
+    if obj in session.new or obj in session.deleted:
+        return True
+    attrs = inspect(obj).attrs
+    return any(getattr(attrs, nome).history.has_changes() for nome in atributos)
+
+
+@event.listens_for(Session, 'before_flush')
+def _marcar_resumos_afetados(session, flush_context, instances):
+    """Anota eventos/escalas que mudam os totais e desconta o que eles somavam."""
+    from app.services.resumos import novos_deltas, somar_totais, totais_atuais
+    
+    alterados = list(session.new) + list(session.dirty) + list(session.deleted)
+    eventos = {
+        obj for obj in alterados
+        if isinstance(obj, Evento) and _altera_resumo(obj, session, _EVENTO_RESUMO)
+    }
+    # Escala que troca de evento: os dois eventos são relidos por inteiro
+    for obj in session.dirty:
+        if isinstance(obj, Escala):
+            eventos |= _eventos_da_troca(obj, session)
+    eventos_ids = {evento.id for evento in eventos if evento.id is not None}
+    # Escalas de eventos já anotados entram nos totais do evento
+    escalas = {
+        obj for obj in alterados
+        if isinstance(obj, Escala) and _altera_resumo(obj, session, _ESCALA_RESUMO)
+        and obj.evento not in eventos and obj.evento_id not in eventos_ids
+    }
+    if not eventos and not escalas:
+        return
+    
+    deltas = session.info.setdefault('resumos_deltas', novos_deltas())
+    session.info.setdefault('resumos_eventos', set()).update(eventos)
+    session.info.setdefault('resumos_escalas', set()).update(escalas)
+    somar_totais(deltas, totais_atuais(
+        session.connection(),
+        eventos_ids,
+        {escala.id for escala in escalas if escala.id is not None},
+    ), sinal=-1)
+
+
+@event.listens_for(Session, 'after_flush')
+def _atualizar_resumos(session, flush_context):
+    """Soma os totais novos e grava a diferença, na mesma transação."""
+    deltas = session.info.pop('resumos_deltas', None)
+    eventos = session.info.pop('resumos_eventos', set())
+    escalas = session.info.pop('resumos_escalas', set())
+    if deltas is None:
+        return
+    
+    from app.services.resumos import aplicar_deltas, somar_totais, totais_atuais
+    conexao = session.connection()
+    somar_totais(deltas, totais_atuais(
+        conexao,
+        {evento.id for evento in eventos if evento not in session.deleted},
+        {escala.id for escala in escalas if escala not in session.deleted},
+    ))
+    aplicar_deltas(conexao, deltas)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_resumos(session):
+    for chave in ('resumos_deltas', 'resumos_eventos', 'resumos_escalas'):
+        session.info.pop(chave, None)
@@ -1,9 +1,7 @@
 from flask import Blueprint, render_template
 from flask_login import login_required
-from datetime import datetime, timedelta
-from sqlalchemy import and_
 
-from app.models import Evento, Escala
+from app.services.dashboard import obter_painel
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -12,35 +10,8 @@ dashboard_bp = Blueprint('dashboard', __name__)
 @login_required
 def index():
     """Dashboard principal"""
-    hoje = datetime.now().date()
+    # Próximos eventos (30 dias), eventos de hoje, pendentes e confirmados
+    # (eventos futuros) e eventos do mês: uma consulta, em cache
+    painel = obter_painel()
     
-    # Próximos eventos (próximos 30 dias)
-    proximos_eventos = Evento.query.filter(
-        Evento.data >= hoje,
-        Evento.data <= hoje + timedelta(days=30)
-    ).order_by(Evento.data.asc()).limit(5).all()
-    
-    # Eventos de hoje
-    eventos_hoje = Evento.query.filter(Evento.data == hoje).all()
-    
-    # Confirmações pendentes
-    pendentes = Escala.query.filter_by(status='pendente').join(Evento).filter(
-        Evento.data >= hoje
-    ).count()
-    
-    # Estatísticas gerais
-    total_eventos_mes = Evento.query.filter(
-        Evento.data >= hoje.replace(day=1)
-    ).count()
-    
-    total_confirmados = Escala.query.filter_by(status='confirmado').join(Evento).filter(
-        Evento.data >= hoje
-    ).count()
-    
-    return render_template('dashboard/index.html',
-        proximos_eventos=proximos_eventos,
-        eventos_hoje=eventos_hoje,
-        pendentes=pendentes,
-        total_eventos_mes=total_eventos_mes,
-        total_confirmados=total_confirmados
-    )
+    return render_template('dashboard/index.html', **painel._asdict())
@@ -1,16 +1,26 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required
 from datetime import datetime, time
+from itertools import islice
 from sqlalchemy import func, case
 
 from app import db
-from app.models import Evento, Garcom, Escala
-from app.services.whatsapp import enviar_notificacao_whatsapp
+from app.models import Evento, Garcom, Escala, TipoEvento
+from app.services.busca import buscar
+from app.services.condicional import pagina_condicional, sondar_evento, sondar_modelos
+from app.services.elenco import garcons_ativos
+from app.services.mudancas import (
+    cursores_por_evento, listar_mudancas, totais_por_status, ultimas_entregas, ultimo_cursor
+)
+from app.services.tipos import chave_tipo, criar_tipo, limpar_nome, nome_canonico, sugerir_tipos
 
 eventos_bp = Blueprint('eventos', __name__, url_prefix='/eventos')
 
 _END_OF_DAY = time(23, 59, 59)
 
+# Garçons por página na busca do modal de escalação
+GARCONS_POR_PAGINA = 30
+
 
 def _effective_end(hora_inicio, hora_fim):
     """Retorna hora_fim efetiva para comparação de sobreposição.
@@ -89,6 +99,7 @@ def _listar_conflitos(garcom_ids, evento):
 
 @eventos_bp.route('/')
 @login_required
+@pagina_condicional(sondar_modelos(Evento, Escala))
 def index():
     """Lista de eventos"""
     filtro = request.args.get('filtro', 'todos')
@@ -106,14 +117,15 @@ def index():
     elif filtro == 'proximos':
         query = query.filter(Evento.data >= datetime.now().date())
     
-    # Busca por nome
+    # Busca por nome (sem diferenciar acentos, mais relevantes primeiro)
     if busca:
-        query = query.filter(Evento.nome.ilike(f'%{busca}%'))
+        query = buscar(query, Evento, busca)
     
     eventos = query.order_by(Evento.data.desc()).all()
     
     return render_template('eventos/index.html', 
         eventos=eventos, 
+        versoes=cursores_por_evento([e.id for e in eventos]),
         filtro=filtro,
         busca=busca
     )
@@ -123,8 +135,6 @@ def index():
 @login_required
 def novo():
     """Criar novo evento"""
-    garcons = Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
-    
     if request.method == 'POST':
         try:
             # Obter valores
@@ -136,7 +146,7 @@ def novo():
             # Criar evento
             evento = Evento(
                 nome=request.form.get('nome', '').strip(),
-                tipo=request.form.get('tipo', '').strip(),
+                tipo=nome_canonico(request.form.get('tipo', '')),
                 data=datetime.strptime(request.form.get('data'), '%d/%m/%Y').date(),
                 hora_inicio=datetime.strptime(request.form.get('hora_inicio'), '%H:%M').time(),
                 hora_fim=datetime.strptime(request.form.get('hora_fim'), '%H:%M').time() if request.form.get('hora_fim') else None,
@@ -171,35 +181,148 @@ def novo():
             db.session.rollback()
             flash(f'Erro ao criar evento: {str(e)}', 'error')
     
-    return render_template('eventos/form.html', evento=None, garcons=garcons)
+    return render_template('eventos/form.html', evento=None)
+
+
+@eventos_bp.route('/tipos')
+@login_required
+def tipos():
+    """Catálogo de tipos de evento"""
+    tipos = TipoEvento.query.order_by(TipoEvento.nome).all()
+    # Eventos por tipo pelo índice de eventos.tipo_id
+    totais = dict(
+        db.session.query(Evento.tipo_id, func.count(Evento.id)).group_by(Evento.tipo_id).all()
+    )
+    return render_template('eventos/tipos.html', tipos=tipos, totais=totais)
+
+
+@eventos_bp.route('/tipos/novo', methods=['POST'])
+@login_required
+def tipo_criar():
+    """Adicionar tipo ao catálogo"""
+    nome = limpar_nome(request.form.get('nome'))
+    
+    if not chave_tipo(nome):
+        flash('Informe o nome do tipo.', 'error')
+    else:
+        tipo, criado = criar_tipo(nome)
+        db.session.commit()
+        if criado:
+            flash(f'Tipo {tipo.nome} cadastrado com sucesso!', 'success')
+        else:
+            flash(f'O tipo {tipo.nome} já está cadastrado.', 'warning')
+    
+    return redirect(url_for('eventos.tipos'))
+
+
+@eventos_bp.route('/tipos/<int:id>/excluir', methods=['POST'])
+@login_required
+def tipo_excluir(id):
+    """Excluir tipo sem eventos"""
+    tipo = TipoEvento.query.get_or_404(id)
+    
+    if db.session.query(Evento.id).filter_by(tipo_id=id).first():
+        flash(f'O tipo {tipo.nome} tem eventos e não pode ser excluído.', 'error')
+    else:
+        db.session.delete(tipo)
+        db.session.commit()
+        flash(f'Tipo {tipo.nome} excluído com sucesso!', 'success')
+    
+    return redirect(url_for('eventos.tipos'))
+
+
+@eventos_bp.route('/tipos/sugestoes')
+@login_required
+def tipos_sugestoes():
+    """Autocomplete do campo tipo (catálogo em cache)"""
+    return jsonify({'tipos': sugerir_tipos(request.args.get('q', ''))})
 
 
 @eventos_bp.route('/<int:id>')
 @login_required
+@pagina_condicional(sondar_evento)
 def detalhe(id):
     """Detalhe do evento"""
     evento = Evento.query.get_or_404(id)
-    garcons_disponiveis = Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
-    
-    # Remover garçons já escalados
-    garcons_escalados_ids = [e.garcom_id for e in evento.escalas.all()]
-    garcons_disponiveis = [g for g in garcons_disponiveis if g.id not in garcons_escalados_ids]
     
-    conflitos = _listar_conflitos([g.id for g in garcons_disponiveis], evento)
-
+    # Os garçons do modal de escalação vêm sob demanda de garcons_disponiveis
     return render_template('eventos/detalhe.html', 
         evento=evento,
-        garcons_disponiveis=garcons_disponiveis,
-        conflitos=conflitos
+        entregas=ultimas_entregas(evento.id),
+        cursor=ultimo_cursor(evento.id)
     )
 
 
+@eventos_bp.route('/<int:id>/garcons-disponiveis')
+@login_required
+def garcons_disponiveis(id):
+    """Busca paginada (JSON) dos garçons ativos fora do evento, com os conflitos de horário"""
+    evento = Evento.query.get_or_404(id)
+    busca = request.args.get('busca', '').strip()
+    pagina = max(request.args.get('pagina', 1, type=int), 1)
+    
+    inicio = (pagina - 1) * GARCONS_POR_PAGINA
+    
+    # Um a mais que a página só para saber se existe a próxima (sem COUNT)
+    if busca:
+        escalado = db.session.query(Escala.id).filter(
+            Escala.evento_id == id, Escala.garcom_id == Garcom.id
+        ).exists()
+        query = buscar(
+            db.session.query(Garcom.id, Garcom.nome, Garcom.telefone).filter(Garcom.ativo.is_(True), ~escalado),
+            Garcom, busca,
+        )
+        linhas = query.order_by(Garcom.nome, Garcom.id).offset(inicio).limit(GARCONS_POR_PAGINA + 1).all()
+    else:
+        # Sem busca (abrir o modal e rolar): elenco em cache, menos os já escalados
+        escalados = {garcom_id for garcom_id, in db.session.query(Escala.garcom_id).filter(Escala.evento_id == id)}
+        disponiveis = (garcom for garcom in garcons_ativos() if garcom.id not in escalados)
+        linhas = [
+            (garcom.id, garcom.nome, garcom.telefone)
+            for garcom in islice(disponiveis, inicio, inicio + GARCONS_POR_PAGINA + 1)
+        ]
+    proxima = pagina + 1 if len(linhas) > GARCONS_POR_PAGINA else None
+    linhas = linhas[:GARCONS_POR_PAGINA]
+    
+    # Conflitos só dos garçons desta página
+    conflitos = _listar_conflitos([garcom_id for garcom_id, _, _ in linhas], evento)
+    
+    return jsonify({
+        'garcons': [
+            {
+                'id': garcom_id,
+                'nome': nome,
+                'telefone': telefone,
+                'disponivel': garcom_id not in conflitos,
+                'conflitos': conflitos.get(garcom_id, []),
+            }
+            for garcom_id, nome, telefone in linhas
+        ],
+        'pagina': pagina,
+        'proxima': proxima,
+    })
+
+
+@eventos_bp.route('/<int:id>/mudancas')
+@login_required
+def mudancas(id):
+    """Mudanças das escalas do evento após o cursor `desde` (responde na hora)"""
+    desde = request.args.get('desde', 0, type=int)
+    
+    lista = listar_mudancas(id, desde)
+    
+    return jsonify({
+        'cursor': lista[-1].id if lista else desde,
+        'mudancas': [m.to_dict() for m in lista],
+        'totais': totais_por_status(id) if lista else None,
+    })
+
+
 @eventos_bp.route('/<int:id>/editar', methods=['GET', 'POST'])
 @login_required
 def editar(id):
     """Editar evento"""
     evento = Evento.query.get_or_404(id)
-    garcons = Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
     
     if request.method == 'POST':
         try:
@@ -210,7 +333,7 @@ def editar(id):
             valor_motorista = float(valor_motorista.replace(',', '.')) if valor_motorista else 0
             
             evento.nome = request.form.get('nome', '').strip()
-            evento.tipo = request.form.get('tipo', '').strip()
+            evento.tipo = nome_canonico(request.form.get('tipo', ''))
             evento.data = datetime.strptime(request.form.get('data'), '%d/%m/%Y').date()
             evento.hora_inicio = datetime.strptime(request.form.get('hora_inicio'), '%H:%M').time()
             evento.hora_fim = datetime.strptime(request.form.get('hora_fim'), '%H:%M').time() if request.form.get('hora_fim') else None
@@ -231,7 +354,7 @@ def editar(id):
             db.session.rollback()
             flash(f'Erro ao atualizar evento: {str(e)}', 'error')
     
-    return render_template('eventos/form.html', evento=evento, garcons=garcons)
+    return render_template('eventos/form.html', evento=evento)
 
 
 @eventos_bp.route('/<int:id>/adicionar-garcom', methods=['POST'])
@@ -338,6 +461,8 @@ def atualizar_escala(id, escala_id):
 @login_required
 def notificar(id):
     """Enviar notificações para todos os garçons do evento"""
+    from app.services.whatsapp import enviar_notificacao_whatsapp  # requests só ao notificar
+
     evento = Evento.query.get_or_404(id)
     
     if evento.escalas.count() == 0:
@@ -381,6 +506,8 @@ def notificar(id):
 @login_required
 def notificar_garcom(id, escala_id):
     """Reenviar notificação para um garçom específico"""
+    from app.services.whatsapp import enviar_notificacao_whatsapp
+
     escala = Escala.query.get_or_404(escala_id)
     
     try:
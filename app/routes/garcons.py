@@ -1,14 +1,18 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required
+from sqlalchemy import func
 
 from app import db
-from app.models import Garcom
+from app.models import Garcom, Escala
+from app.services.busca import buscar
+from app.services.condicional import pagina_condicional, sondar_modelos
 
 garcons_bp = Blueprint('garcons', __name__, url_prefix='/garcons')
 
 
 @garcons_bp.route('/')
 @login_required
+@pagina_condicional(sondar_modelos(Garcom, Escala))
 def index():
     """Lista de garçons"""
     filtro = request.args.get('filtro', 'ativos')
@@ -22,14 +26,24 @@ def index():
     elif filtro == 'inativos':
         query = query.filter_by(ativo=False)
     
-    # Busca por nome
+    # Busca por nome (sem diferenciar acentos, mais relevantes primeiro)
     if busca:
-        query = query.filter(Garcom.nome.ilike(f'%{busca}%'))
+        query = buscar(query, Garcom, busca)
     
     garcons = query.order_by(Garcom.nome.asc()).all()
     
+    # Total de escalas dos garçons listados em uma consulta (também versiona o cache das linhas)
+    ids = [garcom.id for garcom in garcons]
+    totais = dict(
+        db.session.query(Escala.garcom_id, func.count(Escala.id))
+        .filter(Escala.garcom_id.in_(ids))
+        .group_by(Escala.garcom_id)
+        .all()
+    ) if ids else {}
+    
     return render_template('garcons/index.html', 
         garcons=garcons, 
+        totais=totais,
         filtro=filtro,
         busca=busca
     )
@@ -1,51 +1,191 @@
-from flask import Blueprint, render_template, request, make_response
+import os
+
+from flask import (
+    Blueprint, render_template, request, make_response, send_file, jsonify, url_for, abort,
+    Response, current_app, stream_with_context
+)
 from flask_login import login_required
 from datetime import datetime, date
 from calendar import monthrange
-from io import BytesIO
+from sqlalchemy import func
+from werkzeug.http import is_resource_modified
 
-from app.models import Evento, Escala, Garcom
-from app.services.pdf import gerar_pdf_evento, gerar_pdf_relatorio_geral, gerar_pdf_garcons, gerar_pdf_eventos_mes
+from app import db
+from app.models import Evento, Escala, Garcom, EscalaMudanca, RelatorioJob, ResumoMensal
+from app.services.condicional import pagina_condicional, sondar_modelos
+from app.services.exportacao import gerar_zip_eventos, filtros_periodo
+from app.services.pdf_cache import impressao_digital, obter_cache
+from app.services.planilhas import gerar_planilha, CONTENT_TYPES
+from app.services.relatorio_dados import (
+    snapshot_evento, linhas_eventos_mes, linhas_relatorio_geral, linhas_planilha_eventos, linhas_planilha_garcons, linhas_pagamentos
+)
+from app.services.relatorio_jobs import submeter_relatorio_geral, atualizar_status, caminho_artefato
+from app.services.resumos import resumos_ano, resumo_por_tipo
 
 relatorios_bp = Blueprint('relatorios', __name__, url_prefix='/relatorios')
 
+CABECALHO_EVENTOS = ['Data', 'Horário', 'Evento', 'Tipo', 'Local', 'Status', 'Garçons', 'Valor Total']
+CABECALHO_GARCONS = ['Nome', 'Telefone', 'E-mail', 'Idade', 'PIX', 'Eventos']
+CABECALHO_PAGAMENTOS = ['Nome', 'Telefone', 'PIX', 'Escalas', 'Como motorista', 'Valor base', 'Adicional motorista', 'Total']
+
+STATUS_PAGAMENTO = ('confirmado', 'pendente', 'recusado', 'todos')
+
+
+def _versao_feed(*filtros):
+    """Cursor e data da mudança de escala mais recente (feed de mudanças)"""
+    return db.session.query(
+        func.max(EscalaMudanca.id), func.max(EscalaMudanca.created_at)
+    ).filter(*filtros).one()
+
+
+def _versao_eventos(*filtros):
+    """Quantidade e última atualização dos eventos filtrados"""
+    return db.session.query(
+        func.count(Evento.id), func.max(Evento.updated_at)
+    ).filter(*filtros).one()
+
+
+def _versao_resumos(*filtros):
+    """Quantidade e último recálculo das linhas do resumo mensal"""
+    return db.session.query(
+        func.count(), func.max(ResumoMensal.atualizado_em)
+    ).select_from(ResumoMensal).filter(*filtros).one()
+
+
+def _tamanho(origem):
+    """Tamanho em bytes de um caminho ou arquivo aberto"""
+    if isinstance(origem, str):
+        return os.path.getsize(origem)
+    posicao = origem.tell()
+    origem.seek(0, os.SEEK_END)
+    tamanho = origem.tell()
+    origem.seek(posicao)
+    return tamanho
+
+
+def _mais_recente(*datas):
+    datas = [d for d in datas if d]
+    return max(datas) if datas else None
+
+
+def _responder_pdf(partes, modificado_em, gerar, nome_arquivo):
+    """
+    Responde o PDF identificado pela impressão digital de `partes`.
+
+    Requisições condicionais (If-None-Match / If-Modified-Since) que ainda
+    estão atualizadas recebem 304 sem consultar os dados do relatório;
+    as demais são servidas do cache de renderização ou geradas por `gerar`.
+    O corpo é enviado em streaming por `send_file`, com Content-Length e
+    suporte a Range, sem copiar o PDF inteiro para a resposta.
+    """
+    etag = impressao_digital(*partes)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=modificado_em):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        response.last_modified = modificado_em
+    else:
+        cache = obter_cache()
+        origem = cache.get(etag)
+        if origem is None:
+            origem = cache.put(etag, gerar())
+
+        response = send_file(
+            origem,
+            mimetype='application/pdf',
+            download_name=nome_arquivo,
+            etag=etag,
+            last_modified=modificado_em,
+            conditional=False
+        )
+        tamanho = _tamanho(origem)
+        response.content_length = tamanho
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.make_conditional(request, accept_ranges=True, complete_length=tamanho)
+
+    # Revalida sempre: o navegador reutiliza a cópia local enquanto o ETag conferir
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response
+
+
+def _ler_data(valor):
+    """Data AAAA-MM-DD da query string (None se vazia); 400 se inválida"""
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        abort(400)
+
+
+def _responder_planilha(formato, linhas, cabecalho, nome_arquivo, planilha):
+    """
+    Responde a planilha em streaming: cada bloco é enviado assim que as
+    linhas correspondentes são lidas do banco.
+    """
+    response = Response(
+        stream_with_context(gerar_planilha(formato, cabecalho, linhas, planilha)),
+        content_type=CONTENT_TYPES[formato]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename={nome_arquivo}.{formato}'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.cache_control.no_store = True
+    return response
+
 
 @relatorios_bp.route('/')
 @login_required
+@pagina_condicional(sondar_modelos(Evento, Escala))
 def index():
     """Página principal de relatórios"""
     eventos = Evento.query.order_by(Evento.data.desc()).limit(20).all()
-    return render_template('relatorios/index.html', eventos=eventos)
+    return render_template('relatorios/index.html', eventos=eventos, ano_atual=date.today().year)
 
 
 @relatorios_bp.route('/evento/<int:id>/pdf')
 @login_required
 def evento_pdf(id):
     """Gerar PDF de um evento específico"""
+    from app.services.pdf import gerar_pdf_evento  # ReportLab só quando um PDF é pedido
+
     evento = Evento.query.get_or_404(id)
-    
-    pdf_buffer = gerar_pdf_evento(evento)
-    
-    response = make_response(pdf_buffer.getvalue())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = f'inline; filename=evento_{evento.id}_{evento.data}.pdf'
-    
-    return response
+
+    cursor, mudanca_em = _versao_feed(EscalaMudanca.evento_id == id)
+    garcons_em = db.session.query(func.max(Garcom.updated_at)).join(Escala).filter(
+        Escala.evento_id == id
+    ).scalar()
+
+    return _responder_pdf(
+        ('evento', id, evento.updated_at, cursor, garcons_em),
+        _mais_recente(evento.updated_at, mudanca_em, garcons_em),
+        lambda: gerar_pdf_evento(snapshot_evento(id)),
+        f'evento_{evento.id}_{evento.data}.pdf'
+    )
 
 
 @relatorios_bp.route('/garcons/pdf')
 @login_required
 def garcons_pdf():
     """Gerar PDF com lista de garçons"""
-    garcons = Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
-    
-    pdf_buffer = gerar_pdf_garcons(garcons)
-    
-    response = make_response(pdf_buffer.getvalue())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = 'inline; filename=garcons.pdf'
-    
-    return response
+    total, garcons_em = db.session.query(
+        func.count(Garcom.id), func.max(Garcom.updated_at)
+    ).filter(Garcom.ativo.is_(True)).one()
+    cursor, mudanca_em = _versao_feed()
+
+    def gerar():
+        from app.services.pdf import gerar_pdf_garcons
+
+        garcons = Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
+        return gerar_pdf_garcons(garcons)
+
+    return _responder_pdf(
+        ('garcons', total, garcons_em, cursor),
+        _mais_recente(garcons_em, mudanca_em),
+        gerar,
+        'garcons.pdf'
+    )
 
 
 @relatorios_bp.route('/eventos-mes/pdf')
@@ -55,19 +195,43 @@ def eventos_mes_pdf():
     hoje = date.today()
     primeiro_dia = date(hoje.year, hoje.month, 1)
     ultimo_dia = date(hoje.year, hoje.month, monthrange(hoje.year, hoje.month)[1])
-    
-    eventos = Evento.query.filter(
-        Evento.data >= primeiro_dia,
-        Evento.data <= ultimo_dia
-    ).order_by(Evento.data).all()
-    
-    pdf_buffer = gerar_pdf_eventos_mes(eventos, hoje.month, hoje.year)
-    
-    response = make_response(pdf_buffer.getvalue())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = f'inline; filename=eventos_{hoje.month}_{hoje.year}.pdf'
-    
-    return response
+    filtros = (Evento.data >= primeiro_dia, Evento.data <= ultimo_dia)
+
+    total, eventos_em = _versao_eventos(*filtros)
+    cursor, mudanca_em = _versao_feed()
+
+    def gerar():
+        from app.services.pdf import gerar_pdf_eventos_mes
+
+        return gerar_pdf_eventos_mes(linhas_eventos_mes(*filtros), hoje.month, hoje.year)
+
+    return _responder_pdf(
+        ('eventos-mes', hoje.year, hoje.month, total, eventos_em, cursor),
+        _mais_recente(eventos_em, mudanca_em),
+        gerar,
+        f'eventos_{hoje.month}_{hoje.year}.pdf'
+    )
+
+
+@relatorios_bp.route('/ano/pdf')
+@login_required
+def ano_pdf():
+    """Gerar PDF com os totais de cada mês do ano (resumo mensal)"""
+    ano = request.args.get('ano', date.today().year, type=int)
+
+    total, resumos_em = _versao_resumos(ResumoMensal.ano == ano)
+
+    def gerar():
+        from app.services.pdf import gerar_pdf_resumo_anual
+
+        return gerar_pdf_resumo_anual(resumos_ano(ano), resumo_por_tipo(ano), ano)
+
+    return _responder_pdf(
+        ('ano', ano, total, resumos_em),
+        resumos_em,
+        gerar,
+        f'resumo_{ano}.pdf'
+    )
 
 
 @relatorios_bp.route('/geral/pdf')
@@ -76,23 +240,244 @@ def geral_pdf():
     """Gerar PDF de relatório geral por período"""
     data_inicio = request.args.get('data_inicio')
     data_fim = request.args.get('data_fim')
-    
-    query = Evento.query
-    
+
+    filtros = []
+
     if data_inicio:
         data_inicio = datetime.strptime(data_inicio, '%Y-%m-%d').date()
-        query = query.filter(Evento.data >= data_inicio)
-    
+        filtros.append(Evento.data >= data_inicio)
+
     if data_fim:
         data_fim = datetime.strptime(data_fim, '%Y-%m-%d').date()
-        query = query.filter(Evento.data <= data_fim)
-    
-    eventos = query.order_by(Evento.data.desc()).all()
-    
-    pdf_buffer = gerar_pdf_relatorio_geral(eventos, data_inicio, data_fim)
-    
-    response = make_response(pdf_buffer.getvalue())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = 'inline; filename=relatorio_geral.pdf'
-    
+        filtros.append(Evento.data <= data_fim)
+
+    total, eventos_em = _versao_eventos(*filtros)
+    cursor, mudanca_em = _versao_feed()
+
+    def gerar():
+        from app.services.pdf import gerar_pdf_relatorio_geral
+
+        return gerar_pdf_relatorio_geral(linhas_relatorio_geral(*filtros), data_inicio, data_fim)
+
+    return _responder_pdf(
+        ('geral', data_inicio, data_fim, total, eventos_em, cursor),
+        _mais_recente(eventos_em, mudanca_em),
+        gerar,
+        'relatorio_geral.pdf'
+    )
+
+
+@relatorios_bp.route('/eventos/zip')
+@login_required
+def eventos_zip():
+    """Exportar o PDF de cada evento do período em um único ZIP (padrão: mês atual)"""
+    hoje = date.today()
+
+    try:
+        data_inicio = request.args.get('data_inicio')
+        data_inicio = datetime.strptime(data_inicio, '%Y-%m-%d').date() if data_inicio else date(hoje.year, hoje.month, 1)
+        data_fim = request.args.get('data_fim')
+        data_fim = datetime.strptime(data_fim, '%Y-%m-%d').date() if data_fim else date(
+            hoje.year, hoje.month, monthrange(hoje.year, hoje.month)[1]
+        )
+    except ValueError:
+        abort(400)
+
+    # Os PDFs entram no ZIP conforme ficam prontos; sem Content-Length
+    response = Response(stream_with_context(gerar_zip_eventos(data_inicio, data_fim)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename=eventos_{data_inicio}_{data_fim}.zip'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.cache_control.no_store = True
     return response
+
+
+@relatorios_bp.route('/geral/<any(csv, xlsx):formato>')
+@login_required
+def geral_planilha(formato):
+    """Exportar o relatório geral por período em CSV ou XLSX"""
+    data_inicio = _ler_data(request.args.get('data_inicio'))
+    data_fim = _ler_data(request.args.get('data_fim'))
+
+    return _responder_planilha(
+        formato,
+        linhas_planilha_eventos(*filtros_periodo(data_inicio, data_fim)),
+        CABECALHO_EVENTOS,
+        'relatorio_geral',
+        'Relatório Geral'
+    )
+
+
+@relatorios_bp.route('/eventos-mes/<any(csv, xlsx):formato>')
+@login_required
+def eventos_mes_planilha(formato):
+    """Exportar os eventos do mês atual em CSV ou XLSX"""
+    hoje = date.today()
+    primeiro_dia = date(hoje.year, hoje.month, 1)
+    ultimo_dia = date(hoje.year, hoje.month, monthrange(hoje.year, hoje.month)[1])
+
+    return _responder_planilha(
+        formato,
+        linhas_planilha_eventos(*filtros_periodo(primeiro_dia, ultimo_dia), crescente=True),
+        CABECALHO_EVENTOS,
+        f'eventos_{hoje.month}_{hoje.year}',
+        f'Eventos {hoje.month:02d}-{hoje.year}'
+    )
+
+
+@relatorios_bp.route('/garcons/<any(csv, xlsx):formato>')
+@login_required
+def garcons_planilha(formato):
+    """Exportar a lista de garçons ativos em CSV ou XLSX"""
+    return _responder_planilha(
+        formato,
+        linhas_planilha_garcons(),
+        CABECALHO_GARCONS,
+        'garcons',
+        'Garçons'
+    )
+
+
+def _parametros_pagamentos():
+    """
+    Período (padrão: mês atual) e status das escalas do relatório de
+    pagamentos, com os filtros correspondentes.
+    """
+    hoje = date.today()
+    data_inicio = _ler_data(request.args.get('data_inicio')) or date(hoje.year, hoje.month, 1)
+    data_fim = _ler_data(request.args.get('data_fim')) or date(
+        hoje.year, hoje.month, monthrange(hoje.year, hoje.month)[1]
+    )
+    status = request.args.get('status', 'confirmado')
+    if status not in STATUS_PAGAMENTO:
+        abort(400)
+
+    filtros = filtros_periodo(data_inicio, data_fim)
+    if status != 'todos':
+        filtros.append(Escala.status == status)
+
+    return data_inicio, data_fim, status, filtros
+
+
+@relatorios_bp.route('/pagamentos')
+@login_required
+def pagamentos():
+    """Valor a pagar para cada garçom no período"""
+    data_inicio, data_fim, status, filtros = _parametros_pagamentos()
+    linhas = linhas_pagamentos(*filtros)
+
+    return render_template(
+        'relatorios/pagamentos.html',
+        linhas=linhas,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        status=status,
+        total_geral=sum(linha.valor_total for linha in linhas)
+    )
+
+
+@relatorios_bp.route('/pagamentos/pdf')
+@login_required
+def pagamentos_pdf():
+    """Gerar PDF dos pagamentos por garçom"""
+    data_inicio, data_fim, status, filtros = _parametros_pagamentos()
+    periodo = filtros_periodo(data_inicio, data_fim)
+
+    total, eventos_em = _versao_eventos(*periodo)
+    cursor, mudanca_em = _versao_feed()
+    garcons_em = db.session.query(func.max(Garcom.updated_at)).scalar()
+
+    def gerar():
+        from app.services.pdf import gerar_pdf_pagamentos
+
+        return gerar_pdf_pagamentos(
+            linhas_pagamentos(*filtros), data_inicio, data_fim, None if status == 'todos' else status
+        )
+
+    return _responder_pdf(
+        ('pagamentos', data_inicio, data_fim, status, total, eventos_em, cursor, garcons_em),
+        _mais_recente(eventos_em, mudanca_em, garcons_em),
+        gerar,
+        f'pagamentos_{data_inicio}_{data_fim}.pdf'
+    )
+
+
+@relatorios_bp.route('/pagamentos/<any(csv, xlsx):formato>')
+@login_required
+def pagamentos_planilha(formato):
+    """Exportar os pagamentos por garçom em CSV ou XLSX"""
+    data_inicio, data_fim, status, filtros = _parametros_pagamentos()
+
+    def linhas():
+        for linha in linhas_pagamentos(*filtros):
+            yield linha[1:]  # sem o id do garçom
+
+    return _responder_planilha(
+        formato,
+        linhas(),
+        CABECALHO_PAGAMENTOS,
+        f'pagamentos_{data_inicio}_{data_fim}',
+        'Pagamentos'
+    )
+
+
+def _job_json(job):
+    return {
+        'id': job.id,
+        'tipo': job.tipo,
+        'status': job.status,
+        'erro': job.erro,
+        'url_status': url_for('relatorios.job_status', job_id=job.id),
+        'url_download': url_for('relatorios.job_download', job_id=job.id) if job.status == 'pronto' else None,
+    }
+
+
+@relatorios_bp.route('/jobs', methods=['POST'])
+@login_required
+def job_novo():
+    """Agendar a geração do relatório geral em segundo plano"""
+    data_inicio = request.form.get('data_inicio')
+    data_fim = request.form.get('data_fim')
+
+    try:
+        data_inicio = datetime.strptime(data_inicio, '%Y-%m-%d').date() if data_inicio else None
+        data_fim = datetime.strptime(data_fim, '%Y-%m-%d').date() if data_fim else None
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Data inválida'}), 400
+
+    try:
+        job = submeter_relatorio_geral(data_inicio, data_fim)
+    except RuntimeError as exc:  # RELATORIO_JOBS_DIR inseguro
+        current_app.logger.error('Relatório em segundo plano recusado: %s', exc)
+        return jsonify({'status': 'error', 'message': 'Relatórios em segundo plano indisponíveis'}), 503
+
+    return jsonify(_job_json(job)), 202
+
+
+@relatorios_bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """Consultar o status de um relatório em segundo plano"""
+    job = RelatorioJob.query.get_or_404(job_id)
+    return jsonify(_job_json(atualizar_status(job)))
+
+
+@relatorios_bp.route('/jobs/<job_id>/download')
+@login_required
+def job_download(job_id):
+    """Baixar o PDF de um relatório em segundo plano já concluído"""
+    job = atualizar_status(RelatorioJob.query.get_or_404(job_id))
+
+    if job.status != 'pronto':
+        abort(409)
+
+    caminho = caminho_artefato(job)
+    if not os.path.exists(caminho):
+        abort(410)  # artefato descartado pela poda; agende de novo
+
+    return send_file(
+        caminho,
+        mimetype='application/pdf',
+        download_name='relatorio_geral.pdf',
+        etag=job.chave,
+        conditional=True
+    )
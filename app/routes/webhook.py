@@ -135,6 +135,9 @@ def _processar_status(status: dict, phone_number_id: str):
     Processa atualizações de status de mensagens enviadas.
     Exemplo: delivered, read, sent, failed.
     """
+    from app.services.mudancas import registrar_entrega
+
+    msg_id = status.get('id')                  # wamid da mensagem enviada
     status_value = status.get('status')        # sent | delivered | read | failed
     recipient_id = status.get('recipient_id')  # número do destinatário
     timestamp = status.get('timestamp')
@@ -144,6 +147,10 @@ def _processar_status(status: dict, phone_number_id: str):
         recipient_id, status_value, phone_number_id, timestamp,
     )
 
+    # Repassa ao feed da escala para a atualização ao vivo do evento
+    if msg_id and status_value:
+        registrar_entrega(msg_id, status_value)
+
     # Erros de envio
     errors = status.get('errors', [])
     for err in errors:
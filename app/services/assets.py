@@ -0,0 +1,139 @@
+"""
+Arquivos estáticos gerados pelo build (scripts/construir_assets.py).
+
+O build grava em app/static/dist o CSS do Tailwind, as fontes e as
+variantes das imagens com o hash do conteúdo no nome, mais um
+manifest.json (nome lógico -> arquivo). `asset_url('app.css')` devolve a
+URL do arquivo atual, ou None quando o build não foi executado (os
+templates caem no Tailwind do CDN, só para desenvolvimento).
+
+`imagem_responsiva` monta um <picture> com AVIF/WebP e o formato
+original em `srcset`, para o navegador baixar só a largura necessária
+para o tamanho exibido e a densidade da tela. Sem build, usa a imagem
+original.
+
+Os arquivos de dist/ nunca mudam de conteúdo sob o mesmo nome, então são
+servidos com cache público e imutável de um ano. Os de texto (CSS) têm
+versões .br/.gz geradas no build, entregues conforme o Accept-Encoding
+sem comprimir nada durante a requisição.
+"""
+
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+from markupsafe import Markup
+
+from app.services.compressao import escolher_codificacao
+
+DIRETORIO_BUILD = 'dist'
+MANIFESTO = 'manifest.json'
+UM_ANO = 365 * 24 * 3600
+
+# Formatos modernos oferecidos em <source>, na ordem de preferência
+FORMATOS_MODERNOS = ('avif', 'webp')
+
+# Codificação -> extensão das versões pré-comprimidas, na ordem de preferência
+PRE_COMPRIMIDOS = {'br': '.br', 'gzip': '.gz'}
+
+
+def carregar_manifesto(app):
+    """Manifesto do build ({} se o build não foi executado)"""
+    caminho = os.path.join(app.static_folder, DIRETORIO_BUILD, MANIFESTO)
+    try:
+        with open(caminho) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _manifesto():
+    if current_app.debug:
+        return carregar_manifesto(current_app)  # reflete um build novo sem reiniciar
+    return current_app.extensions['assets_manifesto']
+
+
+def asset_url(nome):
+    """URL do arquivo gerado pelo build para o nome lógico (None se não houver)"""
+    arquivo = _manifesto().get(nome)
+    return url_for('static', filename=arquivo) if isinstance(arquivo, str) else None
+
+
+def _srcset(variantes):
+    return ', '.join(f"{url_for('static', filename=arquivo)} {largura}w" for largura, arquivo in variantes)
+
+
+def imagem_responsiva(nome, alt, largura, classe=''):
+    """
+    <picture> da imagem `nome` (ex.: 'img/logo-small.png') exibida com
+    `largura` px de largura CSS.
+    """
+    imagem = _manifesto().get('imagens', {}).get(nome)
+    if not imagem:
+        return Markup('<img src="{}" alt="{}" class="{}">').format(
+            url_for('static', filename=nome), alt, classe
+        )
+
+    altura = round(imagem['altura'] * largura / imagem['largura'])
+    # {formato: [(largura, arquivo), ...]} em ordem crescente (o JSON guarda as larguras como texto)
+    variantes = {
+        formato: sorted((int(l), arquivo) for l, arquivo in arquivos.items())
+        for formato, arquivos in imagem['variantes'].items()
+    }
+    fontes = [
+        Markup('<source type="image/{}" srcset="{}" sizes="{}px">').format(
+            formato, _srcset(variantes[formato]), largura
+        )
+        for formato in FORMATOS_MODERNOS if formato in variantes
+    ]
+    original = next(v for f, v in variantes.items() if f not in FORMATOS_MODERNOS)
+    # src para navegadores sem srcset: a menor variante que cobre telas 2x
+    padrao = next((arquivo for l, arquivo in original if l >= 2 * largura), original[-1][1])
+
+    img = Markup(
+        '<img src="{}" srcset="{}" sizes="{}px" width="{}" height="{}" alt="{}" class="{}" decoding="async">'
+    ).format(
+        url_for('static', filename=padrao),
+        _srcset(original), largura, largura, altura, alt, classe,
+    )
+    return Markup('<picture>{}{}</picture>').format(Markup('').join(fontes), img)
+
+
+def servir_estatico(filename):
+    """View de /static: usa a versão .br/.gz do build quando o cliente aceita"""
+    disponiveis = _manifesto().get('comprimidos', {}).get(filename)
+    codificacao = disponiveis and escolher_codificacao(request.accept_encodings, disponiveis)
+    if not codificacao:
+        return current_app.send_static_file(filename)
+
+    response = send_from_directory(
+        current_app.static_folder,
+        filename + PRE_COMPRIMIDOS[codificacao],
+        mimetype=mimetypes.guess_type(filename)[0],
+    )
+    response.headers['Content-Encoding'] = codificacao
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _cache_imutavel(response):
+    """Cache de longa duração para os arquivos versionados pelo hash"""
+    if request.endpoint != 'static' or response.status_code not in (200, 206, 304):
+        return response
+    arquivo = (request.view_args or {}).get('filename', '')
+    if arquivo.startswith(f'{DIRETORIO_BUILD}/') and not arquivo.endswith(MANIFESTO):
+        response.cache_control.public = True
+        response.cache_control.max_age = UM_ANO
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+
+def registrar_assets(app):
+    app.extensions['assets_manifesto'] = carregar_manifesto(app)
+    app.add_template_global(asset_url)
+    app.add_template_global(imagem_responsiva)
+    app.after_request(_cache_imutavel)
+    if app.has_static_folder:
+        app.view_functions['static'] = servir_estatico
@@ -0,0 +1,86 @@
+"""
+Perfil do banco por rota: statement_timeout e leitura em réplica.
+
+As opções de engine (pool, pre-ping, recycle) ficam em
+`SQLALCHEMY_ENGINE_OPTIONS` de cada ambiente (app/config.py). Aqui cada
+requisição ganha, a partir do endpoint:
+
+  - um `statement_timeout` (TIMEOUTS_POR_ROTA, senão o padrão curto
+    DB_STATEMENT_TIMEOUT_MS), aplicado com `SET LOCAL` no início de cada
+    transação, então vale só para ela e não volta para o pool.
+    Relatórios podem rodar mais que as demais rotas. Só no PostgreSQL.
+    O timeout não é opção da conexão: comandos `flask` como
+    inicializar-banco e reconstruir-resumos rodam fora de requisição e
+    não podem ser cancelados por ele;
+  - a réplica de leitura (bind 'replica' em SQLALCHEMY_BINDS) para os
+    GETs de ROTAS_REPLICA, exceto ROTAS_SOMENTE_PRIMARIO. Flush e
+    INSERT/UPDATE/DELETE continuam no primário mesmo nessas rotas.
+
+Sem bind 'replica' tudo vai para o primário. A réplica pode estar alguns
+segundos atrasada, por isso só rotas que toleram isso (relatórios e
+dashboard) a usam; confirmações e telas de edição leem do primário.
+
+Este módulo é importado antes de `db` existir (app/__init__.py usa
+`SessaoRoteada` ao criar a extensão), então não importa `app`.
+"""
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session as SessaoFlask
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+BIND_REPLICA = 'replica'
+
+METODOS_LEITURA = ('GET', 'HEAD')
+
+
+def timeout_da_rota(endpoint, timeouts):
+    """statement_timeout (ms) do prefixo mais longo que casa com o endpoint, ou None"""
+    prefixo = max((p for p in timeouts if endpoint.startswith(p)), key=len, default=None)
+    return timeouts[prefixo] if prefixo is not None else None
+
+
+def usa_replica(endpoint, metodo, config):
+    if metodo not in METODOS_LEITURA or BIND_REPLICA not in config['SQLALCHEMY_BINDS']:
+        return False
+    if endpoint.startswith(tuple(config['ROTAS_SOMENTE_PRIMARIO'])):
+        return False
+    return endpoint.startswith(tuple(config['ROTAS_REPLICA']))
+
+
+class SessaoRoteada(SessaoFlask):
+    """Sessão do `db` que manda as leituras das rotas de relatório para a réplica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not getattr(clause, 'is_dml', False)
+            and has_request_context()
+            and g.get('banco_replica', False)
+        ):
+            return self._db.engines[BIND_REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def registrar_banco(app):
+    """Escolhe timeout e réplica a cada requisição"""
+
+    @app.before_request
+    def _perfil_da_rota():
+        endpoint = request.endpoint or ''
+        g.statement_timeout = (
+            timeout_da_rota(endpoint, current_app.config['TIMEOUTS_POR_ROTA'])
+            or current_app.config['DB_STATEMENT_TIMEOUT_MS']
+        )
+        g.banco_replica = usa_replica(endpoint, request.method, current_app.config)
+
+
+@event.listens_for(Session, 'after_begin')
+def _aplicar_timeout(session, transaction, connection):
+    """SET LOCAL vale até o fim da transação: a conexão volta ao pool sem limite"""
+    if not has_request_context() or connection.dialect.name != 'postgresql':
+        return
+    timeout = g.get('statement_timeout')
+    if timeout:
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {int(timeout)}')
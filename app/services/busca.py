@@ -0,0 +1,136 @@
+"""
+Busca de garçons e eventos por nome, sem diferenciar acentos.
+
+`ilike('%termo%')` varre a tabela inteira e não acha "João" buscando
+"Joao". Aqui o nome de cada garçom e evento é guardado normalizado
+(minúsculo, sem acentos) na tabela `indice_busca`, atualizada no
+after_flush de toda escrita, na mesma transação. O termo buscado passa
+pela mesma normalização, então a comparação é igual nos dois bancos.
+
+Backends, escolhidos pelo dialeto da conexão:
+  - PostgreSQL: `LIKE '%palavra%'` no texto normalizado, atendido pelo
+    índice GIN de trigramas (pg_trgm), ordenado por `word_similarity`;
+  - SQLite: índice FTS5 sobre a mesma tabela, cada palavra buscada como
+    prefixo ("jo" acha "João"), ordenado pelo bm25 do FTS5;
+  - outros: `LIKE` no texto normalizado, sem índice.
+
+Escritas que não passam pelo ORM (SQL direto, importações) não atualizam
+o índice: `flask reconstruir-busca` refaz tudo.
+"""
+
+import re
+import unicodedata
+from itertools import chain
+
+from sqlalchemy import column, delete, event, false, func, insert, inspect, select, table
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Evento, Garcom, IndiceBusca
+
+# Modelo -> (entidade no índice, atributos que compõem o texto)
+ENTIDADES = {
+    Garcom: ('garcom', ('nome',)),
+    Evento: ('evento', ('nome',)),
+}
+
+_FTS = table('indice_busca_fts', column('rowid'), column('rank'), column('indice_busca_fts'))
+
+
+def normalizar(texto):
+    """Minúsculo, sem acentos e com espaços simples: 'João  Silva' -> 'joao silva'"""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
+
+
+def palavras(termo):
+    return re.findall(r'\w+', normalizar(termo))
+
+
+def texto_indexado(obj):
+    _, atributos = ENTIDADES[type(obj)]
+    return normalizar(' '.join(getattr(obj, nome) or '' for nome in atributos))
+
+
+def buscar(query, modelo, termo):
+    """
+    Filtra `query` (de `modelo`) pelos registros cujo nome casa com
+    `termo`, os mais relevantes primeiro. Ordenações adicionadas depois
+    desempatam.
+    """
+    entidade, _ = ENTIDADES[modelo]
+    termos = palavras(termo)
+    if not termos:
+        return query.filter(false())
+
+    query = query.join(
+        IndiceBusca,
+        (IndiceBusca.entidade == entidade) & (IndiceBusca.registro_id == modelo.id),
+    )
+    dialeto = db.session.get_bind().dialect.name
+
+    if dialeto == 'sqlite':
+        consulta = ' '.join(f'"{palavra}"*' for palavra in termos)
+        return (
+            query.join(_FTS, _FTS.c.rowid == IndiceBusca.id)
+            .filter(_FTS.c.indice_busca_fts.op('MATCH')(consulta))
+            .order_by(_FTS.c.rank)
+        )
+
+    for palavra in termos:
+        query = query.filter(IndiceBusca.texto.contains(palavra, autoescape=True))
+    if dialeto == 'postgresql':
+        query = query.order_by(func.word_similarity(' '.join(termos), IndiceBusca.texto).desc())
+    return query
+
+
+def reconstruir_indice():
+    """Refaz o índice de busca a partir de garçons e eventos. Retorna o total indexado."""
+    db.session.execute(delete(IndiceBusca))
+    total = 0
+    for modelo, (entidade, atributos) in ENTIDADES.items():
+        colunas = [getattr(modelo, nome) for nome in atributos]
+        linhas = [
+            {'entidade': entidade, 'registro_id': id_, 'texto': normalizar(' '.join(v or '' for v in valores))}
+            for id_, *valores in db.session.execute(select(modelo.id, *colunas))
+        ]
+        if linhas:
+            db.session.execute(insert(IndiceBusca), linhas)
+        total += len(linhas)
+    db.session.commit()
+    return total
+
+
+def _precisa_reindexar(obj, session):
+    if obj in session.new:
+        return True
+    _, atributos = ENTIDADES[type(obj)]
+    attrs = inspect(obj).attrs
+    return any(getattr(attrs, nome).history.has_changes() for nome in atributos)
+
+
+@event.listens_for(Session, 'after_flush')
+def _atualizar_indice_busca(session, flush_context):
+    """Grava o texto normalizado na mesma transação que alterou os registros"""
+    removidos, gravados = [], []
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if type(obj) not in ENTIDADES:
+            continue
+        entidade = ENTIDADES[type(obj)][0]
+        if obj in session.deleted:
+            removidos.append((entidade, obj.id))
+        elif _precisa_reindexar(obj, session):
+            removidos.append((entidade, obj.id))
+            gravados.append({'entidade': entidade, 'registro_id': obj.id, 'texto': texto_indexado(obj)})
+    if not removidos:
+        return
+
+    conexao = session.connection()
+    tabela = IndiceBusca.__table__
+    for entidade, registro_id in removidos:
+        conexao.execute(
+            delete(tabela).where(tabela.c.entidade == entidade, tabela.c.registro_id == registro_id)
+        )
+    if gravados:
+        conexao.execute(insert(tabela), gravados)
@@ -0,0 +1,86 @@
+"""
+Compressão das respostas (gzip e brotli).
+
+`comprimir_resposta` (after_request) comprime as respostas dinâmicas de
+texto (HTML, JSON, CSV...) quando o cliente aceita e o corpo passa de
+COMPRESSAO_MIN_BYTES. Preferência pelo brotli quando o módulo `brotli`
+está instalado e o cliente o aceita com qualidade igual ou maior.
+
+Não passam por aqui:
+  - respostas em streaming (ZIP e planilhas, enviadas em blocos);
+  - arquivos servidos por `send_file` (PDFs, estáticos): os estáticos do
+    build têm versões .br/.gz pré-comprimidas (app/services/assets.py) e
+    PDFs, imagens e fontes já são formatos comprimidos.
+
+Toda resposta de tipo comprimível leva `Vary: Accept-Encoding`, para que
+proxies e o navegador não sirvam uma versão comprimida a quem não aceita.
+"""
+
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só gzip
+    brotli = None
+
+TIPOS_COMPRIMIVEIS = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/javascript', 'application/json', 'image/svg+xml',
+})
+
+
+def escolher_codificacao(aceitas, disponiveis=None):
+    """'br', 'gzip' ou None conforme o Accept-Encoding e os codificadores disponíveis"""
+    if disponiveis is None:
+        disponiveis = ('br', 'gzip') if brotli else ('gzip',)
+    melhor, qualidade = None, 0
+    for codificacao in disponiveis:  # em ordem de preferência no empate
+        q = aceitas.quality(codificacao)
+        if q > qualidade:
+            melhor, qualidade = codificacao, q
+    return melhor
+
+
+def comprimir(dados, codificacao):
+    config = current_app.config
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=config['COMPRESSAO_NIVEL_BROTLI'])
+    return gzip.compress(dados, compresslevel=config['COMPRESSAO_NIVEL_GZIP'], mtime=0)
+
+
+def comprimir_resposta(response):
+    if response.mimetype not in TIPOS_COMPRIMIVEIS:
+        return response
+    response.vary.add('Accept-Encoding')
+
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or 'Content-Range' in response.headers
+    ):
+        return response
+
+    codificacao = escolher_codificacao(request.accept_encodings)
+    if codificacao is None:
+        return response
+
+    dados = response.get_data()
+    if len(dados) < current_app.config['COMPRESSAO_MIN_BYTES']:
+        return response
+
+    response.set_data(comprimir(dados, codificacao))
+    response.headers['Content-Encoding'] = codificacao
+
+    # A versão comprimida é outra representação: ETag forte precisa mudar
+    etag, fraco = response.get_etag()
+    if etag and not fraco:
+        response.set_etag(f'{etag}-{codificacao}')
+    return response
+
+
+def registrar_compressao(app):
+    app.after_request(comprimir_resposta)
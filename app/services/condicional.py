@@ -0,0 +1,162 @@
+"""
+GET condicional para as páginas HTML de listagem e detalhe.
+
+`pagina_condicional(sondagem)` decora uma view: antes de executá-la, roda
+uma única consulta com as colunas da sondagem (versões e últimas
+alterações do que a página mostra) e monta um ETag fraco com o
+resultado. Se o navegador já tem a página com esse ETag (If-None-Match)
+ou mais nova que a última alteração (If-Modified-Since), a resposta é 304
+sem executar as consultas da view nem renderizar o template.
+
+A sondagem roda em toda requisição, então só usa buscas por chave ou
+índice, nunca agregados sobre tabelas inteiras:
+
+  - `sondar_modelos(*modelos)`, das listagens: eventos e garçons pelo
+    contador de escritas do modelo em `versoes_cache` (incrementado na
+    transação de todo flush que cria, altera ou exclui um registro);
+    escalas pelo cursor do feed de mudanças (status, valor, motorista,
+    entregas, escalas adicionadas e removidas);
+  - `sondar_evento`, do detalhe: só o evento da URL (`updated_at`,
+    quantidade de escalas, último registro do feed do evento e última
+    alteração dos seus garçons), para que escritas em outros eventos não
+    invalidem a página.
+
+O ETag também leva o usuário, a URL completa, o dia (filtros de "próximos
+eventos") e o token CSRF da sessão, com uma janela de tempo menor que a
+validade do token para que formulários de páginas reaproveitadas não
+expirem. Respostas com mensagens flash pendentes não são condicionais.
+"""
+
+import time
+from datetime import date
+from functools import wraps
+from itertools import chain
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+
+from app import db
+from app.models import Escala, EscalaMudanca, Evento, Garcom, VersaoCache
+from app.services.elenco import incrementar_versao
+from app.services.pdf_cache import impressao_digital
+
+# Contadores de escrita (versoes_cache) dos modelos sondados nas listagens
+CHAVES_VERSAO = {Evento: 'eventos', Garcom: 'cadastro_garcons'}
+
+
+def _ultima_mudanca(*filtros):
+    """created_at do registro mais recente do feed (pela chave primária)"""
+    return (
+        select(EscalaMudanca.created_at).where(*filtros)
+        .order_by(EscalaMudanca.id.desc()).limit(1).scalar_subquery()
+    )
+
+
+def _sondas(modelo):
+    """Versão e data da última escrita no modelo"""
+    if modelo is Escala:
+        return (select(func.max(EscalaMudanca.id)).scalar_subquery(), _ultima_mudanca())
+    chave = VersaoCache.chave == CHAVES_VERSAO[modelo]
+    return (
+        select(VersaoCache.versao).where(chave).scalar_subquery(),
+        select(VersaoCache.atualizado_em).where(chave).scalar_subquery(),
+    )
+
+
+def sondar_modelos(*modelos):
+    """Sondagem das listagens: muda a cada escrita em qualquer um dos `modelos`"""
+    def sondagem(**kwargs):
+        return tuple(chain.from_iterable(_sondas(modelo) for modelo in modelos))
+    return sondagem
+
+
+def sondar_evento(id, **kwargs):
+    """Sondagem do detalhe: muda só com escritas no evento, nas suas escalas ou nos seus garçons"""
+    return (
+        select(Evento.updated_at).where(Evento.id == id).scalar_subquery(),
+        select(func.count(Escala.id)).where(Escala.evento_id == id).scalar_subquery(),
+        select(func.max(EscalaMudanca.id)).where(EscalaMudanca.evento_id == id).scalar_subquery(),
+        _ultima_mudanca(EscalaMudanca.evento_id == id),
+        select(func.max(Garcom.updated_at))
+        .join(Escala, Escala.garcom_id == Garcom.id)
+        .where(Escala.evento_id == id)
+        .scalar_subquery(),
+    )
+
+
+def versao_pagina(colunas):
+    """Valores das colunas de sondagem, em uma única consulta"""
+    return tuple(db.session.execute(select(*colunas)).one())
+
+
+def _janela_csrf():
+    limite = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    return int(time.time() // (limite / 2)) if limite else 0
+
+
+def pagina_condicional(sondagem):
+    """Responde 304 quando a sondagem não mudou desde a cópia do navegador"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            generate_csrf()  # cria o token da sessão antes do hash, como a renderização faria
+            versoes = versao_pagina(sondagem(**kwargs))
+            etag = impressao_digital(
+                current_user.get_id(), request.full_path, date.today(),
+                session.get(current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token')),
+                _janela_csrf(), *versoes
+            )
+            datas = [v for v in versoes if hasattr(v, 'timetuple')]
+            modificado_em = max(datas) if datas else None
+
+            if is_resource_modified(request.environ, etag=etag, last_modified=modificado_em):
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            else:
+                response = make_response('', 304)
+
+            response.set_etag(etag, weak=True)
+            response.last_modified = modificado_em
+            # Revalida sempre: o navegador reutiliza a cópia local enquanto o ETag conferir
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def _altera_modelo(obj, session):
+    if type(obj) not in CHAVES_VERSAO:
+        return False
+    return obj in session.new or obj in session.deleted or session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(Session, 'before_flush')
+def _marcar_modelos_alterados(session, flush_context, instances):
+    alterados = {
+        CHAVES_VERSAO[type(obj)]
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if _altera_modelo(obj, session)
+    }
+    if alterados:
+        session.info.setdefault('condicional_incrementar', set()).update(alterados)
+
+
+@event.listens_for(Session, 'after_flush')
+def _incrementar_versoes_modelos(session, flush_context):
+    """Grava as novas versões na mesma transação da escrita"""
+    for chave in sorted(session.info.pop('condicional_incrementar', ())):
+        incrementar_versao(session.connection(), chave)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_marca_modelos(session):
+    session.info.pop('condicional_incrementar', None)
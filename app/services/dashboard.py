@@ -0,0 +1,159 @@
+"""
+Estatísticas do dashboard.
+
+Os números da página inicial saem de duas consultas (`consultar_painel`):
+os eventos a partir de hoje são agrupados com suas escalas e os totais
+gerais vêm de funções de janela sobre esse mesmo conjunto, então a lista
+de próximos eventos já traz as contagens de garçons de cada um; o total
+de eventos do mês é lido do resumo mensal (app/services/resumos.py).
+
+O resultado (imutável) fica em cache no processo, validado pelo contador
+'painel' em `versoes_cache` como o elenco de garçons
+(app/services/elenco.py): todo flush que altera eventos ou escalas a
+partir do início do mês corrente incrementa o contador na mesma
+transação, então todos os workers enxergam a mudança na leitura seguinte.
+Quando a página lê da réplica (app/services/banco.py) o cache fica de
+fora: os números da réplica podem estar atrasados e ficariam guardados
+no processo sob uma versão que não é a deles.
+"""
+
+from collections import namedtuple
+from datetime import date, timedelta
+from itertools import chain
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from app import db
+from app.models import Evento, Escala, badge_evento
+from app.services.elenco import incrementar_versao, versao_atual
+from app.services.resumos import resumo_mes
+
+CHAVE_VERSAO = 'painel'
+
+DIAS_PROXIMOS = 30
+LIMITE_PROXIMOS = 5
+
+ProximoEvento = namedtuple('ProximoEvento', [
+    'id', 'nome', 'tipo', 'local', 'data', 'status_badge', 'total_garcons', 'total_confirmados',
+])
+
+Painel = namedtuple('Painel', [
+    'proximos_eventos', 'eventos_hoje', 'pendentes', 'total_eventos_mes', 'total_confirmados',
+])
+
+
+def _contar_status(status):
+    return func.coalesce(func.sum(case((Escala.status == status, 1), else_=0)), 0)
+
+
+def consultar_painel(hoje):
+    """
+    Monta o Painel do dia: eventos a partir de hoje e o resumo do mês.
+
+    Returns:
+        Painel
+    """
+    limite = hoje + timedelta(days=DIAS_PROXIMOS)
+    eventos_mes = resumo_mes(hoje.year, hoje.month).total_eventos
+
+    por_evento = (
+        select(
+            Evento.id, Evento.nome, Evento.tipo, Evento.local, Evento.data, Evento.status,
+            func.count(Escala.id).label('total'),
+            _contar_status('confirmado').label('confirmados'),
+            _contar_status('pendente').label('pendentes'),
+        )
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .where(Evento.data >= hoje)
+        .group_by(Evento.id)
+        .subquery()
+    )
+    e = por_evento.c
+    proximo = e.data <= limite
+
+    rows = db.session.execute(
+        select(
+            e.id, e.nome, e.tipo, e.local, e.data, e.status, e.total, e.confirmados,
+            # Totais sobre todos os eventos agrupados, repetidos em cada linha
+            func.sum(case((e.data == hoje, 1), else_=0)).over(),
+            func.sum(e.pendentes).over(),
+            func.sum(e.confirmados).over(),
+        )
+        .order_by(case((proximo, 0), else_=1), e.data, e.id)
+        .limit(LIMITE_PROXIMOS)
+    ).all()
+
+    if not rows:
+        return Painel((), 0, 0, eventos_mes, 0)
+
+    proximos = tuple(
+        ProximoEvento(id_, nome, tipo, local, data, badge_evento(status), total, int(confirmados))
+        for id_, nome, tipo, local, data, status, total, confirmados, *_ in rows
+        if data <= limite
+    )
+    eventos_hoje, pendentes, confirmados = (int(v or 0) for v in rows[0][8:])
+    return Painel(proximos, eventos_hoje, pendentes, eventos_mes, confirmados)
+
+
+def obter_painel():
+    """Painel do dia, do cache do processo se a versão não mudou (lido da réplica, sem cache)"""
+    hoje = date.today()
+    if has_request_context() and g.get('banco_replica', False):
+        return consultar_painel(hoje)
+    versao = versao_atual(CHAVE_VERSAO)
+    cache = current_app.extensions.get('painel_cache')
+    if cache and cache['dia'] == hoje and cache['versao'] == versao:
+        return cache['painel']
+
+    painel = consultar_painel(hoje)
+    current_app.extensions['painel_cache'] = {'dia': hoje, 'versao': versao, 'painel': painel}
+    return painel
+
+
+def invalidar_painel():
+    if has_app_context():
+        current_app.extensions.pop('painel_cache', None)
+
+
+def _afeta_painel(obj, inicio_mes):
+    """Se a escrita envolve um evento a partir do início do mês (ou não dá para saber)"""
+    if isinstance(obj, Escala):
+        obj = inspect(obj).attrs.evento.loaded_value
+        if obj is NO_VALUE or obj is None:
+            return True
+    elif not isinstance(obj, Evento):
+        return False
+
+    datas = [obj.data, *inspect(obj).attrs.data.history.deleted]
+    return any(data is None or data >= inicio_mes for data in datas)
+
+
+@event.listens_for(Session, 'before_flush')
+def _marcar_painel(session, flush_context, instances):
+    if session.info.get('painel_alterado'):
+        return
+    inicio_mes = date.today().replace(day=1)
+    if any(_afeta_painel(obj, inicio_mes) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['painel_incrementar'] = True
+        session.info['painel_alterado'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _incrementar_versao_painel(session, flush_context):
+    if session.info.pop('painel_incrementar', False):
+        incrementar_versao(session.connection(), CHAVE_VERSAO)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_painel_no_commit(session):
+    if session.info.pop('painel_alterado', False):
+        invalidar_painel()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_marca_painel(session):
+    session.info.pop('painel_incrementar', None)
+    session.info.pop('painel_alterado', None)
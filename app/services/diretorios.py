@@ -0,0 +1,31 @@
+"""
+Diretórios de cache em disco compartilhados pelos workers (bytecode dos
+templates, PDFs renderizados, artefatos dos relatórios em segundo plano).
+
+O conteúdo desses diretórios é servido ou executado pela aplicação sem
+outra conferência, e o padrão de cada um é um caminho previsível no tmp:
+quem conseguisse criá-lo antes, ou gravar nele, plantaria arquivos
+tratados como autênticos. Por isso só são usados se forem do usuário do
+processo e fechados para grupo e outros.
+"""
+
+import os
+import stat
+
+
+def diretorio_seguro(diretorio):
+    """Cria o diretório (0700) se faltar; True se é do usuário do processo e fechado para os demais"""
+    os.makedirs(diretorio, mode=0o700, exist_ok=True)
+    info = os.lstat(diretorio)
+    return (
+        stat.S_ISDIR(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not stat.S_IMODE(info.st_mode) & (stat.S_IRWXG | stat.S_IRWXO)
+    )
+
+
+def exigir_diretorio_seguro(diretorio):
+    """Como `diretorio_seguro`, mas levanta RuntimeError se o diretório não serve"""
+    if not diretorio_seguro(diretorio):
+        raise RuntimeError(f'{diretorio} precisa ser do usuário do processo e sem acesso de grupo/outros')
+    return diretorio
@@ -0,0 +1,118 @@
+"""
+Elenco de garçons ativos em cache.
+
+O modal de escalação do detalhe do evento pagina os garçons ativos a
+cada rolagem (`eventos.garcons_disponiveis`, quando não há busca). A
+lista fica no processo como uma tupla de `GarcomResumo` (id, nome,
+telefone, iniciais), montada com uma consulta apenas dessas colunas, sem
+instanciar objetos do ORM.
+
+Cada worker do gunicorn tem o seu cache, então a validade é controlada
+por um contador na tabela `versoes_cache`: todo flush que cria, exclui ou
+altera nome, telefone ou situação de um garçom incrementa o contador na
+mesma transação da escrita, e cada leitura confere a versão (uma consulta
+pela chave primária) antes de usar o cache. O worker que fez a escrita
+descarta o seu cache já no after_commit.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from itertools import chain
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Garcom, VersaoCache, iniciais_nome
+
+CHAVE_VERSAO = 'garcons'
+
+# Atributos exibidos no elenco: alterar outros (email, pix...) não invalida
+_ATRIBUTOS_ELENCO = ('nome', 'telefone', 'ativo')
+
+GarcomResumo = namedtuple('GarcomResumo', ['id', 'nome', 'telefone', 'iniciais'])
+
+
+def versao_atual(chave=CHAVE_VERSAO):
+    """Versão gravada no banco para a chave (0 se nunca houve escrita)"""
+    return db.session.execute(
+        select(VersaoCache.versao).where(VersaoCache.chave == chave)
+    ).scalar() or 0
+
+
+def incrementar_versao(conexao, chave=CHAVE_VERSAO):
+    """Incrementa o contador da chave na transação da conexão"""
+    tabela = VersaoCache.__table__
+    resultado = conexao.execute(
+        update(tabela)
+        .where(tabela.c.chave == chave)
+        .values(versao=tabela.c.versao + 1, atualizado_em=datetime.utcnow())
+    )
+    if resultado.rowcount == 0:
+        conexao.execute(insert(tabela).values(chave=chave, versao=1, atualizado_em=datetime.utcnow()))
+
+
+def consultar_elenco():
+    """Garçons ativos, por nome, como tupla de GarcomResumo"""
+    rows = db.session.execute(
+        select(Garcom.id, Garcom.nome, Garcom.telefone)
+        .where(Garcom.ativo.is_(True))
+        .order_by(Garcom.nome, Garcom.id)  # mesma ordem da busca paginada
+    )
+    return tuple(
+        GarcomResumo(id_, nome, telefone, iniciais_nome(nome))
+        for id_, nome, telefone in rows
+    )
+
+
+def garcons_ativos():
+    """Elenco de garçons ativos, do cache do processo se a versão não mudou"""
+    versao = versao_atual()
+    cache = current_app.extensions.get('elenco_cache')
+    if cache and cache['versao'] == versao:
+        return cache['garcons']
+
+    garcons = consultar_elenco()
+    current_app.extensions['elenco_cache'] = {'versao': versao, 'garcons': garcons}
+    return garcons
+
+
+def invalidar_elenco():
+    if has_app_context():
+        current_app.extensions.pop('elenco_cache', None)
+
+
+def _afeta_elenco(obj, session):
+    if not isinstance(obj, Garcom):
+        return False
+    if obj in session.new or obj in session.deleted:
+        return True
+    attrs = inspect(obj).attrs
+    return any(getattr(attrs, nome).history.has_changes() for nome in _ATRIBUTOS_ELENCO)
+
+
+@event.listens_for(Session, 'before_flush')
+def _marcar_elenco(session, flush_context, instances):
+    if any(_afeta_elenco(obj, session) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['elenco_incrementar'] = True
+        session.info['elenco_alterado'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _incrementar_versao_elenco(session, flush_context):
+    """Grava a nova versão na mesma transação que alterou os garçons"""
+    if session.info.pop('elenco_incrementar', False):
+        incrementar_versao(session.connection())
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_elenco_no_commit(session):
+    if session.info.pop('elenco_alterado', False):
+        invalidar_elenco()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_marca_elenco(session):
+    session.info.pop('elenco_incrementar', None)
+    session.info.pop('elenco_alterado', None)
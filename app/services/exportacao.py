@@ -0,0 +1,90 @@
+"""
+Exportação em lote dos PDFs de eventos.
+
+Os instantâneos dos eventos são lidos do banco em streaming
+(`snapshots_eventos`) e renderizados no pool de processos dos relatórios.
+Cada PDF entra no ZIP assim que fica pronto, e os bytes do ZIP são
+repassados a quem consome o gerador (resposta HTTP ou arquivo do CLI).
+
+A memória fica limitada pela janela de renderizações em andamento, não
+pela quantidade de eventos do período.
+"""
+
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+
+from flask import current_app
+
+from app.models import Evento
+from app.services.relatorio_dados import snapshots_eventos
+from app.services.relatorio_jobs import submeter
+from app.services.saida_zip import SaidaZip
+
+
+def nome_arquivo_evento(evento) -> str:
+    """Nome do PDF de um evento, o mesmo usado no download individual"""
+    return f'evento_{evento.id}_{evento.data}.pdf'
+
+
+def _renderizar_evento(snapshot):
+    """Executado no processo filho: renderiza o PDF de um evento."""
+    from app.services.pdf import gerar_pdf_evento
+
+    with gerar_pdf_evento(snapshot) as arquivo:
+        return nome_arquivo_evento(snapshot), arquivo.read()
+
+
+def filtros_periodo(data_inicio=None, data_fim=None):
+    """Condições sobre Evento para o período informado"""
+    filtros = []
+    if data_inicio:
+        filtros.append(Evento.data >= data_inicio)
+    if data_fim:
+        filtros.append(Evento.data <= data_fim)
+    return filtros
+
+
+def gerar_zip_eventos(data_inicio=None, data_fim=None, janela=None):
+    """
+    Gera, em blocos de bytes, um ZIP com o PDF de cada evento do período.
+
+    Args:
+        data_inicio: Data inicial (inclusive)
+        data_fim: Data final (inclusive)
+        janela: Máximo de PDFs renderizando ou aguardando gravação ao
+            mesmo tempo (padrão: 2 x RELATORIO_JOBS_WORKERS)
+
+    Yields:
+        bytes: Próximo trecho do arquivo ZIP
+    """
+    janela = janela or 2 * current_app.config['RELATORIO_JOBS_WORKERS']
+    saida = SaidaZip()
+    pendentes = set()
+
+    def gravar(concluidos):
+        for futuro in concluidos:
+            nome, conteudo = futuro.result()
+            info = zipfile.ZipInfo(nome, date_time=datetime.now().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            arquivo_zip.writestr(info, conteudo)
+        return saida.retirar()
+
+    try:
+        with zipfile.ZipFile(saida, 'w') as arquivo_zip:
+            for snapshot in snapshots_eventos(*filtros_periodo(data_inicio, data_fim)):
+                pendentes.add(submeter(_renderizar_evento, snapshot))
+                if len(pendentes) >= janela:
+                    concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    yield gravar(concluidos)
+
+            while pendentes:
+                concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                yield gravar(concluidos)
+
+        # Diretório central do ZIP, escrito ao fechar o arquivo
+        yield saida.retirar()
+    finally:
+        # Download interrompido: não renderiza o que ainda não começou
+        for futuro in pendentes:
+            futuro.cancel()
@@ -0,0 +1,104 @@
+"""
+Cache de fragmentos de template (tag Jinja `{% cache %}`).
+
+    {% cache 'evento', evento.id, evento.updated_at, versoes.get(evento.id) %}
+        ... linha do evento ...
+    {% endcache %}
+
+O trecho entre as tags é renderizado uma vez e guardado em um LRU do
+processo, endereçado pelo template, pela linha da tag e pelas partes da
+chave (ID do registro e a sua versão: `updated_at`, cursor do feed,
+contagens). Quando o registro muda a chave muda junto, então fragmentos
+antigos nunca são servidos e apenas saem do LRU.
+
+Os fragmentos são compartilhados entre usuários: o token CSRF da
+requisição que renderizou é trocado por um marcador ao guardar e pelo
+token da requisição atual ao servir.
+"""
+
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g
+from flask_wtf.csrf import generate_csrf
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from app.services.pdf_cache import impressao_digital
+
+MARCA_CSRF = '\x00csrf\x00'
+
+
+class CacheFragmentos:
+    """LRU em memória de fragmentos HTML já renderizados"""
+
+    def __init__(self, max_itens=5000):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            html = self._itens.get(chave)
+            if html is not None:
+                self._itens.move_to_end(chave)
+            return html
+
+    def put(self, chave, html):
+        with self._lock:
+            self._itens[chave] = html
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def __len__(self):
+        return len(self._itens)
+
+
+def obter_cache_fragmentos() -> CacheFragmentos:
+    """Cache do processo atual, criado na primeira utilização."""
+    cache = current_app.extensions.get('fragmentos_cache')
+    if cache is None:
+        cache = CacheFragmentos(max_itens=current_app.config['FRAGMENTOS_CACHE_ITENS'])
+        current_app.extensions['fragmentos_cache'] = cache
+    return cache
+
+
+def _campo_csrf():
+    return current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token')
+
+
+class FragmentoCache(Extension):
+    """Tag `{% cache parte, ... %}...{% endcache %}`"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        partes = [nodes.Const(parser.name), nodes.Const(lineno)]
+        while parser.stream.current.type != 'block_end':
+            if len(partes) > 2:
+                parser.stream.expect('comma')
+            partes.append(parser.parse_expression())
+
+        corpo = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_renderizar', [nodes.List(partes)]), [], [], corpo
+        ).set_lineno(lineno)
+
+    def _renderizar(self, partes, caller):
+        cache = obter_cache_fragmentos()
+        chave = impressao_digital(*partes)
+
+        html = cache.get(chave)
+        if html is None:
+            html = str(caller())
+            token = g.get(_campo_csrf())
+            if token:
+                html = html.replace(token, MARCA_CSRF)
+            cache.put(chave, html)
+
+        if MARCA_CSRF in html:
+            html = html.replace(MARCA_CSRF, generate_csrf())
+        return Markup(html)
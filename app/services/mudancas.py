@@ -0,0 +1,137 @@
+"""
+Feed de mudanças das escalas (atualização ao vivo da página do evento).
+
+As mudanças de status são gravadas automaticamente em `escala_mudancas`
+pelo hook `before_flush` de app/models.py. Este módulo registra as
+mudanças de entrega do WhatsApp e expõe as consultas usadas pelo
+endpoint `eventos.mudancas`, consultado periodicamente pela página do
+evento (responde na hora, sem esperar por mudanças).
+
+O feed só serve para a atualização ao vivo e os rótulos de entrega:
+`podar_mudancas` apaga os registros mais antigos que
+MUDANCAS_RETENCAO_DIAS.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func
+
+from app import db
+from app.models import Escala, EscalaMudanca
+
+# Rótulos exibidos para os status de entrega da Cloud API
+ENTREGA_LABELS = {
+    'sent': 'enviado',
+    'delivered': 'entregue',
+    'read': 'lido',
+    'failed': 'falhou',
+}
+
+
+def registrar_envio(escala, msg_id: str):
+    """Registra o envio de uma mensagem do WhatsApp para a escala."""
+    db.session.add(EscalaMudanca(
+        evento_id=escala.evento_id,
+        escala_id=escala.id,
+        garcom_id=escala.garcom_id,
+        tipo='entrega',
+        status='sent',
+        msg_id=msg_id,
+    ))
+
+
+def registrar_entrega(msg_id: str, status: str) -> bool:
+    """
+    Registra uma atualização de entrega (sent, delivered, read, failed)
+    recebida pelo webhook para a mensagem `msg_id`.
+
+    Returns:
+        True se a mensagem pertence a alguma escala, False caso contrário
+    """
+    envio = (
+        EscalaMudanca.query
+        .filter_by(msg_id=msg_id)
+        .order_by(EscalaMudanca.id.desc())
+        .first()
+    )
+    if not envio:
+        return False
+
+    db.session.add(EscalaMudanca(
+        evento_id=envio.evento_id,
+        escala_id=envio.escala_id,
+        garcom_id=envio.garcom_id,
+        tipo='entrega',
+        status=status,
+        msg_id=msg_id,
+    ))
+    db.session.commit()
+    return True
+
+
+def ultimo_cursor(evento_id: int) -> int:
+    """ID da mudança mais recente do evento (0 se não houver)."""
+    return db.session.query(func.max(EscalaMudanca.id)).filter(
+        EscalaMudanca.evento_id == evento_id
+    ).scalar() or 0
+
+
+def cursores_por_evento(eventos_ids) -> dict:
+    """ID da mudança mais recente de cada evento (versão das suas escalas)."""
+    if not eventos_ids:
+        return {}
+    return dict(
+        db.session.query(EscalaMudanca.evento_id, func.max(EscalaMudanca.id))
+        .filter(EscalaMudanca.evento_id.in_(eventos_ids))
+        .group_by(EscalaMudanca.evento_id)
+        .all()
+    )
+
+
+def ultimas_entregas(evento_id: int) -> dict:
+    """Rótulo do último status de entrega do WhatsApp por escala do evento."""
+    ultimos = (
+        db.session.query(func.max(EscalaMudanca.id))
+        .filter(EscalaMudanca.evento_id == evento_id, EscalaMudanca.tipo == 'entrega')
+        .group_by(EscalaMudanca.escala_id)
+    )
+    rows = (
+        db.session.query(EscalaMudanca.escala_id, EscalaMudanca.status)
+        .filter(EscalaMudanca.id.in_(ultimos))
+        .all()
+    )
+    return {escala_id: ENTREGA_LABELS.get(status, status) for escala_id, status in rows}
+
+
+def listar_mudancas(evento_id: int, desde: int) -> list:
+    """Mudanças do evento com ID maior que o cursor `desde`."""
+    return (
+        EscalaMudanca.query
+        .filter(EscalaMudanca.evento_id == evento_id, EscalaMudanca.id > desde)
+        .order_by(EscalaMudanca.id)
+        .all()
+    )
+
+
+def totais_por_status(evento_id: int) -> dict:
+    """Contagem das escalas do evento por status, em uma única consulta."""
+    rows = (
+        db.session.query(Escala.status, func.count(Escala.id))
+        .filter(Escala.evento_id == evento_id)
+        .group_by(Escala.status)
+        .all()
+    )
+    totais = {'pendente': 0, 'confirmado': 0, 'recusado': 0}
+    totais.update(dict(rows))
+    totais['total'] = sum(count for _, count in rows)
+    return totais
+
+
+def podar_mudancas(dias: int) -> int:
+    """Apaga do feed as mudanças com mais de `dias` dias. Retorna o total apagado."""
+    corte = datetime.utcnow() - timedelta(days=dias)
+    apagadas = db.session.execute(
+        delete(EscalaMudanca).where(EscalaMudanca.created_at < corte)
+    ).rowcount
+    db.session.commit()
+    return apagadas
@@ -0,0 +1,256 @@
+"""
+Kit de montagem dos relatórios PDF.
+
+Estilos de parágrafo e de tabela são construídos uma única vez por
+processo (cache em nível de módulo) e compartilhados por todos os
+relatórios. `RelatorioPDF` expõe uma API declarativa com os blocos
+usados pelos relatórios: cabeçalho, bloco chave-valor, tabela, resumo
+e rodapé.
+
+Tabelas são paginadas por `TabelaPaginada`: larguras e alturas de linha
+são conhecidas de antemão, então cada quebra de página monta só a fatia
+de linhas que cabe no espaço restante. O custo de renderização cresce
+linearmente com o número de linhas.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, LongTable, SimpleDocTemplate, Paragraph, Spacer, TableStyle
+from reportlab.lib.enums import TA_CENTER
+
+# Paleta da identidade visual (docs/identidade.md)
+COR_DESTAQUE = colors.HexColor('#FBBF24')
+COR_ESCURA = colors.HexColor('#1F2937')
+COR_TEXTO = colors.HexColor('#374151')
+COR_FUNDO = colors.HexColor('#F9FAFB')
+COR_GRADE = colors.HexColor('#E5E7EB')
+COR_RODAPE = colors.HexColor('#9CA3AF')
+
+# PDFs maiores que isso são transferidos da memória para um arquivo temporário
+LIMITE_SPOOL = 1024 * 1024
+
+# Entrelinha das células de tabela, em pontos (padrão do ReportLab)
+ENTRELINHA_TABELA = 12
+
+
+@lru_cache(maxsize=None)
+def estilos():
+    """Estilos de parágrafo compartilhados (construídos uma vez por processo)"""
+    base = getSampleStyleSheet()
+
+    return {
+        'titulo': ParagraphStyle(
+            'CustomTitle',
+            parent=base['Heading1'],
+            fontSize=18,
+            textColor=COR_DESTAQUE,
+            spaceAfter=20,
+            alignment=TA_CENTER
+        ),
+        'subtitulo': ParagraphStyle(
+            'CustomSubtitle',
+            parent=base['Heading2'],
+            fontSize=14,
+            textColor=COR_ESCURA,
+            spaceAfter=10
+        ),
+        'normal': ParagraphStyle(
+            'CustomNormal',
+            parent=base['Normal'],
+            fontSize=10,
+            textColor=COR_TEXTO
+        ),
+        'rodape': ParagraphStyle(
+            'Footer',
+            parent=base['Normal'],
+            fontSize=8,
+            textColor=COR_RODAPE,
+            alignment=TA_CENTER
+        ),
+    }
+
+
+@lru_cache(maxsize=None)
+def estilo_tabela(alinhamentos=(), fonte_cabecalho=9, fonte_corpo=8, padding=6):
+    """
+    TableStyle padrão dos relatórios, em cache por combinação de parâmetros.
+
+    Args:
+        alinhamentos: tupla de (coluna_inicial, coluna_final, alinhamento)
+            aplicados ao corpo da tabela
+        fonte_cabecalho: tamanho da fonte da linha de cabeçalho
+        fonte_corpo: tamanho da fonte das demais linhas
+        padding: espaçamento vertical das células
+    """
+    comandos = [
+        # Cabeçalho
+        ('BACKGROUND', (0, 0), (-1, 0), COR_ESCURA),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), fonte_cabecalho),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+
+        # Corpo
+        ('BACKGROUND', (0, 1), (-1, -1), COR_FUNDO),
+        ('TEXTCOLOR', (0, 1), (-1, -1), COR_TEXTO),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), fonte_corpo),
+    ]
+    for inicio, fim, alinhamento in alinhamentos:
+        comandos.append(('ALIGN', (inicio, 1), (fim, -1), alinhamento))
+
+    comandos += [
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, COR_GRADE),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), padding),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+    ]
+    return TableStyle(comandos)
+
+
+class TabelaPaginada(Flowable):
+    """
+    Tabela com altura de linha fixa, dividida em fatias do tamanho da página.
+
+    A cada quebra de página, `split` monta uma LongTable apenas com as
+    linhas que cabem no espaço disponível (repetindo o cabeçalho) e
+    devolve o restante como outra TabelaPaginada, que compartilha a lista
+    de linhas em vez de copiá-la. Assim nenhuma linha é medida ou copiada
+    mais de uma vez.
+
+    As células devem ser textos de uma linha.
+    """
+
+    hAlign = 'CENTER'
+
+    def __init__(self, cabecalho, linhas, larguras, estilo, altura_linha, inicio=0):
+        super().__init__()
+        self.cabecalho = cabecalho
+        self.linhas = linhas
+        self.larguras = larguras
+        self.estilo = estilo
+        self.altura_linha = altura_linha
+        self.inicio = inicio
+
+    @property
+    def restantes(self):
+        return len(self.linhas) - self.inicio
+
+    def _fatia(self, fim):
+        linhas = self.linhas[self.inicio:fim]
+        tabela = LongTable(
+            [self.cabecalho] + linhas,
+            colWidths=self.larguras,
+            rowHeights=self.altura_linha,
+            repeatRows=1
+        )
+        tabela.setStyle(self.estilo)
+        return tabela
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.larguras)
+        self.height = self.altura_linha * (self.restantes + 1)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        cabem = int(availHeight // self.altura_linha) - 1  # menos o cabeçalho
+        if cabem < 1:
+            return []  # nem o cabeçalho e uma linha cabem: vai para a próxima página
+        if cabem >= self.restantes:
+            return [self._fatia(len(self.linhas))]
+        return [
+            self._fatia(self.inicio + cabem),
+            TabelaPaginada(
+                self.cabecalho, self.linhas, self.larguras, self.estilo,
+                self.altura_linha, self.inicio + cabem
+            ),
+        ]
+
+    def draw(self):
+        tabela = self._fatia(len(self.linhas))
+        tabela.wrapOn(self.canv, self.width, self.height)
+        tabela.drawOn(self.canv, 0, 0)
+
+
+class RelatorioPDF:
+    """Montador declarativo de um relatório PDF"""
+
+    def __init__(self):
+        self.buffer = SpooledTemporaryFile(max_size=LIMITE_SPOOL)
+        self.elements = []
+        self.estilos = estilos()
+
+    def cabecalho(self, subtitulo, espaco=20):
+        """Título da marca seguido do subtítulo do relatório"""
+        self.elements.append(Paragraph("PRIMOR GARÇONS", self.estilos['titulo']))
+        self.elements.append(Paragraph(subtitulo, self.estilos['subtitulo']))
+        if espaco:
+            self.espaco(espaco)
+        return self
+
+    def subtitulo(self, texto):
+        self.elements.append(Paragraph(texto, self.estilos['subtitulo']))
+        return self
+
+    def texto(self, texto):
+        self.elements.append(Paragraph(texto, self.estilos['normal']))
+        return self
+
+    def campos(self, pares):
+        """Bloco chave-valor: uma linha '<b>chave:</b> valor' por par"""
+        for chave, valor in pares:
+            self.elements.append(Paragraph(f"<b>{chave}:</b> {valor}", self.estilos['normal']))
+        return self
+
+    def tabela(self, cabecalho, linhas, larguras, alinhamentos=(), fonte_cabecalho=9, fonte_corpo=8, padding=6):
+        """
+        Tabela com cabeçalho escuro, paginada (ver TabelaPaginada).
+
+        Args:
+            larguras: larguras das colunas em cm
+            alinhamentos, fonte_cabecalho, fonte_corpo, padding: repassados
+                a estilo_tabela; o padding define a altura das linhas
+        """
+        self.elements.append(TabelaPaginada(
+            cabecalho,
+            list(linhas),
+            [w * cm for w in larguras],
+            estilo_tabela(alinhamentos, fonte_cabecalho, fonte_corpo, padding),
+            ENTRELINHA_TABELA + 2 * padding,
+        ))
+        return self
+
+    def resumo(self, pares, titulo=None):
+        """Bloco de resumo, opcionalmente precedido de um subtítulo"""
+        if titulo:
+            self.subtitulo(titulo)
+        return self.campos(pares)
+
+    def espaco(self, altura=20):
+        self.elements.append(Spacer(1, altura))
+        return self
+
+    def rodape(self):
+        """Data de geração e assinatura do sistema"""
+        self.espaco(40)
+        self.elements.append(Paragraph(
+            f"Gerado em {datetime.now().strftime('%d/%m/%Y às %H:%M')}", self.estilos['rodape']
+        ))
+        self.elements.append(Paragraph(
+            "Primor Garçons - Sistema de Gestão de Escalas", self.estilos['rodape']
+        ))
+        return self
+
+    def build(self):
+        """Renderiza o documento e retorna o arquivo posicionado no início"""
+        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+        doc.build(self.elements)
+        self.buffer.seek(0)
+        return self.buffer
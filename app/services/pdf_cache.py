@@ -0,0 +1,172 @@
+"""
+Cache de renderização dos relatórios PDF, endereçado por conteúdo.
+
+A chave é um hash (impressão digital) das entradas do relatório:
+`updated_at` dos registros envolvidos, cursor do feed de mudanças das
+escalas e parâmetros da requisição. Qualquer alteração relevante muda a
+chave, então entradas antigas nunca são servidas e apenas saem do LRU.
+
+Os itens pequenos ficam em memória (LRU); os que saem da memória e os
+maiores que `max_bytes_memoria` são gravados em disco, num diretório
+compartilhado pelos workers do gunicorn. As leituras devolvem uma origem
+pronta para `send_file`: um BytesIO (memória) ou o caminho do arquivo.
+
+Os arquivos do disco são servidos como relatórios autênticos, então
+`PDF_CACHE_DIR` só é usado se for do usuário do processo e fechado para
+grupo e outros (app/services/diretorios.py); senão o cache fica só em
+memória.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+from app.services.diretorios import exigir_diretorio_seguro
+
+
+def impressao_digital(*partes) -> str:
+    """Hash estável das partes que definem o conteúdo de um relatório."""
+    texto = '|'.join('' if p is None else str(p) for p in partes)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheRenderizacao:
+    """LRU em memória com transbordo para disco"""
+
+    def __init__(self, max_itens=32, diretorio=None, max_itens_disco=256, max_bytes_memoria=1024 * 1024):
+        self.max_itens = max_itens
+        self.max_itens_disco = max_itens_disco
+        self.max_bytes_memoria = max_bytes_memoria
+        self.diretorio = diretorio
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        if diretorio:
+            exigir_diretorio_seguro(diretorio)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f'{chave}.pdf')
+
+    def get(self, chave):
+        """Retorna a origem do PDF em cache (BytesIO ou caminho) ou None."""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                return io.BytesIO(self._itens[chave])
+
+        if not self.diretorio:
+            return None
+        caminho = self._caminho(chave)
+        try:
+            os.utime(caminho)  # mantém a ordem LRU do disco
+        except OSError:
+            return None
+        return caminho
+
+    def put(self, chave, arquivo):
+        """
+        Guarda o PDF do arquivo `arquivo` (binário, com seek) e retorna a
+        origem a ser servida. Arquivos grandes vão direto para o disco em
+        blocos, sem passar inteiros pela memória.
+        """
+        arquivo.seek(0, os.SEEK_END)
+        tamanho = arquivo.tell()
+        arquivo.seek(0)
+
+        if tamanho <= self.max_bytes_memoria:
+            dados = arquivo.read()
+            self._guardar_memoria(chave, dados)
+            return io.BytesIO(dados)
+
+        if not self.diretorio:
+            return arquivo
+        return self._gravar_disco(chave, arquivo)
+
+    def limpar(self):
+        """Esvazia a memória e o diretório do cache."""
+        with self._lock:
+            self._itens.clear()
+        if self.diretorio:
+            for nome in os.listdir(self.diretorio):
+                if nome.endswith('.pdf'):
+                    _remover(os.path.join(self.diretorio, nome))
+
+    def _guardar_memoria(self, chave, dados):
+        despejados = []
+        with self._lock:
+            self._itens[chave] = dados
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                despejados.append(self._itens.popitem(last=False))
+
+        for chave_antiga, dados_antigos in despejados:
+            self._transbordar(chave_antiga, dados_antigos)
+
+    def _transbordar(self, chave, dados):
+        """Grava em disco um item despejado da memória."""
+        if not self.diretorio:
+            return
+        self._gravar_disco(chave, io.BytesIO(dados))
+
+    def _gravar_disco(self, chave, arquivo):
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            # Escrita atômica: outros workers podem ler o mesmo arquivo
+            fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(arquivo, f)
+            os.replace(temporario, caminho)
+        self._podar_disco(manter=caminho)
+        return caminho
+
+    def _podar_disco(self, manter=None):
+        """Remove os arquivos menos recentes além do limite do disco."""
+        arquivos = [
+            os.path.join(self.diretorio, nome)
+            for nome in os.listdir(self.diretorio)
+            if nome.endswith('.pdf') and os.path.join(self.diretorio, nome) != manter
+        ]
+        excedente = len(arquivos) - self.max_itens_disco + (1 if manter else 0)
+        if excedente <= 0:
+            return
+        arquivos.sort(key=_mtime)
+        for caminho in arquivos[:excedente]:
+            _remover(caminho)
+
+
+def _mtime(caminho):
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        return 0
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+
+def obter_cache() -> CacheRenderizacao:
+    """Cache do processo atual, criado na primeira utilização."""
+    cache = current_app.extensions.get('pdf_cache')
+    if cache is None:
+        config = current_app.config
+        opcoes = dict(
+            max_itens=config['PDF_CACHE_ITENS'],
+            max_itens_disco=config['PDF_CACHE_DISCO_ITENS'],
+            max_bytes_memoria=config['PDF_CACHE_MAX_BYTES_MEMORIA'],
+        )
+        try:
+            cache = CacheRenderizacao(diretorio=config['PDF_CACHE_DIR'], **opcoes)
+        except (OSError, RuntimeError) as exc:
+            current_app.logger.warning('Cache de PDFs em disco desligado: %s', exc)
+            cache = CacheRenderizacao(**opcoes)
+        current_app.extensions['pdf_cache'] = cache
+    return cache
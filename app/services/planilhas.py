@@ -0,0 +1,171 @@
+"""
+Planilhas (CSV e XLSX) geradas em streaming.
+
+Os geradores recebem um iterável de linhas e devolvem o arquivo em blocos
+de bytes, à medida que as linhas são consumidas. Nada além do bloco atual
+fica em memória, então o download começa imediatamente e o tamanho do
+período exportado não afeta o uso de memória.
+
+O XLSX é escrito diretamente (SpreadsheetML mínimo, com textos inline),
+sem depender de bibliotecas que montam a pasta de trabalho inteira antes
+de gravá-la.
+
+Textos que começam com `=`, `+`, `-` ou `@` (nomes de garçons e eventos
+vêm de formulários) recebem um apóstrofo na frente, para que a planilha
+não os interprete como fórmula.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from numbers import Number
+from xml.sax.saxutils import escape, quoteattr
+
+from app.services.saida_zip import SaidaZip
+
+LINHAS_POR_BLOCO = 500
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Caracteres de controle não são permitidos em XML 1.0
+_CONTROLE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Início de fórmula no Excel/LibreOffice (tab e CR também, pela OWASP)
+_INICIO_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _texto_seguro(texto):
+    """'=HYPERLINK(...)' -> "'=HYPERLINK(...)": exibido como texto, nunca avaliado"""
+    return f"'{texto}" if texto.startswith(_INICIO_FORMULA) else texto
+
+
+def _celula_csv(valor):
+    """Números com vírgula decimal, como o Excel em português espera"""
+    if isinstance(valor, float):
+        return f'{valor:.2f}'.replace('.', ',')
+    if isinstance(valor, str):
+        return _texto_seguro(valor)
+    return valor
+
+
+def gerar_csv(cabecalho, linhas, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Gera um CSV (UTF-8 com BOM, separado por ponto e vírgula) em blocos.
+
+    Yields:
+        bytes: Próximo trecho do arquivo
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=';')
+
+    buffer.write('\ufeff')  # BOM: o Excel reconhece o UTF-8
+    escritor.writerow(cabecalho)
+
+    for i, linha in enumerate(linhas, 1):
+        escritor.writerow([_celula_csv(valor) for valor in linha])
+        if i % linhas_por_bloco == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode('utf-8')
+
+
+_XLSX_ESTRUTURA = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={nome} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_INICIO_PLANILHA = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+
+_XLSX_FIM_PLANILHA = '</sheetData></worksheet>'
+
+
+def _celula_xlsx(valor):
+    if isinstance(valor, Number) and not isinstance(valor, bool):
+        return f'<c><v>{valor}</v></c>'
+    texto = escape(_texto_seguro(_CONTROLE.sub('', str(valor if valor is not None else ''))))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _linha_xlsx(valores):
+    return ('<row>' + ''.join(_celula_xlsx(v) for v in valores) + '</row>').encode('utf-8')
+
+
+def gerar_xlsx(cabecalho, linhas, planilha='Relatório', linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Gera uma pasta de trabalho XLSX de uma planilha em blocos.
+
+    Args:
+        cabecalho: Títulos das colunas
+        linhas: Iterável de linhas (textos e números)
+        planilha: Nome da aba (até 31 caracteres)
+
+    Yields:
+        bytes: Próximo trecho do arquivo
+    """
+    saida = SaidaZip()
+
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for nome, conteudo in _XLSX_ESTRUTURA.items():
+            arquivo_zip.writestr(nome, conteudo)
+        arquivo_zip.writestr('xl/workbook.xml', _XLSX_WORKBOOK.format(nome=quoteattr(planilha[:31])))
+        yield saida.retirar()
+
+        with arquivo_zip.open('xl/worksheets/sheet1.xml', 'w') as folha:
+            folha.write(_XLSX_INICIO_PLANILHA.encode('utf-8'))
+            folha.write(_linha_xlsx(cabecalho))
+            for i, linha in enumerate(linhas, 1):
+                folha.write(_linha_xlsx(linha))
+                if i % linhas_por_bloco == 0:
+                    yield saida.retirar()
+            folha.write(_XLSX_FIM_PLANILHA.encode('utf-8'))
+
+    yield saida.retirar()
+
+
+def gerar_planilha(formato, cabecalho, linhas, planilha='Relatório'):
+    """Gera a planilha no formato pedido ('csv' ou 'xlsx')"""
+    if formato == 'xlsx':
+        return gerar_xlsx(cabecalho, linhas, planilha)
+    return gerar_csv(cabecalho, linhas)
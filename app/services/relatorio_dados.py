@@ -0,0 +1,282 @@
+"""
+Camada de dados dos relatórios.
+
+Monta, em consultas agregadas, instantâneos imutáveis (tuplas) com tudo
+o que os renderizadores de PDF precisam. Os instantâneos não dependem da
+sessão do banco, então podem ser enviados para outros processos.
+"""
+
+from collections import namedtuple
+from itertools import groupby
+
+from sqlalchemy import case, func
+
+from app import db
+from app.models import Evento, Escala, Garcom, formatar_horario
+
+LinhaEventoGeral = namedtuple(
+    'LinhaEventoGeral', 'data_formatada nome local total_garcons valor_total'
+)
+
+LinhaEventoMes = namedtuple(
+    'LinhaEventoMes', 'data horario nome local total_garcons valor_total'
+)
+
+LinhaEscala = namedtuple('LinhaEscala', 'nome is_motorista valor status')
+
+LinhaPagamento = namedtuple('LinhaPagamento', [
+    'garcom_id', 'nome', 'telefone', 'pix', 'total_escalas', 'escalas_motorista',
+    'valor_base', 'adicional_motorista', 'valor_total',
+])
+
+SnapshotEvento = namedtuple('SnapshotEvento', [
+    'id', 'nome', 'tipo', 'data', 'data_formatada', 'horario', 'local', 'status',
+    'escalas', 'total_garcons', 'total_confirmados', 'total_pendentes',
+    'total_recusados', 'valor_total',
+])
+
+
+def valor_escala_sql():
+    """Valor de uma escala somado ao adicional de motorista, em SQL"""
+    return Escala.valor + case((Escala.is_motorista, Evento.valor_motorista), else_=0)
+
+
+def linhas_relatorio_geral(*filtros):
+    """
+    Linhas do relatório geral (uma por evento), mais recentes primeiro.
+
+    Args:
+        filtros: condições sobre Evento (ex.: período)
+
+    Returns:
+        list[LinhaEventoGeral]
+    """
+    rows = (
+        db.session.query(
+            Evento.data,
+            Evento.nome,
+            Evento.local,
+            func.count(Escala.id),
+            func.coalesce(func.sum(valor_escala_sql()), 0),
+        )
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .filter(*filtros)
+        .group_by(Evento.id)
+        .order_by(Evento.data.desc())
+        .all()
+    )
+    return [
+        LinhaEventoGeral(data.strftime('%d/%m/%Y'), nome, local, total, float(valor))
+        for data, nome, local, total, valor in rows
+    ]
+
+
+def linhas_eventos_mes(*filtros):
+    """
+    Linhas do relatório de eventos do mês (uma por evento, por data), com
+    garçons e valor de cada evento na mesma consulta. Os totais do
+    relatório são somados destas linhas.
+
+    Args:
+        filtros: condições sobre Evento (ex.: o mês)
+
+    Returns:
+        list[LinhaEventoMes]
+    """
+    rows = (
+        db.session.query(
+            Evento.data,
+            Evento.hora_inicio,
+            Evento.hora_fim,
+            Evento.nome,
+            Evento.local,
+            func.count(Escala.id),
+            func.coalesce(func.sum(valor_escala_sql()), 0),
+        )
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .filter(*filtros)
+        .group_by(Evento.id)
+        .order_by(Evento.data, Evento.hora_inicio, Evento.id)
+        .all()
+    )
+    return [
+        LinhaEventoMes(data, formatar_horario(hora_inicio, hora_fim), nome, local, total, float(valor))
+        for data, hora_inicio, hora_fim, nome, local, total, valor in rows
+    ]
+
+
+def linhas_pagamentos(*filtros):
+    """
+    Quanto cada garçom tem a receber, agregado em uma única consulta
+    (uma linha por garçom, em ordem alfabética).
+
+    Args:
+        filtros: condições sobre Evento e Escala (ex.: período, status)
+
+    Returns:
+        list[LinhaPagamento]
+    """
+    adicional = case((Escala.is_motorista, Evento.valor_motorista), else_=0)
+    rows = (
+        db.session.query(
+            Garcom.id,
+            Garcom.nome,
+            Garcom.telefone,
+            Garcom.pix,
+            func.count(Escala.id),
+            func.sum(case((Escala.is_motorista, 1), else_=0)),
+            func.sum(Escala.valor),
+            func.sum(adicional),
+        )
+        .join(Escala, Escala.garcom_id == Garcom.id)
+        .join(Evento, Evento.id == Escala.evento_id)
+        .filter(*filtros)
+        .group_by(Garcom.id)
+        .order_by(Garcom.nome, Garcom.id)
+        .all()
+    )
+    return [
+        LinhaPagamento(
+            id_, nome, telefone, pix or '', total, int(motorista or 0),
+            float(base or 0), float(extra or 0), float(base or 0) + float(extra or 0),
+        )
+        for id_, nome, telefone, pix, total, motorista, base, extra in rows
+    ]
+
+
+def linhas_planilha_eventos(*filtros, crescente=False, lote=500):
+    """
+    Linhas das planilhas de eventos (uma por evento), lidas do cursor em
+    lotes (`yield_per`) para que o período não afete a memória usada.
+
+    Args:
+        filtros: condições sobre Evento (ex.: período)
+        crescente: ordena por data crescente (padrão: mais recentes primeiro)
+
+    Yields:
+        tuple: data, horário, evento, tipo, local, status, garçons, valor total
+    """
+    ordem = Evento.data.asc() if crescente else Evento.data.desc()
+    rows = (
+        db.session.query(
+            Evento.data,
+            Evento.hora_inicio,
+            Evento.hora_fim,
+            Evento.nome,
+            Evento.tipo,
+            Evento.local,
+            Evento.status,
+            func.count(Escala.id),
+            func.coalesce(func.sum(valor_escala_sql()), 0),
+        )
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .filter(*filtros)
+        .group_by(Evento.id)
+        .order_by(ordem, Evento.id)
+        .yield_per(lote)
+    )
+    for data, hora_inicio, hora_fim, nome, tipo, local, status, total, valor in rows:
+        yield (
+            data.strftime('%d/%m/%Y'), formatar_horario(hora_inicio, hora_fim),
+            nome, tipo, local, status.capitalize(), total, float(valor),
+        )
+
+
+def linhas_planilha_garcons(lote=500):
+    """
+    Linhas da planilha de garçons ativos, com o total de eventos de cada
+    um calculado na mesma consulta.
+
+    Yields:
+        tuple: nome, telefone, e-mail, idade, PIX, eventos
+    """
+    rows = (
+        db.session.query(
+            Garcom.nome, Garcom.telefone, Garcom.email, Garcom.idade, Garcom.pix,
+            func.count(Escala.id),
+        )
+        .outerjoin(Escala, Escala.garcom_id == Garcom.id)
+        .filter(Garcom.ativo.is_(True))
+        .group_by(Garcom.id)
+        .order_by(Garcom.nome, Garcom.id)
+        .yield_per(lote)
+    )
+    for nome, telefone, email, idade, pix, total in rows:
+        yield nome, telefone, email, idade, pix or '', total
+
+
+def _consulta_snapshots(*filtros):
+    """Linhas evento x escala x garçom usadas para montar os SnapshotEvento"""
+    return (
+        db.session.query(
+            Evento.id, Evento.nome, Evento.tipo, Evento.data, Evento.hora_inicio,
+            Evento.hora_fim, Evento.local, Evento.status, Evento.valor_motorista,
+            Garcom.nome, Escala.is_motorista, Escala.valor, Escala.status,
+        )
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .outerjoin(Garcom, Garcom.id == Escala.garcom_id)
+        .filter(*filtros)
+    )
+
+
+def snapshot_evento(evento_id):
+    """
+    Evento, escalas e nomes dos garçons em uma única consulta (JOIN),
+    com os totais calculados a partir das linhas retornadas.
+
+    Returns:
+        SnapshotEvento, ou None se o evento não existir
+    """
+    rows = _consulta_snapshots(Evento.id == evento_id).order_by(Escala.id).all()
+    if not rows:
+        return None
+    return _montar_snapshot(rows)
+
+
+def snapshots_eventos(*filtros, lote=500):
+    """
+    Gera um SnapshotEvento por evento filtrado, em ordem de data.
+
+    Uma única consulta lida do cursor em lotes (`yield_per`), então a
+    memória usada não depende da quantidade de eventos.
+    """
+    rows = (
+        _consulta_snapshots(*filtros)
+        .order_by(Evento.data, Evento.id, Escala.id)
+        .yield_per(lote)
+    )
+    for _, linhas in groupby(rows, key=lambda row: row[0]):
+        yield _montar_snapshot(list(linhas))
+
+
+def _montar_snapshot(rows):
+    """Monta o SnapshotEvento a partir das linhas de um mesmo evento"""
+    (id_, nome, tipo, data, hora_inicio, hora_fim, local, status, valor_motorista) = rows[0][:9]
+    adicional = float(valor_motorista or 0)
+
+    escalas = []
+    for *_, garcom_nome, is_motorista, valor, escala_status in rows:
+        if garcom_nome is None:
+            continue  # evento sem escalas (linha do OUTER JOIN)
+        valor_total = float(valor) + (adicional if is_motorista else 0)
+        escalas.append(LinhaEscala(garcom_nome, is_motorista, valor_total, escala_status))
+
+    def contar(valor):
+        return sum(1 for e in escalas if e.status == valor)
+
+    return SnapshotEvento(
+        id=id_,
+        nome=nome,
+        tipo=tipo,
+        data=data,
+        data_formatada=data.strftime('%d/%m/%Y'),
+        horario=formatar_horario(hora_inicio, hora_fim),
+        local=local,
+        status=status,
+        escalas=tuple(escalas),
+        total_garcons=len(escalas),
+        total_confirmados=contar('confirmado'),
+        total_pendentes=contar('pendente'),
+        total_recusados=contar('recusado'),
+        valor_total=sum(e.valor for e in escalas),
+    )
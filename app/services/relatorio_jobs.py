@@ -0,0 +1,222 @@
+"""
+Relatórios em segundo plano.
+
+A renderização (CPU) roda num pool de processos limitado, fora do worker
+do gunicorn que recebeu a requisição. O processo filho recebe apenas um
+instantâneo imutável dos dados (app/services/relatorio_dados.py) e grava
+o PDF em `RELATORIO_JOBS_DIR`, com o nome da impressão digital das
+entradas. Os artefatos são baixados como autênticos, então o diretório
+precisa ser do usuário do processo e fechado para grupo e outros
+(app/services/diretorios.py); senão os jobs são recusados. O estado do job fica na tabela `relatorio_jobs` e é conferido
+pela existência do artefato, então qualquer worker pode responder a
+consulta de status e o download.
+
+Artefatos já gerados para as mesmas entradas são reaproveitados.
+
+Um processo filho que morre (falta de memória num relatório geral largo,
+falha do ReportLab) quebra o pool inteiro: `submeter` troca o pool
+quebrado por um novo, e os jobs que estavam nele ganham o arquivo `.erro`
+para não ficarem em 'processando' até o tempo limite.
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import partial
+
+from flask import current_app
+
+from app import db
+from app.models import Evento, RelatorioJob
+from app.services.diretorios import exigir_diretorio_seguro
+from app.services.pdf_cache import impressao_digital
+from app.services.relatorio_dados import linhas_relatorio_geral
+
+_executor = None
+
+
+def pool_processos():
+    """
+    Pool de processos do worker atual, criado na primeira utilização.
+
+    Compartilhado pelos jobs e pela exportação em lote, o que limita o
+    total de processos de renderização por worker.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=current_app.config['RELATORIO_JOBS_WORKERS'],
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def _descartar_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def submeter(funcao, *args, caminho_erro=None):
+    """
+    Agenda `funcao(*args)` no pool de processos, trocando o pool se ele quebrou.
+
+    Args:
+        funcao: Função executada no processo filho
+        caminho_erro: Arquivo `.erro` gravado se o processo filho morrer
+            antes de terminar (o filho não chega a gravá-lo)
+
+    Returns:
+        Future: resultado da execução
+    """
+    try:
+        futuro = pool_processos().submit(funcao, *args)
+    except BrokenProcessPool:
+        _descartar_pool()
+        futuro = pool_processos().submit(funcao, *args)
+    if caminho_erro:
+        futuro.add_done_callback(partial(_registrar_interrupcao, caminho_erro))
+    return futuro
+
+
+def _registrar_interrupcao(caminho_erro, futuro):
+    """Callback do Future: processo filho morto ou execução cancelada com o pool"""
+    if futuro.cancelled() or isinstance(futuro.exception(), BrokenProcessPool):
+        try:
+            with open(caminho_erro, 'w') as f:
+                f.write('O processo de renderização foi interrompido.')
+        except OSError:
+            pass
+
+
+def _diretorio():
+    return exigir_diretorio_seguro(current_app.config['RELATORIO_JOBS_DIR'])
+
+
+def caminho_artefato(job) -> str:
+    return os.path.join(_diretorio(), f'{job.chave}.pdf')
+
+
+def _caminho_erro(job) -> str:
+    return os.path.join(_diretorio(), f'{job.chave}.erro')
+
+
+def _renderizar_geral(caminho, linhas, data_inicio, data_fim):
+    """Executado no processo filho: renderiza e grava o PDF atomicamente."""
+    from app.services.pdf import gerar_pdf_relatorio_geral
+
+    diretorio = os.path.dirname(caminho)
+    temporario = None
+    try:
+        arquivo = gerar_pdf_relatorio_geral(linhas, data_inicio, data_fim)
+        fd, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                bloco = arquivo.read(64 * 1024)
+                if not bloco:
+                    break
+                f.write(bloco)
+        os.replace(temporario, caminho)
+    except Exception as exc:
+        if temporario:
+            _remover(temporario)  # gravação interrompida (disco cheio, etc.)
+        with open(caminho[:-len('.pdf')] + '.erro', 'w') as f:
+            f.write(str(exc))
+        raise
+
+
+def submeter_relatorio_geral(data_inicio=None, data_fim=None) -> RelatorioJob:
+    """
+    Agenda o relatório geral do período e retorna o job.
+
+    Se já existe um artefato (ou um job em andamento) para as mesmas
+    entradas, reaproveita em vez de renderizar de novo.
+    """
+    filtros = []
+    if data_inicio:
+        filtros.append(Evento.data >= data_inicio)
+    if data_fim:
+        filtros.append(Evento.data <= data_fim)
+
+    linhas = linhas_relatorio_geral(*filtros)
+    chave = impressao_digital('job-geral', data_inicio, data_fim, *linhas)
+
+    job = RelatorioJob(
+        id=uuid.uuid4().hex,
+        tipo='geral',
+        parametros=json.dumps({
+            'data_inicio': data_inicio.isoformat() if data_inicio else None,
+            'data_fim': data_fim.isoformat() if data_fim else None,
+        }),
+        chave=chave,
+    )
+
+    em_andamento = RelatorioJob.query.filter_by(chave=chave, status='processando').first()
+    if em_andamento:
+        return atualizar_status(em_andamento)
+
+    if os.path.exists(caminho_artefato(job)):
+        job.status = 'pronto'
+        job.concluido_em = datetime.utcnow()
+    else:
+        _remover(_caminho_erro(job))
+        submeter(
+            _renderizar_geral, caminho_artefato(job), linhas, data_inicio, data_fim,
+            caminho_erro=_caminho_erro(job),
+        )
+        _podar_artefatos()
+
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def atualizar_status(job) -> RelatorioJob:
+    """Atualiza um job em andamento a partir dos arquivos do artefato."""
+    if job.status != 'processando':
+        return job
+
+    if os.path.exists(caminho_artefato(job)):
+        job.status = 'pronto'
+    elif os.path.exists(_caminho_erro(job)):
+        with open(_caminho_erro(job)) as f:
+            job.erro = f.read()
+        job.status = 'erro'
+    elif datetime.utcnow() - job.created_at > timedelta(seconds=current_app.config['RELATORIO_JOBS_TIMEOUT']):
+        # O worker que agendou o job foi reciclado antes de terminar
+        job.erro = 'Tempo limite excedido.'
+        job.status = 'erro'
+    else:
+        return job
+
+    job.concluido_em = datetime.utcnow()
+    db.session.commit()
+    return job
+
+
+def _podar_artefatos():
+    """Mantém apenas os artefatos mais recentes em RELATORIO_JOBS_DIR."""
+    diretorio = _diretorio()
+    arquivos = [
+        os.path.join(diretorio, nome)
+        for nome in os.listdir(diretorio) if nome.endswith(('.pdf', '.erro'))
+    ]
+    excedente = len(arquivos) - current_app.config['RELATORIO_JOBS_MAX_ARTEFATOS']
+    if excedente <= 0:
+        return
+    arquivos.sort(key=lambda c: os.path.getmtime(c) if os.path.exists(c) else 0)
+    for caminho in arquivos[:excedente]:
+        _remover(caminho)
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
@@ -0,0 +1,280 @@
+"""
+Resumo mensal (tabela `resumos_mensais`).
+
+Guarda, por mês e tipo de evento, a quantidade de eventos, as escalas
+por status e os valores. A linha é chaveada por `tipo_id` (catálogo
+`tipos_evento`), não pelo nome: renomear um tipo não mexe no resumo e os
+relatórios por tipo buscam o nome com um join. Eventos ainda sem tipo no
+catálogo ficam de fora até `flask inicializar-banco` ligá-los.
+
+Os hooks de sessão em app/models.py mantêm a tabela na mesma transação
+da escrita: antes do flush leem os totais que os eventos/escalas
+alterados somavam (`totais_atuais`), depois do flush os totais novos, e
+somam só a diferença às linhas (`aplicar_deltas`), com
+`INSERT ... ON CONFLICT DO UPDATE SET coluna = coluna + excluded.coluna`.
+Escritas concorrentes no mesmo mês/tipo (duas confirmações, o webhook de
+status) apenas somam seus deltas, sem recalcular nem recriar a linha.
+`reconstruir_resumos` (comando `flask reconstruir-resumos`) refaz a
+tabela inteira a partir de eventos e escalas, e `migrar_resumos_mensais`
+recria a tabela de bancos em que a chave era o nome do tipo.
+
+Dashboard e relatório anual leem daqui em O(meses), sem percorrer as
+escalas.
+"""
+
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime
+
+from sqlalchemy import Integer, and_, case, cast, delete, extract, func, insert, inspect, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import Evento, Escala, ResumoMensal, TipoEvento
+from app.services.relatorio_dados import valor_escala_sql
+
+ResumoPeriodo = namedtuple('ResumoPeriodo', [
+    'total_eventos', 'escalas_pendentes', 'escalas_confirmadas', 'escalas_recusadas',
+    'total_escalas', 'valor_total', 'valor_confirmado',
+])
+
+# Colunas somadas em cada linha (a chave é ano, mês e tipo_id)
+_TOTAIS = (
+    'total_eventos', 'escalas_pendentes', 'escalas_confirmadas', 'escalas_recusadas',
+    'valor_total', 'valor_confirmado',
+)
+
+_COLUNAS = ('ano', 'mes', 'tipo_id', *_TOTAIS, 'atualizado_em')
+
+# INSERT com ON CONFLICT DO UPDATE de cada dialeto
+_UPSERT = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _contar_status(status):
+    return func.coalesce(func.sum(case((Escala.status == status, 1), else_=0)), 0)
+
+
+def _chave_sql():
+    return (
+        cast(extract('year', Evento.data), Integer),
+        cast(extract('month', Evento.data), Integer),
+        Evento.tipo_id,
+    )
+
+
+def _agregados(total_eventos=None):
+    """Expressões das colunas de `_TOTAIS`, na mesma ordem"""
+    return (
+        func.count(func.distinct(Evento.id)) if total_eventos is None else total_eventos,
+        _contar_status('pendente'),
+        _contar_status('confirmado'),
+        _contar_status('recusado'),
+        func.coalesce(func.sum(valor_escala_sql()), 0),
+        func.coalesce(func.sum(case((Escala.status == 'confirmado', valor_escala_sql()), else_=0)), 0),
+    )
+
+
+def _consulta_agregada(*filtros):
+    """SELECT com as colunas de `resumos_mensais`, agrupado por ano, mês e tipo"""
+    chave = _chave_sql()
+    return (
+        select(*chave, *_agregados(), literal(datetime.utcnow()))
+        .select_from(Evento)
+        .outerjoin(Escala, Escala.evento_id == Evento.id)
+        .where(Evento.tipo_id.isnot(None), *filtros)
+        .group_by(*chave)
+    )
+
+
+def totais_atuais(conexao, eventos_ids=(), escalas_ids=()):
+    """
+    Quanto eventos inteiros (com suas escalas) e escalas avulsas somam
+    hoje no resumo, pelo estado do banco na transação corrente.
+
+    Args:
+        conexao: Conexão da transação corrente (chamado durante o flush)
+        eventos_ids: Eventos cujos totais são lidos por inteiro
+        escalas_ids: Escalas lidas uma a uma (não contam eventos)
+
+    Returns:
+        list[tuple[tuple, dict]]: ((ano, mes, tipo_id), totais) por evento/escala
+    """
+    chave = _chave_sql()
+    consultas = []
+    if eventos_ids:
+        consultas.append(
+            select(*chave, *_agregados())
+            .select_from(Evento)
+            .outerjoin(Escala, Escala.evento_id == Evento.id)
+            .where(Evento.id.in_(eventos_ids), Evento.tipo_id.isnot(None))
+            .group_by(Evento.id, *chave)
+        )
+    if escalas_ids:
+        consultas.append(
+            select(*chave, *_agregados(total_eventos=literal(0)))
+            .select_from(Escala)
+            .join(Evento, Escala.evento_id == Evento.id)
+            .where(Escala.id.in_(escalas_ids), Evento.tipo_id.isnot(None))
+            .group_by(Escala.id, *chave)
+        )
+    return [
+        ((ano, mes, tipo_id), dict(zip(_TOTAIS, valores)))
+        for consulta in consultas
+        for ano, mes, tipo_id, *valores in conexao.execute(consulta)
+    ]
+
+
+def somar_totais(deltas, totais, sinal=1):
+    """Acumula `totais_atuais` (com sinal) em deltas: {chave: Counter}"""
+    for chave, valores in totais:
+        for coluna, valor in valores.items():
+            deltas[chave][coluna] += sinal * valor
+
+
+def novos_deltas():
+    return defaultdict(Counter)
+
+
+def _filtro_linha(tabela, ano, mes, tipo_id):
+    return and_(tabela.c.ano == ano, tabela.c.mes == mes, tabela.c.tipo_id == tipo_id)
+
+
+def _somar_linha(conexao, tabela, linha):
+    """Soma a linha às existentes com a mesma chave, ou a insere"""
+    upsert = _UPSERT.get(conexao.dialect.name)
+    if upsert is not None:
+        comando = upsert(tabela).values(linha)
+        conexao.execute(comando.on_conflict_do_update(
+            index_elements=['ano', 'mes', 'tipo_id'],
+            set_={
+                **{coluna: tabela.c[coluna] + comando.excluded[coluna] for coluna in _TOTAIS},
+                'atualizado_em': comando.excluded.atualizado_em,
+            },
+        ))
+        return
+
+    # Sem upsert no dialeto: UPDATE relativo e INSERT se a linha não existe
+    alteradas = conexao.execute(
+        update(tabela)
+        .where(_filtro_linha(tabela, linha['ano'], linha['mes'], linha['tipo_id']))
+        .values({
+            **{coluna: tabela.c[coluna] + linha[coluna] for coluna in _TOTAIS},
+            'atualizado_em': linha['atualizado_em'],
+        })
+    ).rowcount
+    if not alteradas:
+        conexao.execute(insert(tabela).values(linha))
+
+
+def aplicar_deltas(conexao, deltas):
+    """
+    Soma os deltas (positivos ou negativos) às linhas do resumo.
+
+    Linhas que ficam sem eventos são removidas.
+
+    Args:
+        conexao: Conexão da transação corrente
+        deltas: {(ano, mes, tipo_id): Counter(coluna -> delta)}
+    """
+    tabela = ResumoMensal.__table__
+    agora = datetime.utcnow()
+    esvaziadas = []
+    for (ano, mes, tipo_id), delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        _somar_linha(conexao, tabela, {
+            'ano': ano, 'mes': mes, 'tipo_id': tipo_id,
+            **{coluna: delta[coluna] for coluna in _TOTAIS},
+            'atualizado_em': agora,
+        })
+        if delta['total_eventos'] < 0:
+            esvaziadas.append(_filtro_linha(tabela, ano, mes, tipo_id))
+    if esvaziadas:
+        conexao.execute(delete(tabela).where(tabela.c.total_eventos <= 0, or_(*esvaziadas)))
+
+
+def reconstruir_resumos():
+    """Refaz a tabela de resumos inteira a partir de eventos e escalas"""
+    tabela = ResumoMensal.__table__
+    db.session.execute(delete(tabela))
+    db.session.execute(insert(tabela).from_select(_COLUNAS, _consulta_agregada()))
+    db.session.commit()
+    return db.session.query(func.count()).select_from(tabela).scalar()
+
+
+def migrar_resumos_mensais():
+    """
+    Recria `resumos_mensais` em bancos em que a linha era chaveada pelo
+    nome do tipo. A tabela fica vazia e `preencher_resumos` a refaz.
+    Idempotente.
+
+    Returns:
+        bool: se a tabela foi recriada
+    """
+    colunas = {coluna['name'] for coluna in inspect(db.engine).get_columns(ResumoMensal.__tablename__)}
+    if 'tipo_id' in colunas:
+        return False
+    ResumoMensal.__table__.drop(db.engine)
+    ResumoMensal.__table__.create(db.engine)
+    return True
+
+
+def _somas():
+    return (
+        func.coalesce(func.sum(ResumoMensal.total_eventos), 0),
+        func.coalesce(func.sum(ResumoMensal.escalas_pendentes), 0),
+        func.coalesce(func.sum(ResumoMensal.escalas_confirmadas), 0),
+        func.coalesce(func.sum(ResumoMensal.escalas_recusadas), 0),
+        func.coalesce(func.sum(ResumoMensal.valor_total), 0),
+        func.coalesce(func.sum(ResumoMensal.valor_confirmado), 0),
+    )
+
+
+def _resumo_periodo(eventos, pendentes, confirmadas, recusadas, valor, valor_confirmado):
+    return ResumoPeriodo(
+        int(eventos), int(pendentes), int(confirmadas), int(recusadas),
+        int(pendentes) + int(confirmadas) + int(recusadas),
+        float(valor), float(valor_confirmado),
+    )
+
+
+def resumo_mes(ano, mes):
+    """Totais de um mês (todos os tipos de evento)"""
+    row = db.session.query(*_somas()).filter(
+        ResumoMensal.ano == ano, ResumoMensal.mes == mes
+    ).one()
+    return _resumo_periodo(*row)
+
+
+def resumos_ano(ano):
+    """
+    Totais de cada mês do ano.
+
+    Returns:
+        list[tuple[int, ResumoPeriodo]]: (mês, totais) para os 12 meses
+    """
+    rows = (
+        db.session.query(ResumoMensal.mes, *_somas())
+        .filter(ResumoMensal.ano == ano)
+        .group_by(ResumoMensal.mes)
+        .all()
+    )
+    por_mes = {mes: _resumo_periodo(*valores) for mes, *valores in rows}
+    vazio = ResumoPeriodo(0, 0, 0, 0, 0, 0.0, 0.0)
+    return [(mes, por_mes.get(mes, vazio)) for mes in range(1, 13)]
+
+
+def resumo_por_tipo(ano, mes=None):
+    """Totais por tipo de evento no ano (ou no mês), maiores valores primeiro"""
+    filtros = [ResumoMensal.ano == ano]
+    if mes:
+        filtros.append(ResumoMensal.mes == mes)
+    rows = (
+        db.session.query(TipoEvento.nome, *_somas())
+        .select_from(ResumoMensal)
+        .join(TipoEvento, ResumoMensal.tipo_id == TipoEvento.id)
+        .filter(*filtros)
+        .group_by(TipoEvento.id, TipoEvento.nome)
+        .order_by(func.sum(ResumoMensal.valor_total).desc())
+        .all()
+    )
+    return [(tipo, _resumo_periodo(*valores)) for tipo, *valores in rows]
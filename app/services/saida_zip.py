@@ -0,0 +1,29 @@
+"""
+Destino de ZIP em streaming, compartilhado pela exportação de PDFs
+(app/services/exportacao.py) e pelas planilhas XLSX
+(app/services/planilhas.py).
+"""
+
+
+class SaidaZip:
+    """Destino não posicionável do ZipFile: acumula os bytes até serem retirados"""
+
+    def __init__(self):
+        self._partes = []
+        self._posicao = 0
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self._posicao
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
@@ -0,0 +1,59 @@
+"""
+Compilação dos templates Jinja: cache de bytecode e aquecimento.
+
+Cada worker compila `base.html` e cada página no primeiro acesso, o que
+deixa lentas as primeiras requisições depois de um deploy ou da
+reciclagem de um worker.
+
+  - Com JINJA_BYTECODE_CACHE, o código compilado de cada template é
+    gravado em disco (FileSystemBytecodeCache). Os workers seguintes, e
+    os próximos deploys enquanto o template não mudar, só carregam o
+    bytecode, sem reprocessar o fonte. A chave inclui o hash do fonte,
+    então um template editado é recompilado.
+
+    O bytecode é executado ao ser carregado: quem conseguir gravar no
+    diretório executa código na aplicação. Sem JINJA_BYTECODE_DIR vale o
+    diretório padrão do Jinja (por usuário, 0700, dono conferido); um
+    diretório informado só é usado se for do usuário do processo e sem
+    acesso de grupo/outros, senão a aplicação segue sem o cache.
+  - `aquecer_templates` carrega todos os templates de app/templates no
+    cache em memória do Jinja. Chamado no mestre do gunicorn com
+    preload_app (gunicorn.conf.py), os workers já nascem com tudo
+    compilado; sem preload, cada worker aquece na partida a partir do
+    bytecode em disco.
+"""
+
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+from app.services.diretorios import exigir_diretorio_seguro
+
+EXTENSOES_TEMPLATE = ('.html',)
+
+
+def registrar_templates(app):
+    if not app.config['JINJA_BYTECODE_CACHE']:
+        return
+    diretorio = app.config.get('JINJA_BYTECODE_DIR')
+    try:
+        if not diretorio:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache()  # confere dono e modo
+        else:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(exigir_diretorio_seguro(diretorio))
+    except (OSError, RuntimeError) as exc:
+        app.logger.warning('Cache de bytecode dos templates desligado: %s', exc)
+
+
+def aquecer_templates(app):
+    """
+    Compila (ou carrega do bytecode) todos os templates da aplicação.
+
+    Returns:
+        tuple: (quantidade de templates, milissegundos gastos)
+    """
+    inicio = time.perf_counter()
+    nomes = [nome for nome in app.jinja_env.list_templates() if nome.endswith(EXTENSOES_TEMPLATE)]
+    for nome in nomes:
+        app.jinja_env.get_template(nome)
+    return len(nomes), (time.perf_counter() - inicio) * 1000
@@ -0,0 +1,254 @@
+"""
+Catálogo de tipos de evento.
+
+`Evento.tipo` continua guardando o nome do tipo (exibido nos PDFs e nas
+mensagens) e `Evento.tipo_id` aponta para o catálogo `tipos_evento`, para
+contar, filtrar e resumir por tipo (app/services/resumos.py) com um
+índice em vez de agrupar texto. Grafias que diferem só em acentos, maiúsculas ou
+espaços ("casamento", "Casamento ") são o mesmo tipo: o catálogo é único
+pela chave normalizada e os formulários gravam o nome como está no
+catálogo (`nome_canonico`).
+
+Todo flush que cria um evento ou troca o seu tipo liga o evento ao tipo
+do catálogo, criando o tipo quando ele é novo. A criação é um
+`INSERT ... ON CONFLICT DO NOTHING` seguido de nova leitura: dois workers
+gravando o mesmo tipo novo ao mesmo tempo ficam com a mesma linha, sem
+violar a chave única.
+
+A lista usada no autocomplete fica em cache no processo, validada pelo
+contador 'tipos' em `versoes_cache` como o elenco de garçons
+(app/services/elenco.py): criar, renomear ou excluir um tipo incrementa
+o contador na mesma transação.
+
+`migrar_tipos_evento` (chamada por `flask inicializar-banco`) adiciona a
+coluna `tipo_id` em bancos criados antes do catálogo e liga os eventos
+ainda sem tipo, unificando as grafias na mais usada.
+"""
+
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime
+from itertools import chain
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Evento, TipoEvento
+from app.services.busca import normalizar
+from app.services.elenco import incrementar_versao, versao_atual
+
+CHAVE_VERSAO = 'tipos'
+
+# Sugestões devolvidas pelo autocomplete
+LIMITE_SUGESTOES = 10
+
+TipoResumo = namedtuple('TipoResumo', ['id', 'nome', 'chave'])
+
+# INSERT com ON CONFLICT DO NOTHING de cada dialeto
+_UPSERT = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def limpar_nome(nome):
+    """Sem espaços nas pontas nem repetidos: '  Festa   Junina ' -> 'Festa Junina'"""
+    return ' '.join((nome or '').split())
+
+
+def chave_tipo(nome):
+    return normalizar(nome)
+
+
+def consultar_tipos():
+    """Tipos do catálogo, por nome, como tupla de TipoResumo"""
+    rows = db.session.execute(
+        select(TipoEvento.id, TipoEvento.nome, TipoEvento.chave).order_by(TipoEvento.nome)
+    )
+    return tuple(TipoResumo(*row) for row in rows)
+
+
+def tipos_cadastrados():
+    """Catálogo de tipos, do cache do processo se a versão não mudou"""
+    versao = versao_atual(CHAVE_VERSAO)
+    cache = current_app.extensions.get('tipos_cache')
+    if cache and cache['versao'] == versao:
+        return cache['tipos']
+
+    tipos = consultar_tipos()
+    current_app.extensions['tipos_cache'] = {'versao': versao, 'tipos': tipos}
+    return tipos
+
+
+def invalidar_tipos():
+    if has_app_context():
+        current_app.extensions.pop('tipos_cache', None)
+
+
+def sugerir_tipos(termo, limite=LIMITE_SUGESTOES):
+    """Nomes do catálogo que começam com `termo`, seguidos dos que o contêm (sem acentos)"""
+    chave = chave_tipo(termo)
+    tipos = tipos_cadastrados()
+    if not chave:
+        return [tipo.nome for tipo in tipos[:limite]]
+    prefixo = [tipo.nome for tipo in tipos if tipo.chave.startswith(chave)]
+    contem = [tipo.nome for tipo in tipos if chave in tipo.chave and not tipo.chave.startswith(chave)]
+    return (prefixo + contem)[:limite]
+
+
+def tipo_por_nome(nome):
+    return TipoEvento.query.filter_by(chave=chave_tipo(nome)).first()
+
+
+def criar_tipo(nome):
+    """
+    Cadastra o tipo no catálogo, na transação corrente (sem commit).
+
+    Usa o mesmo INSERT do flush: dois admins cadastrando o mesmo tipo ao
+    mesmo tempo não violam a chave única, o segundo recebe o tipo criado
+    pelo primeiro.
+
+    Returns:
+        tuple[TipoEvento, bool]: o tipo do catálogo e se foi criado agora
+    """
+    chave = chave_tipo(nome)
+    conexao = db.session.connection()
+    criado = _inserir_tipo(conexao, nome, chave)
+    if criado:
+        incrementar_versao(conexao, CHAVE_VERSAO)
+        db.session.info['tipos_alterado'] = True
+    return _buscar_tipo(db.session, chave), criado
+
+
+def nome_canonico(nome):
+    """Nome como está no catálogo ('casamento ' -> 'Casamento'); tipo novo apenas sem espaços extras"""
+    tipo = tipo_por_nome(nome)
+    return tipo.nome if tipo else limpar_nome(nome)
+
+
+def migrar_tipos_evento():
+    """
+    Adiciona `eventos.tipo_id` em bancos antigos e liga ao catálogo os
+    eventos sem tipo. Idempotente.
+
+    Returns:
+        int: eventos ligados ao catálogo
+    """
+    colunas = {coluna['name'] for coluna in inspect(db.engine).get_columns('eventos')}
+    if 'tipo_id' not in colunas:
+        with db.engine.begin() as conexao:
+            conexao.execute(text('ALTER TABLE eventos ADD COLUMN tipo_id INTEGER REFERENCES tipos_evento (id)'))
+
+    pendentes = [
+        (evento_id, tipo)
+        for evento_id, tipo in db.session.execute(
+            select(Evento.id, Evento.tipo).where(Evento.tipo_id.is_(None))
+        )
+        if chave_tipo(tipo)
+    ]
+    if not pendentes:
+        return 0
+
+    # Grafias de cada chave; o tipo novo fica com a mais usada
+    grafias = defaultdict(Counter)
+    for _, tipo in pendentes:
+        grafias[chave_tipo(tipo)][limpar_nome(tipo)] += 1
+
+    catalogo = {tipo.chave: tipo for tipo in TipoEvento.query}
+    for chave, contagem in grafias.items():
+        if chave not in catalogo:
+            catalogo[chave] = TipoEvento(nome=contagem.most_common(1)[0][0], chave=chave)
+            db.session.add(catalogo[chave])
+    db.session.flush()
+
+    eventos = Evento.__table__
+    por_tipo = defaultdict(list)
+    for evento_id, tipo in pendentes:
+        destino = catalogo[chave_tipo(tipo)]
+        por_tipo[(destino.id, destino.nome)].append(evento_id)
+    for (tipo_id, nome), ids in por_tipo.items():
+        db.session.execute(
+            update(eventos)
+            .where(eventos.c.id.in_(ids))
+            .values(tipo_id=tipo_id, tipo=nome, updated_at=eventos.c.updated_at)  # não conta como edição
+        )
+    db.session.commit()
+
+    # Eventos sem tipo ficavam fora dos resumos mensais (chaveados por tipo_id)
+    from app.services.resumos import reconstruir_resumos
+    reconstruir_resumos()
+    return len(pendentes)
+
+
+def _buscar_tipo(session, chave):
+    with session.no_autoflush:
+        return session.query(TipoEvento).filter_by(chave=chave).first()
+
+
+def _inserir_tipo(conexao, nome, chave):
+    """Insere o tipo se a chave ainda não existe; False se outra transação já o criou"""
+    tabela = TipoEvento.__table__
+    valores = {'nome': limpar_nome(nome), 'chave': chave, 'created_at': datetime.utcnow()}
+    upsert = _UPSERT.get(conexao.dialect.name)
+    if upsert is not None:
+        comando = upsert(tabela).values(valores).on_conflict_do_nothing(index_elements=['chave'])
+        return conexao.execute(comando).rowcount > 0
+
+    # Sem upsert no dialeto: SAVEPOINT, para a violação não abortar a transação
+    try:
+        with conexao.begin_nested():
+            conexao.execute(insert(tabela).values(valores))
+    except IntegrityError:
+        return False
+    return True
+
+
+def _tipo_do_catalogo(session, nome, novos):
+    chave = chave_tipo(nome)
+    if chave not in novos:
+        tipo = _buscar_tipo(session, chave)
+        if tipo is None:
+            if _inserir_tipo(session.connection(), nome, chave):
+                session.info['tipos_incrementar'] = True
+                session.info['tipos_alterado'] = True
+            tipo = _buscar_tipo(session, chave)
+        novos[chave] = tipo
+    return novos[chave]
+
+
+def _altera_catalogo(obj, session):
+    if not isinstance(obj, TipoEvento):
+        return False
+    return obj in session.new or obj in session.deleted or inspect(obj).attrs.nome.history.has_changes()
+
+
+@event.listens_for(Session, 'before_flush')
+def _ligar_eventos_ao_catalogo(session, flush_context, instances):
+    novos = {}
+    for obj in chain(session.new, session.dirty):
+        if not isinstance(obj, Evento) or not chave_tipo(obj.tipo):
+            continue
+        if obj in session.new or inspect(obj).attrs.tipo.history.has_changes():
+            obj.tipo_evento = _tipo_do_catalogo(session, obj.tipo, novos)
+
+    if any(_altera_catalogo(obj, session) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['tipos_incrementar'] = True
+        session.info['tipos_alterado'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _incrementar_versao_tipos(session, flush_context):
+    if session.info.pop('tipos_incrementar', False):
+        incrementar_versao(session.connection(), CHAVE_VERSAO)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_tipos_no_commit(session):
+    if session.info.pop('tipos_alterado', False):
+        invalidar_tipos()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_marca_tipos(session):
+    session.info.pop('tipos_incrementar', None)
+    session.info.pop('tipos_alterado', None)
@@ -14,6 +14,8 @@ import logging
 import requests
 from flask import current_app
 
+from app.services.mudancas import registrar_envio
+
 logger = logging.getLogger(__name__)
 
 # Endpoint base da Cloud API (versão estável)
@@ -69,7 +71,14 @@ def enviar_notificacao_whatsapp(escala) -> bool:
         f"_Primor Garçons_"
     )
 
-    return _enviar_texto(numero, mensagem, access_token, phone_number_id, garcom.nome)
+    msg_id = _enviar_texto(numero, mensagem, access_token, phone_number_id, garcom.nome)
+    if msg_id is None:
+        return False
+
+    # Guarda o wamid para casar os status de entrega recebidos pelo webhook
+    if msg_id:
+        registrar_envio(escala, msg_id)
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -82,11 +91,14 @@ def _enviar_texto(
     access_token: str,
     phone_number_id: str,
     nome_destino: str = '',
-) -> bool:
+):
     """
     Envia uma mensagem de texto simples via Cloud API.
 
     Ref: POST /{phone-number-id}/messages
+
+    Returns:
+        id da mensagem (wamid) se enviou, None caso contrário
     """
     endpoint = f"{_GRAPH_API_URL}/{phone_number_id}/messages"
 
@@ -116,20 +128,20 @@ def _enviar_texto(
                 'WhatsApp enviado para %s (%s) | msg_id=%s',
                 nome_destino, numero, msg_id,
             )
-            return True
+            return msg_id
 
         logger.error(
             'Erro ao enviar para %s (%s): HTTP %s — %s',
             nome_destino, numero, response.status_code, response.text,
         )
-        return False
+        return None
 
     except requests.exceptions.Timeout:
         logger.error('Timeout ao conectar com a Cloud API do WhatsApp.')
-        return False
+        return None
     except requests.exceptions.RequestException as exc:
         logger.error('Erro de conexão com a Cloud API: %s', exc)
-        return False
+        return None
 
 
 def marcar_mensagem_lida(message_id: str) -> bool:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Relatório de partida a frio de um worker.
+
+Sobe N processos novos (como os workers do gunicorn sem preload_app),
+cada um importando a aplicação e executando `create_app`, com
+`python -X importtime`, e em seguida compilando todos os templates
+(`aquecer_templates`). Registra, por processo: tempo das importações,
+do `create_app`, da compilação dos templates e total, e se os módulos
+pesados carregados sob demanda (ReportLab, requests) entraram na partida.
+Por fim soma o tempo próprio das importações por pacote de primeiro
+nível, para mostrar onde está o custo.
+
+Os processos compartilham um diretório novo de bytecode Jinja: o
+primeiro compila os templates do fonte e grava o bytecode, os demais só
+o carregam (a diferença é o ganho do cache em cada worker seguinte).
+
+Não acessa o banco: desde que tabelas e admin passaram para
+`flask inicializar-banco`, `create_app` não abre conexões.
+
+Uso:
+    python benchmarks/bench_partida.py                  # 3 processos, 15 pacotes
+    python benchmarks/bench_partida.py --processos 5 --pacotes 30
+    python benchmarks/bench_partida.py --sem-bytecode   # todos compilam do fonte
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from statistics import median
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_PESADOS = ('reportlab', 'requests', 'PIL')
+
+PARTIDA = f"""
+import json, sys, time
+inicio = time.perf_counter()
+from app import create_app
+from app.config import config
+from app.services.templates import aquecer_templates
+importado = time.perf_counter()
+config[sys.argv[1]].JINJA_BYTECODE_CACHE = bool(sys.argv[2])
+config[sys.argv[1]].JINJA_BYTECODE_DIR = sys.argv[2] or None
+app = create_app(sys.argv[1])
+criado = time.perf_counter()
+aquecer_templates(app)
+pronto = time.perf_counter()
+print(json.dumps({{
+    'importacao_ms': (importado - inicio) * 1000,
+    'create_app_ms': (criado - importado) * 1000,
+    'templates_ms': (pronto - criado) * 1000,
+    'total_ms': (pronto - inicio) * 1000,
+    'pesados': [m for m in {MODULOS_PESADOS!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir_processo(config, bytecode):
+    """Executa uma partida em um processo novo; devolve (medidas, tempos por módulo)"""
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PARTIDA, config, bytecode or ''],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    # Linhas do -X importtime: "import time: <próprio us> | <acumulado us> | <módulo>"
+    proprio = Counter()
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        tempo, _, modulo = linha.removeprefix('import time:').split('|')
+        proprio[modulo.strip().split('.')[0]] += int(tempo)
+    return json.loads(resultado.stdout.strip().splitlines()[-1]), proprio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processos', type=int, default=3, help='partidas medidas (padrão: 3, um por worker)')
+    parser.add_argument('--pacotes', type=int, default=15, help='pacotes listados no ranking de importação')
+    parser.add_argument('--config', default='testing', help='configuração passada ao create_app')
+    parser.add_argument('--sem-bytecode', action='store_true', help='desliga o cache de bytecode dos templates')
+    args = parser.parse_args()
+
+    medidas, pacotes = [], Counter()
+    with tempfile.TemporaryDirectory(prefix='bench-jinja-') as bytecode:
+        print(f'{"processo":>8} {"importação":>12} {"create_app":>12} {"templates":>11} {"total":>10}  pesados')
+        for numero in range(1, args.processos + 1):
+            medida, proprio = medir_processo(args.config, None if args.sem_bytecode else bytecode)
+            medidas.append(medida)
+            pacotes.update(proprio)
+            print(
+                f'{numero:>8} {medida["importacao_ms"]:>10.0f}ms {medida["create_app_ms"]:>10.0f}ms '
+                f'{medida["templates_ms"]:>9.0f}ms {medida["total_ms"]:>8.0f}ms  '
+                f'{", ".join(medida["pesados"]) or "-"}'
+            )
+
+    print(f'\nMediana do total: {median(m["total_ms"] for m in medidas):.0f} ms por worker')
+    print(f'\nTempo próprio de importação por pacote (média de {args.processos} processos):')
+    for pacote, micros in pacotes.most_common(args.pacotes):
+        print(f'  {pacote:<30} {micros / args.processos / 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark do serviço de PDF (app/services/pdf.py).
+
+Gera bases sintéticas de garçons, eventos e escalas em SQLite em memória,
+de tamanhos crescentes, e mede cada um dos quatro `gerar_pdf_*` com as
+entradas montadas como nas rotas. Cada caso roda em um processo próprio,
+para que o pico de memória (RSS) de um não contamine o outro.
+
+Registra, por caso: tempo de parede (melhor de N repetições), pico de RSS
+do processo, pico de memória alocada durante a renderização (tracemalloc,
+em uma execução à parte para não afetar o tempo) e tamanho do PDF.
+Compara com a baseline gravada em benchmarks/baseline_pdf.json e termina
+com código 1 se alguma métrica piorar além do limite. Tempo e RSS
+dependem da máquina: grave a baseline na mesma máquina que vai comparar.
+
+Roda offline, só com as dependências do requirements.txt.
+
+Uso:
+    python benchmarks/bench_pdf.py                   # mede e compara com a baseline
+    python benchmarks/bench_pdf.py --gravar-baseline # mede e grava a nova baseline
+    python benchmarks/bench_pdf.py --tamanhos pequeno,medio --limite 0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, time as hora, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_pdf.json')
+
+# garçons, eventos, escalas por evento
+TAMANHOS = {
+    'pequeno': (10, 20, 8),
+    'medio': (50, 200, 10),
+    'grande': (200, 1000, 12),
+}
+
+RELATORIOS = ('evento', 'geral', 'garcons', 'eventos_mes')
+
+# Métricas comparadas com a baseline (piorar = aumentar)
+METRICAS = ('tempo_s', 'rss_pico_kb', 'alocacao_pico_kb', 'tamanho_kb')
+
+# Abaixo destes valores absolutos a variação é ruído de medição
+MINIMOS = {'tempo_s': 0.05, 'rss_pico_kb': 0, 'alocacao_pico_kb': 1024, 'tamanho_kb': 4}
+
+
+def _rss_pico_kb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == 'darwin' else pico  # bytes no macOS
+
+
+def popular(garcons, eventos, escalas_por_evento):
+    """Cria a base sintética (determinística) na sessão atual"""
+    from app import db
+    from app.models import Garcom, Evento, Escala
+
+    aleatorio = random.Random(42)
+    tipos = ['Casamento', 'Formatura', 'Corporativo', 'Aniversário', 'Debutante']
+    status = ['pendente', 'confirmado', 'confirmado', 'recusado']
+
+    lista_garcons = [
+        Garcom(
+            nome=f'Garçom Sintético {i:04d}',
+            email=f'garcom{i}@bench.local',
+            telefone=f'4599{i:07d}',
+            idade=18 + i % 40,
+            pix=f'garcom{i}@pix.local',
+        )
+        for i in range(garcons)
+    ]
+    db.session.add_all(lista_garcons)
+
+    inicio = date(2026, 1, 1)
+    for i in range(eventos):
+        evento = Evento(
+            nome=f'Evento Sintético {i:05d}',
+            tipo=tipos[i % len(tipos)],
+            data=inicio + timedelta(days=i % 365),
+            hora_inicio=hora(19, 0),
+            hora_fim=hora(23, 30),
+            local=f'Salão {i % 37}',
+            valor_padrao=200,
+            valor_motorista=50,
+        )
+        db.session.add(evento)
+        for garcom in aleatorio.sample(lista_garcons, min(escalas_por_evento, garcons)):
+            db.session.add(Escala(
+                evento=evento,
+                garcom=garcom,
+                valor=200,
+                is_motorista=aleatorio.random() < 0.15,
+                status=aleatorio.choice(status),
+            ))
+    db.session.commit()
+
+
+def preparar(relatorio):
+    """Monta as entradas do relatório como a rota correspondente faz"""
+    from sqlalchemy import func
+
+    from app import db
+    from app.models import Escala, Garcom
+    from app.services import pdf
+    from app.services.relatorio_dados import snapshot_evento, linhas_eventos_mes, linhas_relatorio_geral
+
+    if relatorio == 'evento':
+        # O evento com mais escalas
+        evento_id = (
+            db.session.query(Escala.evento_id)
+            .group_by(Escala.evento_id)
+            .order_by(func.count().desc())
+            .limit(1)
+            .scalar()
+        )
+        return lambda: pdf.gerar_pdf_evento(snapshot_evento(evento_id))
+    if relatorio == 'geral':
+        return lambda: pdf.gerar_pdf_relatorio_geral(linhas_relatorio_geral())
+    if relatorio == 'garcons':
+        return lambda: pdf.gerar_pdf_garcons(
+            Garcom.query.filter_by(ativo=True).order_by(Garcom.nome).all()
+        )
+    if relatorio == 'eventos_mes':
+        return lambda: pdf.gerar_pdf_eventos_mes(linhas_eventos_mes(), 1, 2026)
+    raise ValueError(relatorio)
+
+
+def executar_caso(relatorio, tamanho, repeticoes):
+    """Executado no processo filho: mede um relatório em uma base"""
+    from app import create_app, db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        popular(*TAMANHOS[tamanho])
+        gerar = preparar(relatorio)
+
+        tempos = []
+        for _ in range(repeticoes):
+            db.session.expire_all()  # cada repetição consulta o banco como numa requisição nova
+            inicio = time.perf_counter()
+            with gerar() as arquivo:
+                arquivo.seek(0, os.SEEK_END)
+                tamanho_pdf = arquivo.tell()
+            tempos.append(time.perf_counter() - inicio)
+
+        db.session.expire_all()
+        tracemalloc.start()
+        gerar().close()
+        alocacao_pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'tempo_s': round(min(tempos), 4),
+        'rss_pico_kb': _rss_pico_kb(),
+        'alocacao_pico_kb': round(alocacao_pico / 1024),
+        'tamanho_kb': round(tamanho_pdf / 1024, 1),
+    }
+
+
+def medir(relatorio, tamanho, repeticoes):
+    """Roda o caso em um processo novo e devolve as métricas"""
+    saida = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--caso', f'{relatorio}:{tamanho}',
+         '--repeticoes', str(repeticoes)],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def comparar(atual, baseline, limite):
+    """Lista as regressões (métrica, valor atual, valor da baseline)"""
+    regressoes = []
+    for metrica in METRICAS:
+        base = baseline.get(metrica)
+        if base is None:
+            continue
+        if atual[metrica] > max(base, MINIMOS[metrica]) * (1 + limite):
+            regressoes.append((metrica, atual[metrica], base))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do serviço de PDF')
+    parser.add_argument('--tamanhos', default=','.join(TAMANHOS))
+    parser.add_argument('--relatorios', default=','.join(RELATORIOS))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--limite', type=float, default=0.3,
+                        help='piora relativa tolerada antes de acusar regressão (0.3 = 30%%)')
+    parser.add_argument('--gravar-baseline', action='store_true')
+    parser.add_argument('--caso', help=argparse.SUPPRESS)  # uso interno (processo filho)
+    args = parser.parse_args()
+
+    if args.caso:
+        relatorio, tamanho = args.caso.split(':')
+        print(json.dumps(executar_caso(relatorio, tamanho, args.repeticoes)))
+        return
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+
+    resultados = {}
+    regressoes = []
+    print(f'{"caso":<22} {"tempo (s)":>10} {"RSS pico (MB)":>14} {"alocado (MB)":>13} {"PDF (KB)":>9}  baseline')
+    for tamanho in args.tamanhos.split(','):
+        for relatorio in args.relatorios.split(','):
+            caso = f'{relatorio}:{tamanho}'
+            atual = resultados[caso] = medir(relatorio, tamanho, args.repeticoes)
+
+            situacao = '-'
+            if caso in baseline and not args.gravar_baseline:
+                piores = comparar(atual, baseline[caso], args.limite)
+                regressoes += [(caso, *p) for p in piores]
+                situacao = 'REGRESSÃO' if piores else 'ok'
+
+            print(f'{caso:<22} {atual["tempo_s"]:>10.3f} {atual["rss_pico_kb"] / 1024:>14.1f} '
+                  f'{atual["alocacao_pico_kb"] / 1024:>13.1f} {atual["tamanho_kb"]:>9.1f}  {situacao}')
+
+    if args.gravar_baseline:
+        baseline.update(resultados)
+        with open(BASELINE, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nBaseline gravada em {os.path.relpath(BASELINE, RAIZ)}')
+        return
+
+    if regressoes:
+        print(f'\nRegressões acima de {args.limite:.0%}:')
+        for caso, metrica, valor, base in regressoes:
+            print(f'  {caso} {metrica}: {valor} (baseline {base})')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
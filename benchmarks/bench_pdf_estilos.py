@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do custo de preparação (estilos) de cada relatório PDF.
+
+Compara a montagem antiga, que recriava getSampleStyleSheet(), os
+ParagraphStyles e o TableStyle a cada relatório, com o kit em cache de
+app/services/pdf_builder.py.
+
+Uso:
+    python benchmarks/bench_pdf_estilos.py [repeticoes]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib import colors  # noqa: E402
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # noqa: E402
+from reportlab.lib.enums import TA_CENTER  # noqa: E402
+from reportlab.platypus import TableStyle  # noqa: E402
+
+from app.services.pdf_builder import estilos, estilo_tabela  # noqa: E402
+
+
+def setup_sem_cache():
+    """Reproduz a preparação feita por relatório antes do kit compartilhado"""
+    styles = getSampleStyleSheet()
+    ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18,
+                   textColor=colors.HexColor('#FBBF24'), spaceAfter=20, alignment=TA_CENTER)
+    ParagraphStyle('CustomSubtitle', parent=styles['Heading2'], fontSize=14,
+                   textColor=colors.HexColor('#1F2937'), spaceAfter=10)
+    ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=10,
+                   textColor=colors.HexColor('#374151'))
+    ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8,
+                   textColor=colors.HexColor('#9CA3AF'), alignment=TA_CENTER)
+    TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1F2937')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#374151')),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),
+        ('ALIGN', (4, 1), (4, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+
+def setup_com_cache():
+    """Preparação atual: apenas consultas ao cache do processo"""
+    estilos()
+    estilo_tabela(alinhamentos=((3, 3, 'CENTER'), (4, 4, 'RIGHT')))
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    sem_cache = timeit.timeit(setup_sem_cache, number=repeticoes) / repeticoes
+    com_cache = timeit.timeit(setup_com_cache, number=repeticoes) / repeticoes
+
+    print(f'Preparação por relatório ({repeticoes} repetições)')
+    print(f'  sem cache: {sem_cache * 1e6:10.1f} µs')
+    print(f'  com cache: {com_cache * 1e6:10.1f} µs')
+    print(f'  ganho:     {sem_cache / com_cache:10.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escala das tabelas dos relatórios PDF.
+
+Renderiza o relatório geral e o de eventos do mês com quantidades
+crescentes de linhas sintéticas e verifica que o tempo por linha
+permanece estável (crescimento linear). Termina com código 1 se o tempo
+por linha no maior tamanho passar de `tolerancia` vezes o do menor.
+
+Uso:
+    python benchmarks/bench_pdf_tabelas.py [--tamanhos 1000,5000,...] [--tolerancia 1.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf import gerar_pdf_relatorio_geral, gerar_pdf_eventos_mes  # noqa: E402
+from app.services.relatorio_dados import LinhaEventoGeral, LinhaEventoMes  # noqa: E402
+
+
+def linhas_geral(n):
+    return [
+        LinhaEventoGeral('15/03/2026', f'Evento {i}', f'Salão {i % 40}', i % 12, 200.0 * (i % 12))
+        for i in range(n)
+    ]
+
+
+def linhas_mes(n):
+    inicio = date(2026, 3, 1)
+    return [
+        LinhaEventoMes(inicio + timedelta(days=i % 31), '19:00 - 23:00', f'Evento {i}', f'Salão {i % 40}', i % 12, 0.0)
+        for i in range(n)
+    ]
+
+
+RELATORIOS = {
+    'geral': (linhas_geral, lambda linhas: gerar_pdf_relatorio_geral(linhas)),
+    'eventos_mes': (linhas_mes, lambda linhas: gerar_pdf_eventos_mes(linhas, 3, 2026)),
+}
+
+
+def medir(gerar, linhas):
+    inicio = time.perf_counter()
+    with gerar(linhas) as arquivo:
+        arquivo.seek(0, os.SEEK_END)
+        tamanho = arquivo.tell()
+    return time.perf_counter() - inicio, tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default='1000,5000,10000,25000,50000')
+    parser.add_argument('--tolerancia', type=float, default=1.5)
+    args = parser.parse_args()
+    tamanhos = [int(t) for t in args.tamanhos.split(',')]
+
+    falhou = False
+    for nome, (montar, gerar) in RELATORIOS.items():
+        medir(gerar, montar(10))  # aquecimento (fontes, estilos)
+
+        print(f'{nome}')
+        print(f'  {"linhas":>8} {"tempo (s)":>10} {"µs/linha":>10} {"KB":>8}')
+        por_linha = []
+        for n in tamanhos:
+            tempo, tamanho = medir(gerar, montar(n))
+            por_linha.append(tempo / n)
+            print(f'  {n:>8} {tempo:>10.2f} {tempo / n * 1e6:>10.1f} {tamanho / 1024:>8.0f}')
+
+        razao = por_linha[-1] / por_linha[0]
+        linear = razao <= args.tolerancia
+        falhou |= not linear
+        print(f'  tempo por linha {tamanhos[-1]} / {tamanhos[0]}: {razao:.2f}x '
+              f'({"linear" if linear else "NÃO linear"}, tolerância {args.tolerancia}x)\n')
+
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Configuração do gunicorn (`gunicorn -c gunicorn.conf.py run:app`).
+
+Com `preload_app` a aplicação é criada uma vez no processo mestre e os
+workers nascem por fork já com ela carregada (memória compartilhada por
+copy-on-write), em vez de cada worker importar e montar tudo de novo.
+Os módulos pesados que as rotas importam sob demanda (ReportLab para os
+PDFs, requests para o WhatsApp) também são carregados no mestre, para
+que o primeiro PDF de cada worker não pague a importação.
+
+Todos os templates também são compilados na partida (AQUECER_TEMPLATES,
+ligado por padrão): no mestre com preload_app, ou em cada worker sem
+ele, carregando o bytecode que o primeiro gravou (JINJA_BYTECODE_CACHE).
+
+Banco e admin padrão não são preparados aqui: rode
+`flask --app run inicializar-banco` antes de subir o servidor.
+
+A cada worker iniciado o log mostra o tempo de partida (do fork até
+estar pronto para atender).
+"""
+
+import importlib
+import os
+import time
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '3'))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+# Importados no mestre antes do fork (só com preload_app)
+MODULOS_PRECARREGADOS = (
+    'app.services.pdf',
+    'app.services.whatsapp',
+)
+
+
+def _aquecer_templates(app, log):
+    from app.services.templates import aquecer_templates
+
+    if app.config['AQUECER_TEMPLATES']:
+        total, ms = aquecer_templates(app)
+        log.info('%d templates compilados em %.0f ms', total, ms)
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    inicio = time.perf_counter()
+    for modulo in MODULOS_PRECARREGADOS:
+        importlib.import_module(modulo)
+    server.log.info('Módulos pré-carregados em %.0f ms', (time.perf_counter() - inicio) * 1000)
+    _aquecer_templates(server.app.wsgi(), server.log)
+
+
+def post_fork(server, worker):
+    worker.partida = time.perf_counter()
+    if server.cfg.preload_app:
+        # Conexões abertas no mestre não podem ser compartilhadas entre processos
+        from app import db
+
+        with server.app.wsgi().app_context():
+            for engine in db.engines.values():  # primário e réplica
+                engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _aquecer_templates(worker.wsgi, worker.log)
+    worker.log.info(
+        'Worker %s pronto em %.0f ms (preload_app=%s)',
+        worker.pid, (time.perf_counter() - worker.partida) * 1000, worker.cfg.preload_app,
+    )
@@ -4,9 +4,16 @@ Primor Garçons - Sistema de Gestão de Garçons e Eventos
 Ponto de entrada da aplicação Flask
 """
 
-from app import create_app
+import os
 
-app = create_app()
+from app import create_app, inicializar_banco
+
+# development (padrão), production ou testing; a imagem Docker usa production
+app = create_app(os.getenv('FLASK_CONFIG', 'default'))
 
 if __name__ == '__main__':
+    # Servidor de desenvolvimento: prepara o banco na partida. Em produção
+    # isso é feito por `flask --app run inicializar-banco` antes do gunicorn.
+    with app.app_context():
+        inicializar_banco(app)
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Build dos arquivos estáticos: CSS do Tailwind, fontes locais e imagens.
+
+Substitui o compilador do Tailwind que rodava no navegador (CDN), as
+fontes do Google Fonts e os logos servidos no tamanho original:
+
+  1. Copia os subconjuntos latinos (woff2) de Inter e Playfair Display
+     dos pacotes @fontsource e monta as regras @font-face.
+  2. Roda o Tailwind sobre app/assets/app.css, varrendo app/templates e
+     o código Python (tailwind.config.js): o CSS sai minificado e só com
+     as classes usadas.
+  3. Gera, para cada imagem de app/static/img, variantes redimensionadas
+     em AVIF, WebP e no formato original otimizado (PNG/JPEG), usadas
+     nos `srcset` de `imagem_responsiva` (requer Pillow; AVIF a partir
+     do Pillow 11.3).
+  4. Grava tudo em app/static/dist com o hash do conteúdo no nome e um
+     manifest.json (nome lógico -> arquivo; imagens em "imagens"), lido
+     por app/services/assets.py para montar as URLs nos templates.
+  5. Gera versões .br e .gz (compressão máxima) dos arquivos de texto,
+     listadas em "comprimidos" no manifesto e servidas conforme o
+     Accept-Encoding (brotli requer o pacote `Brotli`).
+
+Como o nome muda a cada alteração de conteúdo, os arquivos de dist/ são
+servidos com cache imutável de um ano.
+
+Uso (requer Node, `npm install` na raiz do projeto e Pillow):
+    python scripts/construir_assets.py
+    python scripts/construir_assets.py --tailwind ./tailwindcss-linux-x64  # binário standalone
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from PIL import Image, features
+
+try:
+    import brotli
+except ImportError:  # sem o pacote Brotli, só .gz
+    brotli = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRADA_CSS = os.path.join(RAIZ, 'app', 'assets', 'app.css')
+CONFIG_TAILWIND = os.path.join(RAIZ, 'tailwind.config.js')
+SAIDA = os.path.join(RAIZ, 'app', 'static', 'dist')
+IMAGENS = os.path.join(RAIZ, 'app', 'static', 'img')
+MANIFESTO = 'manifest.json'
+
+# pacote @fontsource -> (família, pesos usados nos templates)
+FONTES = {
+    'inter': ('Inter', (400, 500, 600, 700)),
+    'playfair-display': ('Playfair Display', (400, 500, 600, 700)),
+}
+SUBCONJUNTO = 'latin'  # cobre o português (acentos e ç)
+INTERVALO_LATIN = (
+    'U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,U+0329,'
+    'U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD'
+)
+
+# Larguras (px) das variantes: cobrem os logos exibidos com 80-112px em telas 1x a 3x
+LARGURAS = (80, 160, 240, 320, 480, 640, 960)
+EXTENSOES = {'avif': 'avif', 'webp': 'webp', 'png': 'png', 'jpeg': 'jpg'}
+OPCOES_FORMATO = {
+    'avif': {'quality': 55},
+    'webp': {'quality': 80, 'method': 6},
+    'png': {'optimize': True},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+# Extensões de texto que recebem versões pré-comprimidas
+COMPRIMIVEIS = ('.css', '.js', '.svg')
+
+
+def _hash(dados):
+    return hashlib.sha256(dados).hexdigest()[:10]
+
+
+def gravar_com_hash(nome_logico, dados, manifesto=None):
+    """Grava `dados` em dist/ com o hash no nome e registra no manifesto (se dado)"""
+    base, extensao = os.path.splitext(nome_logico)
+    nome = f'{base}.{_hash(dados)}{extensao}'
+    caminho = os.path.join(SAIDA, nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'wb') as f:
+        f.write(dados)
+    if manifesto is not None:
+        manifesto[nome_logico] = f'dist/{nome}'
+    return nome
+
+
+def construir_fontes(node_modules, manifesto):
+    """Copia as fontes e devolve as regras @font-face (URLs relativas ao CSS em dist/)"""
+    regras = []
+    for pacote, (familia, pesos) in FONTES.items():
+        for peso in pesos:
+            arquivo = f'{pacote}-{SUBCONJUNTO}-{peso}-normal.woff2'
+            with open(os.path.join(node_modules, '@fontsource', pacote, 'files', arquivo), 'rb') as f:
+                nome = gravar_com_hash(f'fonts/{arquivo}', f.read(), manifesto)
+            regras.append(
+                f"@font-face{{font-family:'{familia}';font-style:normal;font-weight:{peso};"
+                f"font-display:swap;src:url({nome}) format('woff2');unicode-range:{INTERVALO_LATIN}}}"
+            )
+    return '\n'.join(regras)
+
+
+def _codificar(imagem, formato):
+    if formato == 'jpeg' and imagem.mode != 'RGB':
+        imagem = imagem.convert('RGB')
+    saida = io.BytesIO()
+    imagem.save(saida, format=formato.upper(), **OPCOES_FORMATO[formato])
+    return saida.getvalue()
+
+
+def construir_imagens(diretorio):
+    """
+    Variantes de cada imagem por largura e formato.
+
+    Returns:
+        {'img/<arquivo>': {'largura', 'altura', 'variantes': {formato: {largura: arquivo}}}}
+    """
+    modernos = [formato for formato in ('avif', 'webp') if features.check(formato)]
+    if 'avif' not in modernos:
+        print('Aviso: Pillow sem suporte a AVIF, gerando apenas WebP', file=sys.stderr)
+
+    imagens = {}
+    for arquivo in sorted(os.listdir(diretorio)):
+        base, extensao = os.path.splitext(arquivo)
+        if extensao.lower() not in ('.png', '.jpg', '.jpeg'):
+            continue
+        with Image.open(os.path.join(diretorio, arquivo)) as original:
+            original.load()
+        largura, altura = original.size
+        formatos = modernos + ['png' if extensao.lower() == '.png' else 'jpeg']
+
+        variantes = {}
+        for alvo in [w for w in LARGURAS if w < largura] + [largura]:
+            reduzida = original.resize((alvo, round(altura * alvo / largura)), Image.LANCZOS)
+            for formato in formatos:
+                nome = gravar_com_hash(f'img/{base}-{alvo}w.{EXTENSOES[formato]}', _codificar(reduzida, formato))
+                variantes.setdefault(formato, {})[alvo] = f'dist/{nome}'
+
+        imagens[f'img/{arquivo}'] = {'largura': largura, 'altura': altura, 'variantes': variantes}
+    return imagens
+
+
+def comprimir_estaticos():
+    """
+    Grava .br e .gz ao lado dos arquivos de texto de dist/ (só quando
+    ficam menores).
+
+    Returns:
+        {'dist/<arquivo>': ['br', 'gzip']} com as versões geradas, em ordem de preferência
+    """
+    codificadores = {'gzip': ('.gz', lambda dados: gzip.compress(dados, compresslevel=9, mtime=0))}
+    if brotli:
+        codificadores = {'br': ('.br', lambda dados: brotli.compress(dados, quality=11)), **codificadores}
+
+    comprimidos = {}
+    for pasta, _, arquivos in os.walk(SAIDA):
+        for arquivo in sorted(arquivos):
+            if not arquivo.endswith(COMPRIMIVEIS):
+                continue
+            caminho = os.path.join(pasta, arquivo)
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+            for codificacao, (extensao, comprimir) in codificadores.items():
+                comprimido = comprimir(dados)
+                if len(comprimido) < len(dados):
+                    with open(caminho + extensao, 'wb') as f:
+                        f.write(comprimido)
+                    nome = os.path.relpath(caminho, os.path.dirname(SAIDA)).replace(os.sep, '/')
+                    comprimidos.setdefault(nome, []).append(codificacao)
+    return comprimidos
+
+
+def construir_css(fontes_css, tailwind, manifesto):
+    """Roda o Tailwind (minificado, só com as classes usadas) e grava o CSS"""
+    with open(ENTRADA_CSS) as f:
+        entrada = f'{fontes_css}\n{f.read()}'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho_entrada = os.path.join(tmp, 'app.css')
+        caminho_saida = os.path.join(tmp, 'app.min.css')
+        with open(caminho_entrada, 'w') as f:
+            f.write(entrada)
+        subprocess.run(
+            [*tailwind, '-c', CONFIG_TAILWIND, '-i', caminho_entrada, '-o', caminho_saida, '--minify'],
+            cwd=RAIZ, check=True,
+        )
+        with open(caminho_saida, 'rb') as f:
+            return gravar_com_hash('app.css', f.read(), manifesto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build do CSS, das fontes locais e das imagens')
+    parser.add_argument('--tailwind', default=os.getenv('TAILWIND', 'npx tailwindcss'),
+                        help='comando do Tailwind CLI (padrão: npx tailwindcss)')
+    parser.add_argument('--node-modules', default=os.path.join(RAIZ, 'node_modules'))
+    args = parser.parse_args()
+
+    # Recomeça do zero para não acumular versões antigas
+    shutil.rmtree(SAIDA, ignore_errors=True)
+    os.makedirs(SAIDA)
+
+    manifesto = {}
+    fontes_css = construir_fontes(args.node_modules, manifesto)
+    nome_css = construir_css(fontes_css, shlex.split(args.tailwind), manifesto)
+    manifesto['imagens'] = construir_imagens(IMAGENS)
+    manifesto['comprimidos'] = comprimir_estaticos()
+
+    with open(os.path.join(SAIDA, MANIFESTO), 'w') as f:
+        json.dump(manifesto, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+    tamanho = os.path.getsize(os.path.join(SAIDA, nome_css))
+    print(f'CSS: dist/{nome_css} ({tamanho / 1024:.1f} KB), {len(manifesto) - 3} fontes')
+    for nome, imagem in manifesto['imagens'].items():
+        total = sum(len(v) for v in imagem['variantes'].values())
+        print(f'{nome}: {total} variantes ({", ".join(imagem["variantes"])})')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
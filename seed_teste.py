@@ -77,11 +77,12 @@ EVENTOS = [
 # ---------------------------------------------------------------------------
 
 def seed():
-    from app import create_app, db
+    from app import create_app, db, inicializar_banco
     from app.models import Garcom, Evento, Escala
 
     app = create_app()
     with app.app_context():
+        inicializar_banco(app)
         print("\n=== SEED: Criando dados de teste ===\n")
 
         # --- Garcons ---
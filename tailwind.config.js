@@ -0,0 +1,16 @@
+/** Build do CSS (scripts/construir_assets.py): só entram as classes usadas nos templates e no Python */
+module.exports = {
+  content: [
+    './app/templates/**/*.html',
+    './app/**/*.py',  // classes de badges montadas no backend (ex.: BADGES_EVENTO)
+  ],
+  theme: {
+    extend: {
+      fontFamily: {
+        display: ['"Playfair Display"', 'serif'],
+        body: ['Inter', 'sans-serif'],
+      },
+    },
+  },
+  plugins: [],
+}
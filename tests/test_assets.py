@@ -0,0 +1,147 @@
+"""
+Testes dos estáticos gerados pelo build (CSS, fontes e imagens).
+
+Cobre:
+  - Templates usando o CSS do manifesto (e o CDN apenas sem build)
+  - Cache imutável dos arquivos com hash no nome
+  - Imagens responsivas (<picture> com AVIF/WebP e srcset)
+  - Script de build: nomes com hash, manifesto, @font-face e variantes das imagens
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+from app.services.assets import carregar_manifesto
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def static_com_build(app, tmp_path):
+    """Pasta static com um build mínimo (CSS + manifesto)"""
+    dist = tmp_path / 'dist'
+    (dist / 'fonts').mkdir(parents=True)
+    (dist / 'app.0123456789.css').write_text('body{margin:0}')
+    (dist / 'fonts' / 'inter-latin-400-normal.abcdef0123.woff2').write_bytes(b'wOF2')
+    manifesto = {
+        'app.css': 'dist/app.0123456789.css',
+        'fonts/inter-latin-400-normal.woff2': 'dist/fonts/inter-latin-400-normal.abcdef0123.woff2',
+    }
+    manifesto['imagens'] = {
+        'img/primoriconMENOR.jpg': {
+            'largura': 1080, 'altura': 1080,
+            'variantes': {
+                formato: {str(l): f'dist/img/primoriconMENOR-{l}w.h.{ext}' for l in (80, 160, 240, 1080)}
+                for formato, ext in (('avif', 'avif'), ('webp', 'webp'), ('jpeg', 'jpg'))
+            },
+        },
+    }
+    (dist / 'manifest.json').write_text(json.dumps(manifesto))
+
+    app.static_folder = str(tmp_path)
+    app.extensions['assets_manifesto'] = carregar_manifesto(app)
+    return tmp_path
+
+
+class TestAssets:
+
+    def test_sem_build_usa_cdn(self, client):
+        html = client.get('/login').get_data(as_text=True)
+
+        assert 'cdn.tailwindcss.com' in html
+
+    def test_com_build_usa_css_local(self, client, static_com_build):
+        html = client.get('/login').get_data(as_text=True)
+
+        assert 'href="/static/dist/app.0123456789.css"' in html
+        assert 'rel="preload"' in html
+        assert 'cdn.tailwindcss.com' not in html
+        assert 'fonts.googleapis.com' not in html
+
+    def test_logo_sem_build_usa_original(self, client):
+        html = client.get('/login').get_data(as_text=True)
+
+        assert 'src="/static/img/primoriconMENOR.jpg"' in html
+        assert '<picture>' not in html
+
+    def test_logo_responsivo_com_build(self, client, static_com_build):
+        html = client.get('/login').get_data(as_text=True)
+
+        assert '<source type="image/avif" srcset="/static/dist/img/primoriconMENOR-80w.h.avif 80w, ' in html
+        assert 'type="image/webp"' in html
+        # Exibido com 112px: o src padrão é a menor variante que cobre telas 2x
+        assert 'src="/static/dist/img/primoriconMENOR-240w.h.jpg"' in html
+        assert 'sizes="112px" width="112" height="112"' in html
+        assert 'primoriconMENOR.jpg"' not in html
+
+    def test_arquivos_com_hash_tem_cache_imutavel(self, client, static_com_build):
+        resp = client.get('/static/dist/app.0123456789.css')
+
+        assert resp.status_code == 200
+        assert resp.cache_control.immutable
+        assert resp.cache_control.max_age == 365 * 24 * 3600
+        assert not resp.cache_control.no_cache
+
+    def test_outros_estaticos_sem_cache_imutavel(self, client):
+        resp = client.get('/static/img/logo-small.png')
+
+        assert resp.status_code == 200
+        assert not resp.cache_control.immutable
+
+
+class TestScriptBuild:
+
+    @pytest.fixture
+    def script(self, tmp_path, monkeypatch):
+        spec = importlib.util.spec_from_file_location(
+            'construir_assets', os.path.join(RAIZ, 'scripts', 'construir_assets.py')
+        )
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        monkeypatch.setattr(modulo, 'SAIDA', str(tmp_path / 'dist'))
+        return modulo
+
+    def test_build_grava_arquivos_com_hash_e_manifesto(self, script, tmp_path, monkeypatch):
+        node_modules = tmp_path / 'node_modules'
+        for pacote, (_, pesos) in script.FONTES.items():
+            arquivos = node_modules / '@fontsource' / pacote / 'files'
+            arquivos.mkdir(parents=True)
+            for peso in pesos:
+                (arquivos / f'{pacote}-latin-{peso}-normal.woff2').write_bytes(f'{pacote}{peso}'.encode())
+
+        imagens = tmp_path / 'img'
+        imagens.mkdir()
+        Image.new('RGB', (300, 150), 'gold').save(imagens / 'logo.png')
+        Image.new('RGB', (100, 100), 'black').save(imagens / 'icone.jpg')
+        (imagens / 'leia-me.txt').write_text('ignorado')
+        monkeypatch.setattr(script, 'IMAGENS', str(imagens))
+
+        # Tailwind falso: copia a entrada (-i) para a saída (-o)
+        copia = f'{sys.executable} -c "import shutil,sys; a=sys.argv; shutil.copy(a[a.index(\'-i\')+1], a[a.index(\'-o\')+1])"'
+        monkeypatch.setattr(sys, 'argv', ['construir_assets.py', '--tailwind', copia, '--node-modules', str(node_modules)])
+
+        script.main()
+
+        dist = tmp_path / 'dist'
+        manifesto = json.loads((dist / 'manifest.json').read_text())
+        assert len(manifesto) == 3 + sum(len(p) for _, p in script.FONTES.values())
+        css = (dist / manifesto['app.css'].removeprefix('dist/')).read_text()
+        fonte = manifesto['fonts/inter-latin-400-normal.woff2'].removeprefix('dist/')
+        assert f'url({fonte})' in css
+        assert "font-family:'Playfair Display'" in css
+        assert '@tailwind utilities' in css
+
+        logo = manifesto['imagens']['img/logo.png']
+        assert (logo['largura'], logo['altura']) == (300, 150)
+        assert list(logo['variantes']['png']) == ['80', '160', '240', '300']
+        assert 'webp' in logo['variantes']
+        arquivo = dist / logo['variantes']['webp']['160'].removeprefix('dist/')
+        assert Image.open(arquivo).size == (160, 80)
+        assert list(manifesto['imagens']['img/icone.jpg']['variantes']['jpeg']) == ['80', '100']
+        assert set(manifesto['imagens']) == {'img/logo.png', 'img/icone.jpg'}
+        assert manifesto['comprimidos'][manifesto['app.css']] == ['br', 'gzip']
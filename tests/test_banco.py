@@ -0,0 +1,170 @@
+"""
+Testes do perfil do banco por rota.
+
+Cobre:
+  - Opções de engine de produção (pool, pre-ping, timeouts)
+  - statement_timeout escolhido pelo endpoint e aplicado com SET LOCAL,
+    só em requisições (comandos `flask` rodam sem limite)
+  - Leituras de relatórios e dashboard na réplica; escritas, jobs e
+    confirmação no primário
+"""
+
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import create_app, db
+from app.config import ProductionConfig, TestingConfig
+from app.models import Escala, Evento, Garcom, User
+from app.services.banco import _aplicar_timeout, timeout_da_rota, usa_replica
+
+
+def _conexao(dialeto, executados):
+    return SimpleNamespace(dialect=SimpleNamespace(name=dialeto), exec_driver_sql=executados.append)
+
+
+class TestPerfil:
+
+    def test_producao(self):
+        opcoes = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+
+        assert opcoes['pool_pre_ping'] is True
+        assert opcoes['pool_recycle'] > 0
+        assert 'idle_in_transaction_session_timeout=' in opcoes['connect_args']['options']
+        assert '-c statement_timeout=' not in opcoes['connect_args']['options']  # só nas requisições
+
+    def test_timeout_pelo_prefixo_mais_longo(self):
+        timeouts = {'relatorios.': 60000, 'relatorios.geral_pdf': 120000, 'dashboard.index': 15000}
+
+        assert timeout_da_rota('relatorios.geral_pdf', timeouts) == 120000
+        assert timeout_da_rota('relatorios.evento_pdf', timeouts) == 60000
+        assert timeout_da_rota('dashboard.index', timeouts) == 15000
+        assert timeout_da_rota('eventos.index', timeouts) is None
+
+    def test_set_local_somente_no_postgresql(self, app):
+        executados = []
+
+        with app.test_request_context('/relatorios/'):
+            app.preprocess_request()
+            _aplicar_timeout(None, None, _conexao('sqlite', executados))
+            _aplicar_timeout(None, None, _conexao('postgresql', executados))
+
+        assert executados == ['SET LOCAL statement_timeout = 60000']
+
+    def test_demais_rotas_com_o_padrao(self, app):
+        executados = []
+
+        with app.test_request_context('/eventos/'):
+            app.preprocess_request()
+            _aplicar_timeout(None, None, _conexao('postgresql', executados))
+
+        assert executados == [f'SET LOCAL statement_timeout = {app.config["DB_STATEMENT_TIMEOUT_MS"]}']
+
+    def test_comandos_sem_timeout(self, app):
+        executados = []
+
+        _aplicar_timeout(None, None, _conexao('postgresql', executados))
+
+        assert executados == []
+
+    def test_rotas_da_replica(self):
+        config = {
+            'SQLALCHEMY_BINDS': {'replica': 'postgresql://replica/primor'},
+            'ROTAS_REPLICA': TestingConfig.ROTAS_REPLICA,
+            'ROTAS_SOMENTE_PRIMARIO': TestingConfig.ROTAS_SOMENTE_PRIMARIO,
+        }
+
+        assert usa_replica('relatorios.geral_pdf', 'GET', config)
+        assert usa_replica('dashboard.index', 'GET', config)
+        assert not usa_replica('relatorios.job_novo', 'POST', config)
+        assert not usa_replica('relatorios.job_status', 'GET', config)
+        assert not usa_replica('confirmacao.confirmar', 'GET', config)
+        assert not usa_replica('eventos.index', 'GET', config)
+        assert not usa_replica('dashboard.index', 'GET', {**config, 'SQLALCHEMY_BINDS': {}})
+
+
+@pytest.fixture
+def app_replica(tmp_path, monkeypatch):
+    """Primário em memória e réplica em arquivo, com dados diferentes"""
+    monkeypatch.setattr(
+        TestingConfig, 'SQLALCHEMY_BINDS', {'replica': f'sqlite:///{tmp_path / "replica.db"}'}, raising=False,
+    )
+    app = create_app('testing')
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+        for engine, nome in ((db.engine, 'Festa no Primário'), (db.engines['replica'], 'Festa na Réplica')):
+            with Session(engine) as sessao:
+                user = User(nome='Admin', email='admin@teste.com')
+                user.set_password('senha123')
+                sessao.add(user)
+                sessao.add(Evento(
+                    nome=nome, tipo='Festa', data=date.today() + timedelta(days=2),
+                    hora_inicio=time(19), local='Sede', valor_padrao=100,
+                ))
+                sessao.commit()
+        yield app
+        db.session.remove()
+    db.metadatas.pop('replica', None)  # o `db` é global: não deixar o bind para os outros testes
+
+
+@pytest.fixture
+def cliente_replica(app_replica):
+    client = app_replica.test_client()
+    client.post('/login', data={'email': 'admin@teste.com', 'password': 'senha123'})
+    return client
+
+
+class TestReplica:
+
+    def test_dashboard_le_da_replica(self, cliente_replica):
+        html = cliente_replica.get('/').get_data(as_text=True)
+
+        assert 'Festa na Réplica' in html
+        assert 'Festa no Primário' not in html
+
+    def test_dashboard_da_replica_fora_do_cache(self, cliente_replica, app_replica):
+        cliente_replica.get('/')
+        with Session(db.engines['replica']) as replica:
+            replica.query(Evento).update({'nome': 'Festa Replicada'})
+            replica.commit()
+
+        html = cliente_replica.get('/').get_data(as_text=True)
+
+        assert 'Festa Replicada' in html
+        assert 'painel_cache' not in app_replica.extensions
+
+    def test_telas_de_edicao_leem_do_primario(self, cliente_replica):
+        html = cliente_replica.get('/eventos/').get_data(as_text=True)
+
+        assert 'Festa no Primário' in html
+        assert 'Festa na Réplica' not in html
+
+    def test_confirmacao_no_primario(self, cliente_replica):
+        garcom = Garcom(nome='Joao Silva', email='joao@email.com', telefone='45999999001', idade=25)
+        db.session.add(garcom)
+        db.session.commit()
+        escala = Escala(evento_id=Evento.query.one().id, garcom_id=garcom.id, valor=100)
+        db.session.add(escala)
+        db.session.commit()
+
+        resp = cliente_replica.get(f'/confirmar/{escala.token}')
+
+        assert resp.status_code == 200
+        assert 'Festa no Primário' in resp.get_data(as_text=True)
+
+    def test_escrita_em_rota_de_leitura_vai_para_o_primario(self, app_replica):
+        with app_replica.test_request_context('/'):
+            app_replica.preprocess_request()
+            assert db.session.get_bind() is db.engines['replica']
+
+            db.session.add(Garcom(nome='Ana Costa', email='ana@email.com', telefone='45999999003', idade=22))
+            db.session.commit()
+
+        with Session(db.engine) as primario, Session(db.engines['replica']) as replica:
+            assert primario.query(Garcom).count() == 1
+            assert replica.query(Garcom).count() == 0
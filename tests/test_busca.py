@@ -0,0 +1,140 @@
+"""
+Testes da busca de garçons e eventos.
+
+Cobre:
+  - Normalização (acentos, maiúsculas, espaços)
+  - Índice atualizado ao criar, renomear e excluir
+  - Busca sem acentos pelo parâmetro `busca` das listagens
+  - Ordem por relevância e reconstrução do índice
+"""
+
+from datetime import date, time
+
+from app import db, inicializar_banco
+from app.models import Evento, Garcom, IndiceBusca
+from app.services.busca import buscar, normalizar, reconstruir_indice
+
+
+def _nomes(query):
+    return [registro.nome for registro in query.all()]
+
+
+def _garcom(nome):
+    chave = normalizar(nome).replace(' ', '.')
+    return Garcom(nome=nome, email=f'{chave}@email.com', telefone=chave[:20], idade=25, pix=chave)
+
+
+class TestNormalizacao:
+
+    def test_remove_acentos_e_maiusculas(self):
+        assert normalizar('  JOÃO   Conceição ') == 'joao conceicao'
+        assert normalizar(None) == ''
+
+
+class TestIndice:
+
+    def test_garcom_novo_e_indexado(self, garcons_padrao):
+        indice = IndiceBusca.query.filter_by(entidade='garcom', registro_id=garcons_padrao[0].id).one()
+
+        assert indice.texto == 'joao silva'
+
+    def test_renomear_atualiza_indice(self, garcons_padrao):
+        garcom = garcons_padrao[1]
+        garcom.nome = 'Márcia Antônia'
+        db.session.commit()
+
+        assert _nomes(buscar(Garcom.query, Garcom, 'marcia')) == ['Márcia Antônia']
+        assert _nomes(buscar(Garcom.query, Garcom, 'maria')) == []
+
+    def test_outros_campos_nao_reindexam(self, garcons_padrao):
+        antes = IndiceBusca.query.filter_by(registro_id=garcons_padrao[0].id).one().id
+        garcons_padrao[0].pix = 'novo@pix.com'
+        db.session.commit()
+
+        assert IndiceBusca.query.filter_by(registro_id=garcons_padrao[0].id).one().id == antes
+
+    def test_excluir_remove_do_indice(self, garcons_padrao):
+        garcom_id = garcons_padrao[3].id
+        db.session.delete(garcons_padrao[3])
+        db.session.commit()
+
+        assert IndiceBusca.query.filter_by(entidade='garcom', registro_id=garcom_id).count() == 0
+        assert _nomes(buscar(Garcom.query, Garcom, 'ana')) == []
+
+    def test_rollback_descarta_indice(self, app):
+        db.session.add(_garcom('Temporário'))
+        db.session.flush()
+        db.session.rollback()
+
+        assert IndiceBusca.query.count() == 0
+
+    def test_reconstruir(self, garcons_padrao, eventos_futuros):
+        db.session.execute(IndiceBusca.__table__.delete())
+        db.session.commit()
+
+        assert reconstruir_indice() == len(garcons_padrao) + len(eventos_futuros)
+        assert _nomes(buscar(Garcom.query, Garcom, 'joão')) == ['Joao Silva']
+
+    def test_inicializar_banco_preenche_indice_vazio(self, app, garcons_padrao):
+        db.session.execute(IndiceBusca.__table__.delete())
+        db.session.commit()
+
+        inicializar_banco(app)
+
+        assert IndiceBusca.query.filter_by(entidade='garcom').count() == len(garcons_padrao)
+
+
+class TestBusca:
+
+    def test_sem_acentos_nos_dois_sentidos(self, app):
+        db.session.add_all([_garcom('João Conceição'), _garcom('Joana')])
+        db.session.commit()
+
+        assert _nomes(buscar(Garcom.query, Garcom, 'conceicao')) == ['João Conceição']
+        assert _nomes(buscar(Garcom.query, Garcom, 'JOÃO')) == ['João Conceição']
+
+    def test_todas_as_palavras_por_prefixo(self, garcons_padrao):
+        assert _nomes(buscar(Garcom.query, Garcom, 'jo sil')) == ['Joao Silva']
+        assert _nomes(buscar(Garcom.query, Garcom, 'jo santos')) == []
+
+    def test_termo_sem_palavras_nao_encontra_nada(self, garcons_padrao):
+        assert _nomes(buscar(Garcom.query, Garcom, '"*')) == []
+
+    def test_mais_relevantes_primeiro(self, app):
+        db.session.add_all([
+            _garcom('Ana Maria Souza Lima Pereira'),
+            _garcom('Ana Souza'),
+        ])
+        db.session.commit()
+
+        # bm25 favorece o nome mais curto, em que a palavra pesa mais
+        assert _nomes(buscar(Garcom.query, Garcom, 'souza')) == ['Ana Souza', 'Ana Maria Souza Lima Pereira']
+
+    def test_entidades_separadas(self, app):
+        db.session.add(_garcom('Festa'))
+        db.session.add(Evento(nome='Festa Junina', tipo='Outro', data=date(2030, 6, 1), hora_inicio=time(20), local='Sede'))
+        db.session.commit()
+
+        assert _nomes(buscar(Evento.query, Evento, 'festa')) == ['Festa Junina']
+
+
+class TestRotasBusca:
+
+    def test_lista_de_garcons(self, logged_client, app):
+        db.session.add_all([_garcom('Sebastião Araújo'), _garcom('Pedro Lima')])
+        db.session.commit()
+
+        html = logged_client.get('/garcons/?busca=sebastiao').get_data(as_text=True)
+
+        assert 'Sebastião Araújo' in html
+        assert 'Pedro Lima' not in html
+        assert 'value="sebastiao"' in html
+
+    def test_lista_de_eventos(self, logged_client, eventos_futuros):
+        eventos_futuros[0].nome = 'Bodas de Ouro Conceição'
+        db.session.commit()
+
+        html = logged_client.get('/eventos/?busca=CONCEICAO&filtro=todos').get_data(as_text=True)
+
+        assert 'Bodas de Ouro Conceição' in html
+        assert eventos_futuros[1].nome not in html
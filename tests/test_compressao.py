@@ -0,0 +1,130 @@
+"""
+Testes da compressão das respostas.
+
+Cobre:
+  - Escolha entre brotli e gzip pelo Accept-Encoding
+  - Limite de tamanho, tipos comprimíveis e Vary
+  - Versões .br/.gz pré-comprimidas dos estáticos do build
+"""
+
+import gzip
+import json
+
+import brotli
+import pytest
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from app.services.assets import carregar_manifesto
+from app.services.compressao import escolher_codificacao
+
+
+def _aceitas(valor):
+    return parse_accept_header(valor, Accept)
+
+
+class TestEscolha:
+
+    @pytest.mark.parametrize('cabecalho, esperado', [
+        ('gzip, deflate, br', 'br'),
+        ('gzip', 'gzip'),
+        ('br;q=0.5, gzip', 'gzip'),
+        ('identity', None),
+        ('br;q=0, gzip;q=0', None),
+    ])
+    def test_accept_encoding(self, cabecalho, esperado):
+        assert escolher_codificacao(_aceitas(cabecalho), ('br', 'gzip')) == esperado
+
+    def test_sem_brotli_usa_gzip(self):
+        assert escolher_codificacao(_aceitas('br, gzip'), ('gzip',)) == 'gzip'
+
+
+class TestCompressaoRespostas:
+
+    def test_html_em_brotli(self, logged_client, escalas_pendentes, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}'
+        resp = logged_client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+
+        assert resp.headers['Content-Encoding'] == 'br'
+        assert 'Accept-Encoding' in resp.headers['Vary']
+        html = brotli.decompress(resp.data).decode()
+        assert 'Joao Silva' in html
+        assert int(resp.headers['Content-Length']) == len(resp.data)
+
+    def test_html_em_gzip(self, logged_client, garcons_padrao):
+        resp = logged_client.get('/garcons/', headers={'Accept-Encoding': 'gzip'})
+
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert 'Maria Santos' in gzip.decompress(resp.data).decode()
+
+    def test_sem_accept_encoding_nao_comprime(self, logged_client, garcons_padrao):
+        resp = logged_client.get('/garcons/')
+
+        assert 'Content-Encoding' not in resp.headers
+        assert 'Accept-Encoding' in resp.headers['Vary']
+
+    def test_abaixo_do_limite_nao_comprime(self, app, logged_client, garcons_padrao):
+        app.config['COMPRESSAO_MIN_BYTES'] = 10 ** 7
+
+        resp = logged_client.get('/garcons/', headers={'Accept-Encoding': 'br'})
+
+        assert 'Content-Encoding' not in resp.headers
+
+    def test_pdf_nao_comprime(self, logged_client, escalas_pendentes, eventos_futuros):
+        resp = logged_client.get(f'/relatorios/evento/{eventos_futuros[0].id}/pdf',
+                                 headers={'Accept-Encoding': 'gzip, br'})
+
+        assert resp.status_code == 200
+        assert 'Content-Encoding' not in resp.headers
+        assert resp.data.startswith(b'%PDF')
+
+    def test_304_continua_sem_corpo(self, logged_client, garcons_padrao):
+        primeiro = logged_client.get('/garcons/', headers={'Accept-Encoding': 'br'})
+
+        resp = logged_client.get('/garcons/', headers={
+            'Accept-Encoding': 'br', 'If-None-Match': primeiro.headers['ETag'],
+        })
+
+        assert resp.status_code == 304
+        assert 'Content-Encoding' not in resp.headers
+
+
+class TestEstaticosPreComprimidos:
+
+    @pytest.fixture
+    def static_comprimido(self, app, tmp_path):
+        css = b'body{margin:0}' * 200
+        dist = tmp_path / 'dist'
+        dist.mkdir()
+        (dist / 'app.0123456789.css').write_bytes(css)
+        (dist / 'app.0123456789.css.br').write_bytes(brotli.compress(css))
+        (dist / 'app.0123456789.css.gz').write_bytes(gzip.compress(css))
+        (dist / 'manifest.json').write_text(json.dumps({
+            'app.css': 'dist/app.0123456789.css',
+            'comprimidos': {'dist/app.0123456789.css': ['br', 'gzip']},
+        }))
+        app.static_folder = str(tmp_path)
+        app.extensions['assets_manifesto'] = carregar_manifesto(app)
+        return css
+
+    def test_serve_versao_brotli(self, client, static_comprimido):
+        resp = client.get('/static/dist/app.0123456789.css', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert resp.status_code == 200
+        assert resp.headers['Content-Encoding'] == 'br'
+        assert resp.mimetype == 'text/css'
+        assert 'Accept-Encoding' in resp.headers['Vary']
+        assert resp.cache_control.immutable
+        assert brotli.decompress(resp.data) == static_comprimido
+
+    def test_serve_versao_gzip(self, client, static_comprimido):
+        resp = client.get('/static/dist/app.0123456789.css', headers={'Accept-Encoding': 'gzip'})
+
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(resp.data) == static_comprimido
+
+    def test_sem_accept_encoding_serve_original(self, client, static_comprimido):
+        resp = client.get('/static/dist/app.0123456789.css')
+
+        assert 'Content-Encoding' not in resp.headers
+        assert resp.data == static_comprimido
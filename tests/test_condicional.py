@@ -0,0 +1,110 @@
+"""
+Testes do GET condicional das páginas de listagem e detalhe.
+
+Cobre:
+  - ETag fraco e Last-Modified nas respostas
+  - 304 sem executar a view quando nada mudou
+  - Mudanças em eventos, garçons e escalas geram nova página
+  - Sondagem por chave/índice: detalhe restrito ao evento, listagens sem
+    agregados sobre as tabelas
+"""
+
+import pytest
+
+from app import db
+from tests.test_dashboard import contar_consultas
+
+
+def _revalidar(client, url, resp):
+    return client.get(url, headers={'If-None-Match': resp.headers['ETag']})
+
+
+class TestPaginaCondicional:
+
+    @pytest.mark.parametrize('url', ['/eventos/', '/garcons/', '/relatorios/'])
+    def test_listagens_respondem_304(self, logged_client, escalas_pendentes, url):
+        resp = logged_client.get(url)
+
+        assert resp.status_code == 200
+        assert resp.headers['ETag'].startswith('W/')
+        assert 'Last-Modified' in resp.headers
+        assert _revalidar(logged_client, url, resp).status_code == 304
+
+    def test_304_sem_consultas_da_view(self, logged_client, escalas_pendentes, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}'
+        resp = logged_client.get(url)
+
+        with contar_consultas() as consultas:
+            assert _revalidar(logged_client, url, resp).status_code == 304
+
+        assert len(consultas) <= 2  # usuário logado + sondagem
+
+    def test_mudanca_em_escala_gera_nova_pagina(self, logged_client, escalas_pendentes, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}'
+        resp = logged_client.get(url)
+
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.commit()
+
+        assert _revalidar(logged_client, url, resp).status_code == 200
+
+    def test_escrita_em_outro_evento_mantem_o_detalhe(self, logged_client, escalas_pendentes, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}'
+        resp = logged_client.get(url)
+
+        eventos_futuros[1].local = 'Outro salão'
+        db.session.commit()
+
+        assert _revalidar(logged_client, url, resp).status_code == 304
+
+    def test_garcom_escalado_renomeado_gera_novo_detalhe(self, logged_client, escalas_pendentes, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}'
+        resp = logged_client.get(url)
+
+        escalas_pendentes[0].garcom.nome = 'Joao Renomeado'
+        db.session.commit()
+
+        assert _revalidar(logged_client, url, resp).status_code == 200
+
+    def test_exclusao_gera_nova_listagem(self, logged_client, eventos_futuros):
+        resp = logged_client.get('/eventos/')
+
+        db.session.delete(eventos_futuros[2])
+        db.session.commit()
+
+        assert _revalidar(logged_client, '/eventos/', resp).status_code == 200
+
+    @pytest.mark.parametrize('url', ['/eventos/', '/garcons/', '/relatorios/'])
+    def test_listagens_sem_agregados_nas_tabelas(self, logged_client, escalas_pendentes, url):
+        resp = logged_client.get(url)
+
+        with contar_consultas() as consultas:
+            assert _revalidar(logged_client, url, resp).status_code == 304
+
+        sondagem = consultas[-1][2].lower()
+        assert 'count(' not in sondagem
+        assert 'from escalas' not in sondagem
+
+    def test_mudanca_em_garcom_gera_nova_pagina(self, logged_client, garcons_padrao):
+        resp = logged_client.get('/garcons/')
+
+        garcons_padrao[0].pix = 'novo@pix.com'
+        db.session.commit()
+
+        assert _revalidar(logged_client, '/garcons/', resp).status_code == 200
+
+    def test_filtros_tem_etags_diferentes(self, logged_client, eventos_futuros):
+        todos = logged_client.get('/eventos/')
+        proximos = logged_client.get('/eventos/?filtro=proximos')
+
+        assert todos.headers['ETag'] != proximos.headers['ETag']
+
+    def test_flash_pendente_nao_e_condicional(self, logged_client, garcons_padrao):
+        resp = logged_client.get('/garcons/')
+        logged_client.post(f'/garcons/{garcons_padrao[0].id}/toggle-ativo')
+
+        html = logged_client.get('/garcons/', headers={'If-None-Match': resp.headers['ETag']})
+
+        assert html.status_code == 200
+        assert 'inativado com sucesso' in html.get_data(as_text=True)
+        assert 'ETag' not in html.headers
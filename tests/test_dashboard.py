@@ -0,0 +1,119 @@
+"""
+Testes das estatísticas do dashboard.
+
+Cobre:
+  - Totais e próximos eventos; total do mês lido do resumo mensal
+  - Cache no processo validado pela versão (commits deste e de outros workers)
+"""
+
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Evento, ResumoMensal
+from app.services.dashboard import obter_painel, consultar_painel
+from app.services.elenco import incrementar_versao
+from app.services.resumos import reconstruir_resumos
+
+
+@contextmanager
+def contar_consultas():
+    consultas = []
+
+    def contar(*args):
+        consultas.append(args)
+
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        yield consultas
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+
+
+class TestPainel:
+
+    def test_totais_e_proximos_eventos(self, app, escalas_pendentes, eventos_futuros):
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.commit()
+
+        painel = consultar_painel(date.today())
+
+        assert painel.pendentes == 3
+        assert painel.total_confirmados == 1
+        assert painel.eventos_hoje == 0
+        assert [e.id for e in painel.proximos_eventos] == [e.id for e in eventos_futuros]
+        primeiro = painel.proximos_eventos[0]
+        assert (primeiro.total_garcons, primeiro.total_confirmados) == (4, 1)
+        assert primeiro.status_badge[1] == 'Planejado'
+
+    def test_duas_consultas(self, app, escalas_pendentes):
+        with contar_consultas() as consultas:
+            consultar_painel(date.today())
+
+        assert len(consultas) == 2  # eventos a partir de hoje e resumo do mês
+
+    def test_total_do_mes_vem_do_resumo(self, app, eventos_futuros):
+        hoje = date.today()
+        esperado = sum(1 for e in eventos_futuros if (e.data.year, e.data.month) == (hoje.year, hoje.month))
+        ResumoMensal.query.delete()
+        db.session.commit()
+
+        assert consultar_painel(hoje).total_eventos_mes == 0
+        reconstruir_resumos()
+        assert consultar_painel(hoje).total_eventos_mes == esperado
+
+    def test_sem_eventos(self, app):
+        painel = consultar_painel(date.today())
+        assert painel.proximos_eventos == ()
+        assert painel.pendentes == 0
+
+    def test_dashboard_renderiza_sem_consultas_por_evento(self, logged_client, escalas_pendentes):
+        logged_client.get('/')  # aquece o cache
+
+        with contar_consultas() as consultas:
+            resp = logged_client.get('/')
+
+        assert resp.status_code == 200
+        assert 'Casamento Silva' in resp.get_data(as_text=True)
+        assert len(consultas) <= 2  # usuário logado e versão do painel
+
+
+class TestCachePainel:
+
+    def test_segunda_leitura_vem_do_cache(self, app, escalas_pendentes):
+        primeiro = obter_painel()
+
+        with contar_consultas() as consultas:
+            assert obter_painel() is primeiro
+
+        assert len(consultas) == 1  # só a versão
+
+    def test_commit_em_escala_invalida(self, app, escalas_pendentes):
+        assert obter_painel().pendentes == 4
+
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.commit()
+
+        assert obter_painel().pendentes == 3
+
+    def test_commit_em_evento_antigo_nao_invalida(self, app, escalas_pendentes):
+        primeiro = obter_painel()
+
+        db.session.add(Evento(
+            nome='Evento Antigo', tipo='Casamento', data=date.today().replace(day=1) - timedelta(days=40),
+            hora_inicio=time(19, 0), local='Salão', status='realizado'
+        ))
+        db.session.commit()
+
+        assert obter_painel() is primeiro
+
+    def test_escrita_de_outro_worker_invalida(self, app, escalas_pendentes):
+        primeiro = obter_painel()
+
+        # Outro worker gravou: só o contador no banco mudou, o cache local não foi descartado
+        with db.engine.begin() as conexao:
+            incrementar_versao(conexao, 'painel')
+
+        assert obter_painel() is not primeiro
@@ -0,0 +1,88 @@
+"""
+Testes do elenco de garçons em cache (app/services/elenco.py).
+
+Cobre:
+  - Registros compactos e ordenados dos garçons ativos
+  - Cache no processo conferido pela versão no banco
+  - Invalidação nas escritas (rotas de garçons) e entre workers
+"""
+
+from app import db
+from app.services.elenco import (
+    GarcomResumo, garcons_ativos, incrementar_versao, versao_atual,
+)
+from tests.test_dashboard import contar_consultas
+
+
+class TestElenco:
+
+    def test_registros_ativos_por_nome(self, app, garcons_padrao):
+        garcons_padrao[1].ativo = False
+        db.session.commit()
+
+        elenco = garcons_ativos()
+
+        assert [g.nome for g in elenco] == ['Ana Costa', 'Carlos Oliveira', 'Joao Silva']
+        assert elenco[2] == GarcomResumo(garcons_padrao[0].id, 'Joao Silva', '45999999001', 'JS')
+
+    def test_cache_so_confere_versao(self, app, garcons_padrao):
+        primeiro = garcons_ativos()
+
+        with contar_consultas() as consultas:
+            assert garcons_ativos() is primeiro
+
+        assert len(consultas) == 1
+        assert 'versoes_cache' in consultas[0][2]
+
+    def test_escrita_incrementa_versao(self, app, garcons_padrao):
+        antes = versao_atual()
+
+        garcons_padrao[0].telefone = '45988887777'
+        db.session.commit()
+
+        assert versao_atual() == antes + 1
+
+    def test_alteracao_fora_do_elenco_nao_invalida(self, app, garcons_padrao):
+        primeiro = garcons_ativos()
+
+        garcons_padrao[0].pix = 'outro@pix.com'
+        db.session.commit()
+
+        assert garcons_ativos() is primeiro
+
+    def test_rollback_nao_incrementa(self, app, garcons_padrao):
+        antes = versao_atual()
+
+        garcons_padrao[0].nome = 'Outro Nome'
+        db.session.flush()
+        db.session.rollback()
+
+        assert versao_atual() == antes
+
+    def test_escrita_de_outro_worker_invalida(self, app, garcons_padrao):
+        primeiro = garcons_ativos()
+
+        # Outro processo altera o garçom diretamente e incrementa a versão
+        with db.engine.begin() as conexao:
+            conexao.exec_driver_sql("UPDATE garcons SET nome = 'Joana Silva' WHERE nome = 'Joao Silva'")
+            incrementar_versao(conexao)
+
+        elenco = garcons_ativos()
+        assert elenco is not primeiro
+        assert 'Joana Silva' in [g.nome for g in elenco]
+
+
+class TestRotasElenco:
+
+    def test_inativar_remove_do_modal(self, logged_client, garcons_padrao, eventos_futuros):
+        url = f'/eventos/{eventos_futuros[0].id}/garcons-disponiveis'
+        assert 'Maria Santos' in [g['nome'] for g in logged_client.get(url).get_json()['garcons']]
+
+        logged_client.post(f'/garcons/{garcons_padrao[1].id}/toggle-ativo', follow_redirects=True)
+
+        assert 'Maria Santos' not in [g['nome'] for g in logged_client.get(url).get_json()['garcons']]
+
+    def test_escalados_nao_aparecem_no_modal(self, logged_client, escalas_pendentes, eventos_futuros):
+        data = logged_client.get(f'/eventos/{eventos_futuros[0].id}/garcons-disponiveis').get_json()
+
+        assert data['garcons'] == []
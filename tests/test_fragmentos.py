@@ -0,0 +1,93 @@
+"""
+Testes do cache de fragmentos de template (tag {% cache %}).
+
+Cobre:
+  - Reaproveitamento das linhas de garçons e eventos já renderizadas
+  - Nova renderização quando o registro ou as suas escalas mudam
+  - Token CSRF da requisição atual em fragmentos compartilhados
+  - LRU limitado
+"""
+
+import re
+
+from app import db
+from app.services.fragmentos import CacheFragmentos, obter_cache_fragmentos
+from tests.test_dashboard import contar_consultas
+
+
+def _tokens(html):
+    return set(re.findall(r'name="csrf_token" value="([^"]+)"', html))
+
+
+def _get(app, client, url):
+    # Contexto novo por requisição, como no servidor (o `g` da fixture é compartilhado)
+    with app.app_context():
+        return client.get(url).get_data(as_text=True)
+
+
+def _login(app, admin_user):
+    client = app.test_client()
+    token, = _tokens(_get(app, client, '/login'))
+    with app.app_context():
+        client.post('/login', data={'email': admin_user.email, 'password': 'senha123', 'csrf_token': token})
+    return client
+
+
+class TestFragmentos:
+
+    def test_linhas_de_garcons_ficam_em_cache(self, logged_client, garcons_padrao):
+        logged_client.get('/garcons/')
+
+        assert len(obter_cache_fragmentos()) == len(garcons_padrao)
+
+        logged_client.get('/garcons/?busca=Silva')
+        assert len(obter_cache_fragmentos()) == len(garcons_padrao)
+
+    def test_garcom_alterado_e_renderizado_de_novo(self, logged_client, garcons_padrao):
+        logged_client.get('/garcons/')
+
+        garcons_padrao[0].nome = 'Joao <b>Novo</b>'
+        db.session.commit()
+        html = logged_client.get('/garcons/').get_data(as_text=True)
+
+        assert 'Joao &lt;b&gt;Novo&lt;/b&gt;' in html
+        assert len(obter_cache_fragmentos()) == len(garcons_padrao) + 1
+
+    def test_totais_so_dos_garcons_listados(self, logged_client, garcons_padrao, escalas_pendentes):
+        maria, = [g for g in garcons_padrao if g.nome == 'Maria Santos']
+
+        with contar_consultas() as consultas:
+            html = logged_client.get('/garcons/?busca=Maria').get_data(as_text=True)
+
+        assert 'Maria Santos' in html
+        totais, = [c for c in consultas if 'FROM escalas' in c[2] and 'GROUP BY' in c[2]]
+        assert list(totais[3]) == [maria.id]
+
+    def test_escala_alterada_renderiza_linha_do_evento(self, logged_client, escalas_pendentes):
+        assert '0 ✓' in logged_client.get('/eventos/').get_data(as_text=True)
+
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.commit()
+
+        assert '1 ✓' in logged_client.get('/eventos/').get_data(as_text=True)
+
+    def test_token_csrf_da_requisicao_atual(self, app, admin_user, garcons_padrao):
+        app.config['WTF_CSRF_ENABLED'] = True
+        primeiro = _login(app, admin_user)
+        segundo = _login(app, admin_user)
+
+        tokens_primeiro = _tokens(_get(app, primeiro, '/garcons/'))
+        tokens_segundo = _tokens(_get(app, segundo, '/garcons/'))
+
+        assert len(tokens_primeiro) == len(tokens_segundo) == 1
+        assert tokens_primeiro != tokens_segundo
+
+    def test_lru_limitado(self):
+        cache = CacheFragmentos(max_itens=2)
+        cache.put('a', '1')
+        cache.put('b', '2')
+        cache.get('a')
+        cache.put('c', '3')
+
+        assert cache.get('b') is None
+        assert (cache.get('a'), cache.get('c')) == ('1', '3')
@@ -0,0 +1,102 @@
+"""
+Testes da busca de garçons do modal de escalação (JSON paginado).
+
+Cobre:
+  - Apenas ativos e fora do evento, em páginas (do elenco em cache sem busca)
+  - Busca sem acentos pelo nome
+  - Marcação de conflito de horário com outros eventos do dia
+  - Página de detalhe sem a lista de garçons embutida
+"""
+
+from datetime import date, time, timedelta
+
+from app import db
+from app.models import Escala, Evento, Garcom
+from app.routes.eventos import GARCONS_POR_PAGINA
+from tests.test_dashboard import contar_consultas
+
+
+def _url(evento, **params):
+    consulta = '&'.join(f'{k}={v}' for k, v in params.items())
+    return f'/eventos/{evento.id}/garcons-disponiveis?{consulta}'
+
+
+def _evento(nome, inicio, fim, data=None):
+    return Evento(
+        nome=nome, tipo='Festa', data=data or date.today() + timedelta(days=1),
+        hora_inicio=inicio, hora_fim=fim, local='Local', valor_padrao=100, status='planejado',
+    )
+
+
+class TestGarconsDisponiveis:
+
+    def test_lista_ativos_fora_do_evento(self, logged_client, garcons_padrao, eventos_futuros):
+        evento = eventos_futuros[0]
+        garcons_padrao[1].ativo = False
+        db.session.add(Escala(evento_id=evento.id, garcom_id=garcons_padrao[0].id, valor=100))
+        db.session.commit()
+
+        data = logged_client.get(_url(evento)).get_json()
+
+        assert [g['nome'] for g in data['garcons']] == ['Ana Costa', 'Carlos Oliveira']
+        assert data['proxima'] is None
+        assert all(g['disponivel'] and g['conflitos'] == [] for g in data['garcons'])
+
+    def test_paginado(self, logged_client, eventos_futuros):
+        total = GARCONS_POR_PAGINA + 5
+        db.session.add_all(
+            Garcom(nome=f'Garçom {i:03d}', email=f'g{i}@email.com', telefone=f'459990{i:05d}', idade=30)
+            for i in range(total)
+        )
+        db.session.commit()
+
+        primeira = logged_client.get(_url(eventos_futuros[0])).get_json()
+        segunda = logged_client.get(_url(eventos_futuros[0], pagina=primeira['proxima'])).get_json()
+
+        assert len(primeira['garcons']) == GARCONS_POR_PAGINA
+        assert primeira['proxima'] == 2
+        assert len(segunda['garcons']) == 5
+        assert segunda['proxima'] is None
+        nomes = [g['nome'] for g in primeira['garcons'] + segunda['garcons']]
+        assert nomes == sorted(nomes) and len(set(nomes)) == total
+
+    def test_busca_sem_acentos(self, logged_client, garcons_padrao, eventos_futuros):
+        data = logged_client.get(_url(eventos_futuros[0], busca='JOÃO')).get_json()
+
+        assert [g['nome'] for g in data['garcons']] == ['Joao Silva']
+
+    def test_marca_conflito_de_horario(self, logged_client, garcons_padrao):
+        outro = _evento('Evento A', time(18, 0), time(22, 0))
+        evento = _evento('Evento B', time(20, 0), time(23, 0))
+        db.session.add_all([outro, evento])
+        db.session.commit()
+        db.session.add(Escala(evento_id=outro.id, garcom_id=garcons_padrao[0].id, valor=100))
+        db.session.commit()
+
+        garcons = {g['nome']: g for g in logged_client.get(_url(evento)).get_json()['garcons']}
+
+        assert garcons['Joao Silva']['disponivel'] is False
+        assert garcons['Joao Silva']['conflitos'] == ['Evento A (18:00 - 22:00)']
+        assert garcons['Maria Santos']['disponivel'] is True
+
+    def test_consultas_nao_crescem_com_o_elenco(self, logged_client, eventos_futuros):
+        db.session.add_all(
+            Garcom(nome=f'Garçom {i:03d}', email=f'g{i}@email.com', telefone=f'459990{i:05d}', idade=30)
+            for i in range(200)
+        )
+        db.session.commit()
+
+        logged_client.get(_url(eventos_futuros[0]))  # aquece o elenco
+
+        with contar_consultas() as consultas:
+            logged_client.get(_url(eventos_futuros[0], pagina=3))
+
+        # usuário da sessão, evento, versão do elenco, escalados e conflitos da página
+        assert len(consultas) <= 5
+        assert not any('FROM garcons' in consulta[2] for consulta in consultas)
+
+    def test_detalhe_nao_embute_o_elenco(self, logged_client, garcons_padrao, eventos_futuros):
+        html = logged_client.get(f'/eventos/{eventos_futuros[0].id}').get_data(as_text=True)
+
+        assert 'Maria Santos' not in html
+        assert f'/eventos/{eventos_futuros[0].id}/garcons-disponiveis' in html
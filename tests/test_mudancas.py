@@ -0,0 +1,122 @@
+"""
+Testes da atualização ao vivo do detalhe do evento.
+
+Cobre:
+  - Feed de mudanças alimentado pelas alterações das escalas
+  - Endpoint do feed com cursor (responde na hora)
+  - Poda dos registros antigos
+  - Status de entrega do WhatsApp recebidos pelo webhook
+"""
+
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import EscalaMudanca
+from app.services.mudancas import podar_mudancas, registrar_envio
+
+
+def _webhook_status(msg_id, status):
+    return {
+        'object': 'whatsapp_business_account',
+        'entry': [{'changes': [{
+            'field': 'messages',
+            'value': {'statuses': [{'id': msg_id, 'status': status, 'recipient_id': '5545999999001'}]},
+        }]}],
+    }
+
+
+class TestFeedMudancas:
+
+    def test_criar_escalas_registra_adicionadas(self, app, escalas_pendentes):
+        evento_id = escalas_pendentes[0].evento_id
+        mudancas = EscalaMudanca.query.filter_by(evento_id=evento_id).all()
+
+        assert len(mudancas) == len(escalas_pendentes)
+        assert {m.tipo for m in mudancas} == {'adicionada'}
+        assert {m.escala_id for m in mudancas} == {e.id for e in escalas_pendentes}
+
+    def test_confirmacao_aparece_no_feed(self, client, logged_client, escalas_pendentes):
+        escala = escalas_pendentes[0]
+        url = f'/eventos/{escala.evento_id}/mudancas'
+        cursor = logged_client.get(url).get_json()['cursor']
+
+        client.get(f'/confirmar/escala-{escala.evento_id}-{escala.garcom_id}')
+
+        data = logged_client.get(f'{url}?desde={cursor}').get_json()
+        assert data['cursor'] > cursor
+        assert data['mudancas'] == [{
+            'id': data['cursor'],
+            'escala_id': escala.id,
+            'garcom_id': escala.garcom_id,
+            'tipo': 'status',
+            'status': 'confirmado',
+        }]
+        assert data['totais']['confirmado'] == 1
+        assert data['totais']['pendente'] == len(escalas_pendentes) - 1
+        assert data['totais']['total'] == len(escalas_pendentes)
+
+    def test_feed_sem_mudancas_mantem_cursor(self, logged_client, escalas_pendentes):
+        url = f'/eventos/{escalas_pendentes[0].evento_id}/mudancas'
+        cursor = logged_client.get(url).get_json()['cursor']
+
+        data = logged_client.get(f'{url}?desde={cursor}').get_json()
+
+        assert data == {'cursor': cursor, 'mudancas': [], 'totais': None}
+
+    def test_remover_garcom_registra_removida(self, logged_client, escalas_pendentes):
+        escala = escalas_pendentes[0]
+        escala_id, evento_id = escala.id, escala.evento_id
+
+        logged_client.post(f'/eventos/{evento_id}/remover-garcom/{escala.garcom_id}')
+
+        ultima = EscalaMudanca.query.order_by(EscalaMudanca.id.desc()).first()
+        assert ultima.tipo == 'removida'
+        assert ultima.escala_id == escala_id
+
+    def test_excluir_evento_nao_quebra_feed(self, logged_client, escalas_pendentes):
+        evento_id = escalas_pendentes[0].evento_id
+
+        resp = logged_client.post(f'/eventos/{evento_id}/excluir', follow_redirects=True)
+
+        assert resp.status_code == 200
+        assert EscalaMudanca.query.filter_by(evento_id=evento_id, tipo='removida').count() == 0
+
+
+    def test_poda_mudancas_antigas(self, app, escalas_pendentes):
+        antigas = EscalaMudanca.query.limit(2).all()
+        for mudanca in antigas:
+            mudanca.created_at = datetime.utcnow() - timedelta(days=91)
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['podar-mudancas'])
+
+        assert result.exit_code == 0, result.output
+        assert EscalaMudanca.query.count() == len(escalas_pendentes) - 2
+        assert podar_mudancas(90) == 0
+
+
+class TestEntregaWhatsapp:
+
+    def test_webhook_status_entra_no_feed(self, client, logged_client, escalas_pendentes):
+        escala = escalas_pendentes[0]
+        registrar_envio(escala, 'wamid.ABC')
+        db.session.commit()
+
+        resp = client.post('/webhook/whatsapp', json=_webhook_status('wamid.ABC', 'delivered'))
+        assert resp.status_code == 200
+
+        ultima = EscalaMudanca.query.order_by(EscalaMudanca.id.desc()).first()
+        assert ultima.tipo == 'entrega'
+        assert ultima.status == 'delivered'
+        assert ultima.escala_id == escala.id
+
+        detalhe = logged_client.get(f'/eventos/{escala.evento_id}')
+        assert 'WhatsApp: entregue' in detalhe.data.decode()
+
+    def test_webhook_status_de_mensagem_desconhecida_e_ignorado(self, client, escalas_pendentes):
+        total = EscalaMudanca.query.count()
+
+        resp = client.post('/webhook/whatsapp', json=_webhook_status('wamid.XYZ', 'read'))
+
+        assert resp.status_code == 200
+        assert EscalaMudanca.query.count() == total
@@ -0,0 +1,61 @@
+"""
+Testes da partida da aplicação.
+
+Cobre:
+  - create_app sem criar tabelas nem admin (feito por `flask inicializar-banco`)
+  - Comando inicializar-banco idempotente
+  - ReportLab e requests fora da partida (importados sob demanda)
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import inspect
+
+from app import create_app, db
+from app.models import User
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app_vazio():
+    """App sem o create_all do conftest"""
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+class TestPartida:
+
+    def test_create_app_nao_toca_no_banco(self, app_vazio):
+        assert inspect(db.engine).get_table_names() == []
+
+    def test_inicializar_banco_cria_tabelas_e_admin(self, app_vazio):
+        runner = app_vazio.test_cli_runner()
+
+        resultado = runner.invoke(args=['inicializar-banco'])
+
+        assert resultado.exit_code == 0, resultado.output
+        assert 'escalas' in inspect(db.engine).get_table_names()
+        assert User.query.filter_by(email=app_vazio.config['ADMIN_EMAIL']).count() == 1
+
+        # Segunda execução (próximo deploy) não duplica nada
+        resultado = runner.invoke(args=['inicializar-banco'])
+        assert resultado.exit_code == 0, resultado.output
+        assert User.query.count() == 1
+
+    def test_modulos_pesados_fora_da_partida(self):
+        codigo = (
+            "import sys; from app import create_app; create_app('testing'); "
+            "print(sorted(m for m in ('reportlab', 'requests') if m in sys.modules))"
+        )
+        resultado = subprocess.run(
+            [sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+
+        assert resultado.stdout.strip() == '[]'
@@ -0,0 +1,541 @@
+"""
+Testes dos relatórios PDF.
+
+Cobre:
+  - Rotas de relatório retornam PDF
+  - Kit de estilos compartilhado (cache por processo)
+  - Cache de renderização e respostas condicionais (ETag / 304)
+  - Camada de dados (instantâneos sem acesso ao banco na renderização)
+  - Exportação em lote dos PDFs de eventos (ZIP)
+  - Planilhas CSV/XLSX em streaming
+  - Pagamentos por garçom
+"""
+
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+from sqlalchemy import event, update
+
+from app import db
+from app.models import Evento
+from app.services.pdf import gerar_pdf_evento, gerar_pdf_relatorio_geral
+from app.services.pdf_builder import estilos, estilo_tabela, TabelaPaginada
+from app.services.relatorio_dados import snapshot_evento, snapshots_eventos, linhas_eventos_mes, linhas_relatorio_geral, linhas_pagamentos, LinhaEventoGeral
+from app.services.pdf_cache import CacheRenderizacao
+from app.services.planilhas import gerar_csv, gerar_xlsx
+from tests.test_dashboard import contar_consultas
+
+
+class TestRotasPdf:
+
+    def test_evento_pdf(self, logged_client, escalas_pendentes):
+        resp = logged_client.get(f'/relatorios/evento/{escalas_pendentes[0].evento_id}/pdf')
+        assert resp.status_code == 200
+        assert resp.headers['Content-Type'] == 'application/pdf'
+        assert resp.data.startswith(b'%PDF')
+
+    def test_garcons_pdf(self, logged_client, garcons_padrao):
+        resp = logged_client.get('/relatorios/garcons/pdf')
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
+
+    def test_eventos_mes_pdf(self, logged_client, eventos_futuros):
+        resp = logged_client.get('/relatorios/eventos-mes/pdf')
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
+
+    def test_geral_pdf_com_periodo(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/geral/pdf?data_inicio=2020-01-01&data_fim=2099-12-31')
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
+
+
+class TestKitEstilos:
+
+    def test_estilos_construidos_uma_vez(self):
+        assert estilos() is estilos()
+
+    def test_estilo_tabela_em_cache_por_parametros(self):
+        a = estilo_tabela(alinhamentos=((3, 3, 'CENTER'),))
+        b = estilo_tabela(alinhamentos=((3, 3, 'CENTER'),))
+        c = estilo_tabela(alinhamentos=((3, 3, 'RIGHT'),))
+        assert a is b
+        assert a is not c
+
+
+class TestTabelaPaginada:
+
+    def _tabela(self, n):
+        linhas = [[f'Linha {i}', str(i)] for i in range(n)]
+        return TabelaPaginada(['Nome', 'N'], linhas, [200, 100], estilo_tabela(), 24)
+
+    def test_split_monta_apenas_o_que_cabe(self):
+        tabela = self._tabela(100)
+
+        fatia, resto = tabela.split(500, 24 * 11)
+
+        assert len(fatia._cellvalues) == 11  # cabeçalho + 10 linhas
+        assert fatia._cellvalues[0] == ['Nome', 'N']
+        assert resto.inicio == 10
+        assert resto.linhas is tabela.linhas
+
+    def test_split_sem_espaco_vai_para_proxima_pagina(self):
+        assert self._tabela(5).split(500, 30) == []
+
+    def test_relatorio_grande_ocupa_varias_paginas(self):
+        linhas = [LinhaEventoGeral('01/01/2026', f'Evento {i}', 'Local', 1, 200.0) for i in range(300)]
+
+        pdf = gerar_pdf_relatorio_geral(linhas).read()
+
+        assert pdf.count(b'/Type /Page\n') > 5
+
+
+class TestCacheRenderizacao:
+
+    def test_requisicao_condicional_retorna_304(self, logged_client, escalas_pendentes):
+        url = f'/relatorios/evento/{escalas_pendentes[0].evento_id}/pdf'
+        resp = logged_client.get(url)
+        etag = resp.headers['ETag']
+        assert resp.headers['Last-Modified']
+
+        resp = logged_client.get(url, headers={'If-None-Match': etag})
+
+        assert resp.status_code == 304
+        assert resp.data == b''
+
+    def test_segunda_geracao_vem_do_cache(self, app, logged_client, escalas_pendentes):
+        url = f'/relatorios/evento/{escalas_pendentes[0].evento_id}/pdf'
+        primeira = logged_client.get(url)
+
+        cache = app.extensions['pdf_cache']
+        assert cache.get(primeira.headers['ETag'].strip('"')).read() == primeira.data
+
+        segunda = logged_client.get(url)
+        assert segunda.data == primeira.data
+
+    def test_mudanca_na_escala_invalida_etag(self, client, logged_client, escalas_pendentes):
+        escala = escalas_pendentes[0]
+        url = f'/relatorios/evento/{escala.evento_id}/pdf'
+        etag = logged_client.get(url).headers['ETag']
+
+        client.get(f'/confirmar/escala-{escala.evento_id}-{escala.garcom_id}')
+
+        resp = logged_client.get(url, headers={'If-None-Match': etag})
+        assert resp.status_code == 200
+        assert resp.headers['ETag'] != etag
+
+    def test_alterar_valor_invalida_relatorio_geral(self, logged_client, escalas_pendentes):
+        escala = escalas_pendentes[0]
+        url = '/relatorios/geral/pdf'
+        etag = logged_client.get(url).headers['ETag']
+
+        logged_client.post(
+            f'/eventos/{escala.evento_id}/atualizar-escala/{escala.id}',
+            data={'valor': '999,00'}
+        )
+
+        assert logged_client.get(url).headers['ETag'] != etag
+
+    def test_lru_transborda_para_disco(self, tmp_path):
+        cache = CacheRenderizacao(max_itens=1, diretorio=str(tmp_path), max_itens_disco=2)
+        cache.put('a', BytesIO(b'A'))
+        cache.put('b', BytesIO(b'B'))
+        cache.put('c', BytesIO(b'C'))
+
+        # 'a' e 'b' saíram da memória para o disco
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['a.pdf', 'b.pdf']
+        assert cache.get('a') == str(tmp_path / 'a.pdf')
+        assert cache.get('c').read() == b'C'
+
+    def test_disco_respeita_limite(self, tmp_path):
+        cache = CacheRenderizacao(max_itens=1, diretorio=str(tmp_path), max_itens_disco=1)
+        for chave in 'abc':
+            cache.put(chave, BytesIO(chave.encode()))
+
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_pdf_grande_vai_direto_para_o_disco(self, tmp_path):
+        cache = CacheRenderizacao(diretorio=str(tmp_path), max_bytes_memoria=4)
+
+        origem = cache.put('grande', BytesIO(b'%PDF-grande'))
+
+        assert origem == str(tmp_path / 'grande.pdf')
+        assert (tmp_path / 'grande.pdf').read_bytes() == b'%PDF-grande'
+
+    def test_diretorio_criado_fechado(self, tmp_path):
+        CacheRenderizacao(diretorio=str(tmp_path / 'pdfs'))
+
+        assert (tmp_path / 'pdfs').stat().st_mode & 0o777 == 0o700
+
+    def test_diretorio_aberto_fica_so_em_memoria(self, app, tmp_path):
+        from app.services.pdf_cache import obter_cache
+
+        aberto = tmp_path / 'pdfs'
+        aberto.mkdir()
+        os.chmod(aberto, 0o777)  # outro usuário poderia plantar PDFs
+        app.config['PDF_CACHE_DIR'] = str(aberto)
+
+        assert obter_cache().diretorio is None
+
+
+class TestStreamingPdf:
+
+    def test_resposta_tem_content_length(self, logged_client, eventos_futuros):
+        resp = logged_client.get('/relatorios/eventos-mes/pdf')
+
+        assert resp.status_code == 200
+        assert int(resp.headers['Content-Length']) == len(resp.data)
+        assert resp.headers['Accept-Ranges'] == 'bytes'
+
+    def test_range_retorna_206(self, logged_client, eventos_futuros):
+        resp = logged_client.get('/relatorios/eventos-mes/pdf', headers={'Range': 'bytes=0-3'})
+
+        assert resp.status_code == 206
+        assert resp.data == b'%PDF'
+
+    def test_pdf_grande_servido_do_disco(self, app, logged_client, eventos_futuros, tmp_path):
+        app.config['PDF_CACHE_DIR'] = str(tmp_path)
+        app.config['PDF_CACHE_MAX_BYTES_MEMORIA'] = 0
+
+        resp = logged_client.get('/relatorios/eventos-mes/pdf')
+
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
+        arquivos = list(tmp_path.glob('*.pdf'))
+        assert len(arquivos) == 1
+        assert arquivos[0].read_bytes() == resp.data
+
+
+class TestRelatorioEmSegundoPlano:
+
+    def _aguardar(self, client, job, tentativas=120):
+        import time
+        while job['status'] == 'processando' and tentativas:
+            time.sleep(0.5)
+            job = client.get(job['url_status']).get_json()
+            tentativas -= 1
+        return job
+
+    def test_job_gera_e_disponibiliza_download(self, app, logged_client, escalas_pendentes, tmp_path):
+        app.config['RELATORIO_JOBS_DIR'] = str(tmp_path)
+
+        resp = logged_client.post('/relatorios/jobs', data={'data_inicio': '2020-01-01', 'data_fim': '2099-12-31'})
+        assert resp.status_code == 202
+
+        job = self._aguardar(logged_client, resp.get_json())
+        assert job['status'] == 'pronto'
+
+        download = logged_client.get(job['url_download'])
+        assert download.status_code == 200
+        assert download.data.startswith(b'%PDF')
+
+    def test_job_reaproveita_artefato(self, app, logged_client, escalas_pendentes, tmp_path):
+        app.config['RELATORIO_JOBS_DIR'] = str(tmp_path)
+        primeiro = self._aguardar(logged_client, logged_client.post('/relatorios/jobs').get_json())
+        assert primeiro['status'] == 'pronto'
+
+        segundo = logged_client.post('/relatorios/jobs').get_json()
+
+        assert segundo['status'] == 'pronto'
+        assert segundo['id'] != primeiro['id']
+        assert len(list(tmp_path.glob('*.pdf'))) == 1
+
+    def test_falha_na_gravacao_nao_deixa_temporario(self, monkeypatch, tmp_path):
+        from app.services import pdf, relatorio_jobs
+
+        class Quebrado:
+            def read(self, _):
+                raise OSError('disco cheio')
+
+        monkeypatch.setattr(pdf, 'gerar_pdf_relatorio_geral', lambda *args: Quebrado())
+        caminho = tmp_path / 'chave.pdf'
+
+        with pytest.raises(OSError):
+            relatorio_jobs._renderizar_geral(str(caminho), [], None, None)
+
+        assert [p.name for p in tmp_path.iterdir()] == ['chave.erro']
+
+    def test_pool_quebrado_e_substituido(self, app, logged_client, escalas_pendentes, tmp_path):
+        import time
+        from concurrent.futures import wait
+        from app.services import relatorio_jobs
+
+        app.config['RELATORIO_JOBS_DIR'] = str(tmp_path)
+        erro = tmp_path / 'morto.erro'
+        # Processo filho morto (como num OOM): o pool fica quebrado
+        wait([relatorio_jobs.submeter(os._exit, 1, caminho_erro=str(erro))])
+        for _ in range(50):
+            if erro.exists():
+                break
+            time.sleep(0.1)
+        assert erro.read_text() == 'O processo de renderização foi interrompido.'
+
+        resp = logged_client.post('/relatorios/jobs')
+
+        assert resp.status_code == 202
+        assert self._aguardar(logged_client, resp.get_json())['status'] == 'pronto'
+
+    def test_diretorio_de_jobs_aberto_e_recusado(self, app, logged_client, tmp_path):
+        aberto = tmp_path / 'jobs'
+        aberto.mkdir()
+        os.chmod(aberto, 0o777)
+        app.config['RELATORIO_JOBS_DIR'] = str(aberto)
+
+        resp = logged_client.post('/relatorios/jobs')
+
+        assert resp.status_code == 503
+        assert list(aberto.iterdir()) == []
+
+    def test_job_data_invalida(self, logged_client):
+        resp = logged_client.post('/relatorios/jobs', data={'data_inicio': '31/12/2020'})
+        assert resp.status_code == 400
+
+    def test_job_inexistente_retorna_404(self, logged_client):
+        assert logged_client.get('/relatorios/jobs/naoexiste').status_code == 404
+
+
+class TestDadosRelatorio:
+
+    def test_snapshot_evento_calcula_totais(self, app, escalas_pendentes):
+        escalas_pendentes[0].status = 'confirmado'
+        escalas_pendentes[1].status = 'recusado'
+        escalas_pendentes[2].is_motorista = True
+        db.session.commit()
+
+        snapshot = snapshot_evento(escalas_pendentes[0].evento_id)
+
+        assert snapshot.total_garcons == 4
+        assert snapshot.total_confirmados == 1
+        assert snapshot.total_recusados == 1
+        assert snapshot.total_pendentes == 2
+        # 4 x 200 + adicional de motorista (50)
+        assert snapshot.valor_total == 850.0
+        assert snapshot.escalas[2].valor == 250.0
+        assert snapshot.escalas[0].nome == 'Joao Silva'
+
+    def test_snapshot_evento_sem_escalas(self, app, eventos_futuros):
+        snapshot = snapshot_evento(eventos_futuros[1].id)
+
+        assert snapshot.escalas == ()
+        assert snapshot.valor_total == 0
+        assert snapshot.horario == '20:00 - 02:00'
+
+    def test_snapshot_evento_inexistente(self, app):
+        assert snapshot_evento(9999) is None
+
+    def test_renderizacao_nao_consulta_o_banco(self, app, escalas_pendentes):
+        snapshot = snapshot_evento(escalas_pendentes[0].evento_id)
+        consultas = []
+
+        def contar(*args):
+            consultas.append(args)
+
+        event.listen(db.engine, 'before_cursor_execute', contar)
+        try:
+            arquivo = gerar_pdf_evento(snapshot)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', contar)
+
+        assert consultas == []
+        assert arquivo.read(4) == b'%PDF'
+
+    def test_linhas_relatorio_geral_igual_ao_modelo(self, app, escalas_pendentes, eventos_futuros):
+        linhas = {linha.nome: linha for linha in linhas_relatorio_geral()}
+
+        for evento in eventos_futuros:
+            linha = linhas[evento.nome]
+            assert linha.total_garcons == evento.total_garcons
+            assert linha.valor_total == evento.valor_total
+            assert linha.data_formatada == evento.data_formatada
+
+    def test_linhas_eventos_mes_em_uma_consulta(self, app, escalas_pendentes, eventos_futuros):
+        # Evento ainda sem tipo no catálogo também entra (fica fora do resumo mensal)
+        db.session.execute(update(Evento).where(Evento.id == eventos_futuros[0].id).values(tipo_id=None))
+        db.session.commit()
+
+        with contar_consultas() as consultas:
+            linhas = linhas_eventos_mes()
+
+        assert len(consultas) == 1
+        assert len(linhas) == len(eventos_futuros)
+        assert sum(linha.total_garcons for linha in linhas) == len(escalas_pendentes)
+        assert sum(linha.valor_total for linha in linhas) == sum(e.valor_total for e in eventos_futuros)
+        assert [linha.data for linha in linhas] == sorted(e.data for e in eventos_futuros)
+
+
+class TestExportacaoZip:
+
+    PERIODO = {'data_inicio': '2020-01-01', 'data_fim': '2099-12-31'}
+
+    def test_snapshots_eventos_um_por_evento(self, app, escalas_pendentes, eventos_futuros):
+        snapshots = list(snapshots_eventos(lote=2))
+
+        assert [s.id for s in snapshots] == [e.id for e in eventos_futuros]
+        assert snapshots[0].total_garcons == 4
+        assert snapshots[1].escalas == ()
+
+    def test_zip_contem_pdf_de_cada_evento(self, logged_client, escalas_pendentes, eventos_futuros):
+        resp = logged_client.get('/relatorios/eventos/zip', query_string=self.PERIODO)
+
+        assert resp.status_code == 200
+        assert resp.headers['Content-Type'] == 'application/zip'
+        with zipfile.ZipFile(BytesIO(resp.data)) as arquivo_zip:
+            nomes = arquivo_zip.namelist()
+            assert sorted(nomes) == sorted(f'evento_{e.id}_{e.data}.pdf' for e in eventos_futuros)
+            assert all(arquivo_zip.read(nome).startswith(b'%PDF') for nome in nomes)
+
+    def test_zip_periodo_sem_eventos(self, logged_client, eventos_futuros):
+        resp = logged_client.get('/relatorios/eventos/zip', query_string={'data_inicio': '2000-01-01', 'data_fim': '2000-01-31'})
+
+        with zipfile.ZipFile(BytesIO(resp.data)) as arquivo_zip:
+            assert arquivo_zip.namelist() == []
+
+    def test_zip_data_invalida(self, logged_client):
+        resp = logged_client.get('/relatorios/eventos/zip', query_string={'data_inicio': '31/12/2020'})
+        assert resp.status_code == 400
+
+    def test_cli_exportar_eventos(self, app, eventos_futuros, tmp_path):
+        saida = tmp_path / 'eventos.zip'
+
+        result = app.test_cli_runner().invoke(args=[
+            'exportar-eventos', '--inicio', '2020-01-01', '--fim', '2099-12-31', '--saida', str(saida)
+        ])
+
+        assert result.exit_code == 0, result.output
+        with zipfile.ZipFile(saida) as arquivo_zip:
+            assert len(arquivo_zip.namelist()) == len(eventos_futuros)
+
+
+class TestPlanilhas:
+
+    NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+    def _linhas_xlsx(self, dados):
+        with zipfile.ZipFile(BytesIO(dados)) as arquivo_zip:
+            raiz = ET.fromstring(arquivo_zip.read('xl/worksheets/sheet1.xml'))
+        return [
+            [c.findtext('s:v', namespaces=self.NS) or c.findtext('s:is/s:t', namespaces=self.NS)
+             for c in row.findall('s:c', self.NS)]
+            for row in raiz.iter('{%s}row' % self.NS['s'])
+        ]
+
+    def test_csv_em_blocos(self):
+        linhas = (('Evento & <Cia>', i, float(i)) for i in range(5))
+        blocos = list(gerar_csv(['Nome', 'N', 'Valor'], linhas, linhas_por_bloco=2))
+
+        assert len(blocos) == 3
+        texto = b''.join(blocos).decode('utf-8-sig').splitlines()
+        assert texto[0] == 'Nome;N;Valor'
+        assert texto[1] == 'Evento & <Cia>;0;0,00'
+
+    def test_xlsx_em_blocos(self):
+        linhas = (('Evento & <Cia>', i, float(i)) for i in range(5))
+        blocos = list(gerar_xlsx(['Nome', 'N', 'Valor'], linhas, linhas_por_bloco=2))
+
+        assert len(blocos) > 2
+        linhas_lidas = self._linhas_xlsx(b''.join(blocos))
+        assert linhas_lidas[0] == ['Nome', 'N', 'Valor']
+        assert linhas_lidas[1] == ['Evento & <Cia>', '0', '0.0']
+        assert len(linhas_lidas) == 6
+
+    def test_textos_nao_viram_formula(self):
+        linhas = [('=HYPERLINK("http://x")', '@SOMA(A1)', '+5545', -12.5, 'Ana - Copa')]
+
+        csv = b''.join(gerar_csv(['A', 'B', 'C', 'D', 'E'], linhas)).decode('utf-8-sig').splitlines()
+        xlsx = self._linhas_xlsx(b''.join(gerar_xlsx(['A', 'B', 'C', 'D', 'E'], linhas)))
+
+        assert csv[1] == '"\'=HYPERLINK(""http://x"")";\'@SOMA(A1);\'+5545;-12,50;Ana - Copa'
+        assert xlsx[1] == ['\'=HYPERLINK("http://x")', "'@SOMA(A1)", "'+5545", '-12.5', 'Ana - Copa']
+
+    def test_geral_csv(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/geral/csv')
+
+        assert resp.status_code == 200
+        assert resp.headers['Content-Type'].startswith('text/csv')
+        linhas = resp.data.decode('utf-8-sig').splitlines()
+        assert linhas[0].startswith('Data;Horário;Evento')
+        assert len(linhas) == 4
+        assert any(linha.endswith(';4;800,00') for linha in linhas)
+
+    def test_geral_xlsx(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/geral/xlsx', query_string={'data_inicio': '2020-01-01'})
+
+        assert resp.status_code == 200
+        assert 'spreadsheetml' in resp.headers['Content-Type']
+        assert len(self._linhas_xlsx(resp.data)) == 4
+
+    def test_garcons_planilha_conta_eventos(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/garcons/xlsx')
+
+        linhas = self._linhas_xlsx(resp.data)
+        assert linhas[0] == ['Nome', 'Telefone', 'E-mail', 'Idade', 'PIX', 'Eventos']
+        assert len(linhas) == 5
+        assert all(linha[-1] == '1' for linha in linhas[1:])
+
+    def test_eventos_mes_csv(self, logged_client, eventos_futuros):
+        assert logged_client.get('/relatorios/eventos-mes/csv').status_code == 200
+
+    def test_formato_desconhecido(self, logged_client):
+        assert logged_client.get('/relatorios/geral/ods').status_code == 404
+
+    def test_planilha_data_invalida(self, logged_client):
+        assert logged_client.get('/relatorios/geral/csv?data_inicio=31/12/2020').status_code == 400
+
+
+class TestPagamentos:
+
+    PERIODO = {'data_inicio': '2020-01-01', 'data_fim': '2099-12-31'}
+
+    def test_agrega_por_garcom_com_adicional(self, app, escalas_pendentes, eventos_futuros):
+        from app.models import Escala
+        escalas_pendentes[0].status = 'confirmado'
+        escalas_pendentes[0].is_motorista = True
+        escalas_pendentes[1].status = 'confirmado'
+        db.session.add(Escala(
+            evento_id=eventos_futuros[1].id, garcom_id=escalas_pendentes[0].garcom_id,
+            valor=250, status='confirmado'
+        ))
+        db.session.commit()
+
+        linhas = linhas_pagamentos(Escala.status == 'confirmado')
+
+        assert len(linhas) == 2
+        joao = next(l for l in linhas if l.garcom_id == escalas_pendentes[0].garcom_id)
+        assert joao.total_escalas == 2
+        assert joao.escalas_motorista == 1
+        assert joao.valor_base == 450.0
+        assert joao.adicional_motorista == 50.0
+        assert joao.valor_total == 500.0
+
+    def test_pagina_html(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/pagamentos', query_string={**self.PERIODO, 'status': 'pendente'})
+
+        assert resp.status_code == 200
+        assert 'Joao Silva' in resp.get_data(as_text=True)
+        assert 'R$ 800.00' in resp.get_data(as_text=True)
+
+    def test_pagina_padrao_considera_confirmadas(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/pagamentos', query_string=self.PERIODO)
+        assert 'Nenhuma escala no período' in resp.get_data(as_text=True)
+
+    def test_pdf(self, logged_client, escalas_pendentes):
+        resp = logged_client.get('/relatorios/pagamentos/pdf', query_string={**self.PERIODO, 'status': 'todos'})
+
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
+
+    def test_csv_inclui_pix(self, logged_client, escalas_pendentes, garcons_padrao):
+        garcons_padrao[0].pix = 'joao@pix.com'
+        db.session.commit()
+
+        resp = logged_client.get('/relatorios/pagamentos/csv', query_string={**self.PERIODO, 'status': 'todos'})
+
+        linhas = resp.data.decode('utf-8-sig').splitlines()
+        assert len(linhas) == 5
+        assert any('joao@pix.com' in linha and linha.endswith(';200,00') for linha in linhas)
+
+    def test_status_invalido(self, logged_client):
+        assert logged_client.get('/relatorios/pagamentos?status=pago').status_code == 400
@@ -0,0 +1,153 @@
+"""
+Testes do resumo mensal (tabela resumos_mensais).
+
+Cobre:
+  - Atualização incremental a cada escrita (escalas e eventos), por deltas
+  - Reconstrução completa (serviço e comando)
+  - Leitura pelo resumo mensal, anual e por tipo
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import db
+from app.models import ResumoMensal
+from app.services.resumos import resumo_mes, resumo_por_tipo, resumos_ano, reconstruir_resumos
+from tests.test_dashboard import contar_consultas
+
+
+def _linhas():
+    return sorted(
+        (r.ano, r.mes, r.tipo_id, r.total_eventos, r.escalas_pendentes, r.escalas_confirmadas,
+         r.escalas_recusadas, float(r.valor_total), float(r.valor_confirmado))
+        for r in ResumoMensal.query.all()
+    )
+
+
+class TestResumoIncremental:
+
+    def test_escalas_novas_entram_no_resumo(self, app, escalas_pendentes, eventos_futuros):
+        evento = eventos_futuros[0]
+        linha = db.session.get(ResumoMensal, (evento.data.year, evento.data.month, evento.tipo_id))
+
+        assert linha.total_eventos == 1
+        assert linha.escalas_pendentes == 4
+        assert float(linha.valor_total) == 800.0
+
+    def test_confirmacao_atualiza_contagem_e_valor(self, app, escalas_pendentes, eventos_futuros):
+        escalas_pendentes[0].status = 'confirmado'
+        escalas_pendentes[1].status = 'recusado'
+        escalas_pendentes[2].is_motorista = True
+        db.session.commit()
+
+        evento = eventos_futuros[0]
+        linha = db.session.get(ResumoMensal, (evento.data.year, evento.data.month, evento.tipo_id))
+        assert (linha.escalas_pendentes, linha.escalas_confirmadas, linha.escalas_recusadas) == (2, 1, 1)
+        assert float(linha.valor_total) == 850.0
+        assert float(linha.valor_confirmado) == 200.0
+
+    def test_evento_movido_sai_do_mes_anterior(self, app, escalas_pendentes, eventos_futuros):
+        evento = eventos_futuros[0]
+        antes = (evento.data.year, evento.data.month, evento.tipo_id)
+
+        evento.data = evento.data + timedelta(days=400)
+        evento.tipo = 'Corporativo'
+        db.session.commit()
+
+        linha_antiga = db.session.get(ResumoMensal, antes)
+        assert linha_antiga is None or linha_antiga.escalas_pendentes == 0
+        assert evento.tipo_id != antes[2]
+        nova = db.session.get(ResumoMensal, (evento.data.year, evento.data.month, evento.tipo_id))
+        assert nova.escalas_pendentes == 4
+
+    def test_evento_excluido_sai_do_resumo(self, app, escalas_pendentes, eventos_futuros):
+        db.session.delete(eventos_futuros[0])
+        db.session.commit()
+
+        assert sum(r.escalas_pendentes for r in ResumoMensal.query.all()) == 0
+        assert sum(r.total_eventos for r in ResumoMensal.query.all()) == 2
+
+    def test_incremental_igual_a_reconstrucao(self, app, escalas_pendentes, eventos_futuros):
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.delete(escalas_pendentes[3])
+        eventos_futuros[1].valor_motorista = 80
+        db.session.commit()
+        incremental = _linhas()
+
+        reconstruir_resumos()
+
+        assert _linhas() == incremental
+
+    def test_escala_movida_pelo_relacionamento(self, app, escalas_pendentes, eventos_futuros):
+        escalas_pendentes[0].evento = eventos_futuros[1]
+        escalas_pendentes[1].evento_id = eventos_futuros[2].id
+        db.session.commit()
+        incremental = _linhas()
+
+        reconstruir_resumos()
+
+        assert _linhas() == incremental
+
+    def test_soma_deltas_sem_sobrescrever(self, app, escalas_pendentes, eventos_futuros):
+        evento = eventos_futuros[0]
+        chave = (evento.data.year, evento.data.month, evento.tipo_id)
+        # Outra transação já somou uma confirmação nesta linha
+        db.session.execute(
+            update(ResumoMensal)
+            .where(ResumoMensal.ano == chave[0], ResumoMensal.mes == chave[1], ResumoMensal.tipo_id == chave[2])
+            .values(escalas_confirmadas=ResumoMensal.escalas_confirmadas + 1)
+        )
+        db.session.commit()
+
+        escalas_pendentes[0].status = 'confirmado'
+        db.session.commit()
+
+        linha = db.session.get(ResumoMensal, chave)
+        db.session.refresh(linha)
+        assert (linha.escalas_pendentes, linha.escalas_confirmadas) == (3, 2)
+
+    def test_colunas_fora_do_resumo_nao_o_alteram(self, app, escalas_pendentes):
+        escalas_pendentes[0].notificado_em = datetime.utcnow()
+
+        with contar_consultas() as consultas:
+            db.session.commit()
+
+        assert not any('resumos_mensais' in consulta[2] for consulta in consultas)
+
+
+class TestLeituraResumo:
+
+    def test_resumo_mes_e_ano(self, app, escalas_pendentes, eventos_futuros):
+        data = eventos_futuros[0].data
+        esperado = sum(1 for e in eventos_futuros if (e.data.year, e.data.month) == (data.year, data.month))
+
+        assert resumo_mes(data.year, data.month).total_eventos == esperado
+        meses = dict(resumos_ano(data.year))
+        assert len(meses) == 12
+        assert meses[data.month].escalas_pendentes == 4
+
+    def test_por_tipo_usa_o_nome_atual_do_catalogo(self, app, escalas_pendentes, eventos_futuros):
+        evento = eventos_futuros[0]
+        evento.tipo_evento.nome = 'Casamento Civil'
+        db.session.commit()
+
+        tipos = dict(resumo_por_tipo(evento.data.year, evento.data.month))
+
+        assert 'Casamento' not in tipos
+        assert tipos['Casamento Civil'].escalas_pendentes == 4
+
+    def test_comando_reconstruir(self, app, escalas_pendentes):
+        ResumoMensal.query.delete()
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['reconstruir-resumos'])
+
+        assert result.exit_code == 0, result.output
+        assert ResumoMensal.query.count() > 0
+
+    def test_resumo_anual_pdf(self, logged_client, escalas_pendentes, eventos_futuros):
+        resp = logged_client.get(f'/relatorios/ano/pdf?ano={eventos_futuros[0].data.year}')
+
+        assert resp.status_code == 200
+        assert resp.data.startswith(b'%PDF')
@@ -0,0 +1,105 @@
+"""
+Testes da compilação dos templates.
+
+Cobre:
+  - Cache de bytecode em disco compartilhado entre apps (workers)
+  - Diretório do bytecode só do usuário do processo
+  - Aquecimento de todos os templates na partida
+"""
+
+import os
+
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.services.templates import aquecer_templates
+
+
+@pytest.fixture
+def com_bytecode(tmp_path, monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'JINJA_BYTECODE_CACHE', True)
+    monkeypatch.setattr(TestingConfig, 'JINJA_BYTECODE_DIR', str(tmp_path / 'jinja'))
+    return tmp_path / 'jinja'
+
+
+def _contar_compilacoes(app, monkeypatch):
+    chamadas = []
+    compilar = app.jinja_env.compile
+
+    def contando(fonte, nome=None, *args, **kwargs):
+        chamadas.append(nome)
+        return compilar(fonte, nome, *args, **kwargs)
+
+    monkeypatch.setattr(app.jinja_env, 'compile', contando)
+    return chamadas
+
+
+class TestTemplates:
+
+    def test_desligado_nao_usa_bytecode(self, app):
+        assert app.jinja_env.bytecode_cache is None
+
+    def test_padrao_usa_diretorio_do_jinja(self, monkeypatch):
+        monkeypatch.setattr(TestingConfig, 'JINJA_BYTECODE_CACHE', True)
+
+        app = create_app('testing')
+
+        assert app.jinja_env.bytecode_cache.directory.endswith(f'_jinja2-cache-{os.getuid()}')
+
+    def test_diretorio_criado_fechado(self, com_bytecode):
+        app = create_app('testing')
+
+        assert app.jinja_env.bytecode_cache.directory == str(com_bytecode)
+        assert com_bytecode.stat().st_mode & 0o777 == 0o700
+
+    def test_diretorio_aberto_e_recusado(self, com_bytecode):
+        com_bytecode.mkdir(mode=0o777)
+        os.chmod(com_bytecode, 0o777)  # outro usuário poderia plantar bytecode
+
+        app = create_app('testing')
+
+        assert app.jinja_env.bytecode_cache is None
+
+    def test_aquecer_compila_todos_os_templates(self, app, monkeypatch):
+        total, _ = aquecer_templates(app)
+
+        assert total == len([n for n in app.jinja_env.list_templates() if n.endswith('.html')])
+        assert 'base.html' in [t.name for t in app.jinja_env.cache.values()]
+
+        # Depois de aquecido, renderizar não compila de novo
+        compilacoes = _contar_compilacoes(app, monkeypatch)
+        with app.test_request_context():
+            app.jinja_env.get_template('auth/login.html')
+        assert compilacoes == []
+
+    def test_bytecode_compartilhado_entre_workers(self, com_bytecode, monkeypatch):
+        primeiro = create_app('testing')
+        total, _ = aquecer_templates(primeiro)
+        assert len(list(com_bytecode.iterdir())) == total
+
+        # Outro worker carrega o bytecode gravado, sem compilar o fonte
+        segundo = create_app('testing')
+        compilacoes = _contar_compilacoes(segundo, monkeypatch)
+        assert aquecer_templates(segundo)[0] == total
+        assert compilacoes == []
+
+    def test_template_alterado_e_recompilado(self, com_bytecode, tmp_path, monkeypatch):
+        primeiro = create_app('testing')
+        aquecer_templates(primeiro)
+
+        segundo = create_app('testing')
+        fonte = tmp_path / 'login.html'
+        fonte.write_text('{% extends "base.html" %}{% block content %}novo{% endblock %}')
+        carregar = segundo.jinja_env.loader.get_source
+
+        def com_login_novo(env, nome):
+            if nome == 'auth/login.html':
+                return fonte.read_text(), str(fonte), lambda: True
+            return carregar(env, nome)
+
+        monkeypatch.setattr(segundo.jinja_env.loader, 'get_source', com_login_novo)
+        compilacoes = _contar_compilacoes(segundo, monkeypatch)
+        aquecer_templates(segundo)
+
+        assert compilacoes == ['auth/login.html']
@@ -0,0 +1,190 @@
+"""
+Testes do catálogo de tipos de evento.
+
+Cobre:
+  - Eventos ligados ao catálogo a cada escrita (grafias unificadas)
+  - Tipo novo criado ao mesmo tempo por outro worker
+  - Página de tipos: contagem, criação e exclusão
+  - Autocomplete servido do cache e invalidado nas escritas
+  - Migração de bancos antigos (coluna tipo_id, eventos sem tipo e
+    resumos chaveados pelo nome)
+"""
+
+from datetime import date, time, timedelta
+
+from sqlalchemy import Column, MetaData, String, Table, inspect, insert
+
+from app import db, inicializar_banco
+from app.models import Evento, ResumoMensal, TipoEvento
+from app.services import tipos
+from app.services.tipos import migrar_tipos_evento, sugerir_tipos
+from tests.test_dashboard import contar_consultas
+
+
+def _evento(nome, tipo):
+    return Evento(
+        nome=nome, tipo=tipo, data=date.today() + timedelta(days=3),
+        hora_inicio=time(19), local='Sede', valor_padrao=100,
+    )
+
+
+class TestCatalogo:
+
+    def test_evento_novo_cria_e_liga_o_tipo(self, app):
+        db.session.add_all([_evento('A', 'Casamento'), _evento('B', 'casamento '), _evento('C', 'Formatura')])
+        db.session.commit()
+
+        assert [t.nome for t in TipoEvento.query.order_by(TipoEvento.nome)] == ['Casamento', 'Formatura']
+        casamento = TipoEvento.query.filter_by(chave='casamento').one()
+        assert {e.nome for e in Evento.query.filter_by(tipo_id=casamento.id)} == {'A', 'B'}
+
+    def test_trocar_tipo_religa(self, app, eventos_futuros):
+        evento = eventos_futuros[0]
+        evento.tipo = 'Aniversário'
+        db.session.commit()
+
+        assert evento.tipo_evento.nome == 'Aniversário'
+        assert evento.tipo_evento.chave == 'aniversario'
+
+    def test_formulario_usa_o_nome_do_catalogo(self, logged_client, eventos_futuros):
+        logged_client.post('/eventos/novo', data={
+            'nome': 'Festa da Firma', 'tipo': '  CASAMÊNTO ', 'data': '10/10/2030',
+            'hora_inicio': '19:00', 'local': 'Sede',
+        }, follow_redirects=True)
+
+        evento = Evento.query.filter_by(nome='Festa da Firma').one()
+        assert evento.tipo == 'Casamento'
+        assert evento.tipo_id == eventos_futuros[0].tipo_id
+
+    def test_tipo_criado_por_outro_worker(self, app, monkeypatch):
+        # Outro worker grava 'Formatura' entre a leitura do catálogo e o INSERT
+        buscar = tipos._buscar_tipo
+        leituras = []
+
+        def buscar_com_corrida(session, chave):
+            leituras.append(chave)
+            if len(leituras) == 1:
+                db.session.execute(insert(TipoEvento).values(nome='Formatura', chave='formatura'))
+                return None
+            return buscar(session, chave)
+
+        monkeypatch.setattr(tipos, '_buscar_tipo', buscar_com_corrida)
+        db.session.add(_evento('A', 'Formatura'))
+        db.session.commit()
+
+        formatura = TipoEvento.query.one()
+        assert Evento.query.one().tipo_id == formatura.id
+
+
+class TestPaginaTipos:
+
+    def test_lista_com_totais(self, logged_client, eventos_futuros):
+        html = logged_client.get('/eventos/tipos').get_data(as_text=True)
+
+        assert 'Casamento' in html
+        assert '1 eventos' in html
+
+    def test_criar_e_rejeitar_duplicado(self, logged_client, app):
+        logged_client.post('/eventos/tipos/novo', data={'nome': ' Bodas  de Ouro '})
+        resp = logged_client.post('/eventos/tipos/novo', data={'nome': 'bodas de ouro'}, follow_redirects=True)
+
+        assert [t.nome for t in TipoEvento.query] == ['Bodas de Ouro']
+        assert 'já está cadastrado' in resp.get_data(as_text=True)
+
+    def test_criado_pela_pagina_entra_nas_sugestoes(self, logged_client, app):
+        assert sugerir_tipos('') == []
+
+        logged_client.post('/eventos/tipos/novo', data={'nome': 'Batizado'})
+
+        assert sugerir_tipos('bat') == ['Batizado']
+
+    def test_excluir_somente_sem_eventos(self, logged_client, eventos_futuros):
+        usado = eventos_futuros[0].tipo_evento
+        livre = TipoEvento(nome='Batizado', chave='batizado')
+        db.session.add(livre)
+        db.session.commit()
+
+        logged_client.post(f'/eventos/tipos/{usado.id}/excluir')
+        logged_client.post(f'/eventos/tipos/{livre.id}/excluir')
+
+        assert db.session.get(TipoEvento, usado.id) is not None
+        assert db.session.get(TipoEvento, livre.id) is None
+
+
+class TestSugestoes:
+
+    def test_prefixo_primeiro_sem_acentos(self, app):
+        db.session.add_all([
+            TipoEvento(nome='Confraternização', chave='confraternizacao'),
+            TipoEvento(nome='Formatura', chave='formatura'),
+            TipoEvento(nome='Pré-formatura', chave='pre-formatura'),
+        ])
+        db.session.commit()
+
+        assert sugerir_tipos('FORMA') == ['Formatura', 'Pré-formatura']
+        assert sugerir_tipos('confraternizaç') == ['Confraternização']
+        assert len(sugerir_tipos('')) == 3
+
+    def test_servido_do_cache_e_invalidado(self, app, eventos_futuros):
+        sugerir_tipos('')
+        with contar_consultas() as consultas:
+            assert 'Casamento' in sugerir_tipos('ca')
+        assert len(consultas) == 1  # só a versão
+
+        db.session.add(_evento('Novo', 'Cerimônia'))
+        db.session.commit()
+
+        assert sugerir_tipos('ce') == ['Cerimônia']
+
+    def test_rota(self, logged_client, eventos_futuros):
+        data = logged_client.get('/eventos/tipos/sugestoes?q=form').get_json()
+
+        assert data == {'tipos': ['Formatura']}
+
+
+class TestMigracao:
+
+    def _banco_antigo(self, tipos):
+        """Tabela eventos sem tipo_id, como antes do catálogo"""
+        Evento.__table__.drop(db.engine)
+        antiga = Table(
+            'eventos', MetaData(),
+            *(Column(c.name, c.type, primary_key=c.primary_key) for c in Evento.__table__.columns if c.name != 'tipo_id'),
+        )
+        antiga.create(db.engine)
+        with db.engine.begin() as conexao:
+            for i, tipo in enumerate(tipos):
+                conexao.execute(insert(antiga).values(
+                    nome=f'Evento {i}', tipo=tipo, data=date(2030, 5, 1), hora_inicio=time(19),
+                    local='Sede', valor_padrao=100, valor_motorista=0, status='planejado',
+                ))
+
+    def test_cria_coluna_e_unifica_grafias(self, app):
+        self._banco_antigo(['Casamento', 'casamento', 'Casamento ', 'Formatura'])
+
+        inicializar_banco(app)
+
+        assert 'tipo_id' in {c['name'] for c in inspect(db.engine).get_columns('eventos')}
+        assert 'ix_eventos_tipo_id' in {i['name'] for i in inspect(db.engine).get_indexes('eventos')}
+        assert {e.tipo for e in Evento.query} == {'Casamento', 'Formatura'}
+        assert Evento.query.filter(Evento.tipo_id.is_(None)).count() == 0
+        assert sorted(r.tipo_evento.nome for r in ResumoMensal.query) == ['Casamento', 'Formatura']
+        casamento = TipoEvento.query.filter_by(chave='casamento').one()
+        assert ResumoMensal.query.filter_by(tipo_id=casamento.id).one().total_eventos == 3
+
+        # Próximo deploy: nada a fazer
+        assert migrar_tipos_evento() == 0
+
+    def test_resumos_chaveados_pelo_nome_sao_refeitos(self, app, eventos_futuros):
+        ResumoMensal.__table__.drop(db.engine)
+        antiga = Table(
+            'resumos_mensais', MetaData(),
+            *(Column(c.name, c.type, primary_key=c.primary_key) for c in ResumoMensal.__table__.columns if c.name != 'tipo_id'),
+            Column('tipo', String(100), primary_key=True),
+        )
+        antiga.create(db.engine)
+
+        inicializar_banco(app)
+
+        assert 'tipo_id' in {c['name'] for c in inspect(db.engine).get_columns('resumos_mensais')}
+        assert sum(r.total_eventos for r in ResumoMensal.query) == len(eventos_futuros)